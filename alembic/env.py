@@ -65,6 +65,12 @@ def run_migrations_online() -> None:
     connectable = engine
 
     with connectable.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            # Crear índices sobre tablas grandes puede superar DB_STATEMENT_TIMEOUT_MS
+            connection.exec_driver_sql("SET statement_timeout = 0")
+            # Cierra la transacción que abrió el SET: si no, begin_transaction
+            # la toma como externa y no hace commit de las migraciones
+            connection.commit()
         context.configure(
             connection=connection, target_metadata=target_metadata
         )
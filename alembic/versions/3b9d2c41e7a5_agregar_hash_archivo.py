@@ -0,0 +1,35 @@
+"""agregar hash archivo
+
+Revision ID: 3b9d2c41e7a5
+Revises: 825d29034768
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2c41e7a5'
+down_revision: Union[str, Sequence[str], None] = '825d29034768'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('archivo', sa.Column('hash_contenido', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column('archivo', sa.Column('hash_prompt', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.create_index(op.f('ix_archivo_hash_contenido'), 'archivo', ['hash_contenido'], unique=False)
+    op.create_index(op.f('ix_archivo_hash_prompt'), 'archivo', ['hash_prompt'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_archivo_hash_prompt'), table_name='archivo')
+    op.drop_index(op.f('ix_archivo_hash_contenido'), table_name='archivo')
+    op.drop_column('archivo', 'hash_prompt')
+    op.drop_column('archivo', 'hash_contenido')
@@ -0,0 +1,36 @@
+"""indices claves foraneas
+
+Revision ID: 4f7c2e9a1b86
+Revises: d8a1f3c7b052
+Create Date: 2026-10-18 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f7c2e9a1b86'
+down_revision: Union[str, Sequence[str], None] = 'd8a1f3c7b052'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Los compuestos empiezan por la clave foránea: también sirven para filtrar y contar por ella
+    op.create_index('ix_tema_usuario_id_update_at', 'tema', ['usuario_id', 'update_at', 'id'], unique=False)
+    op.create_index('ix_prompt_tema_id_create_at', 'prompt', ['tema_id', 'create_at', 'id'], unique=False)
+    op.create_index('ix_contenido_tema_id_create_at', 'contenido', ['tema_id', 'create_at', 'id'], unique=False)
+    op.create_index(op.f('ix_contenido_archivo_id'), 'contenido', ['archivo_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_contenido_archivo_id'), table_name='contenido')
+    op.drop_index('ix_contenido_tema_id_create_at', table_name='contenido')
+    op.drop_index('ix_prompt_tema_id_create_at', table_name='prompt')
+    op.drop_index('ix_tema_usuario_id_update_at', table_name='tema')
@@ -0,0 +1,31 @@
+"""indices programador
+
+Revision ID: 5e2d7b80c914
+Revises: c41f8a2b9e63
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2d7b80c914'
+down_revision: Union[str, Sequence[str], None] = 'c41f8a2b9e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_contenido_publicado_fecha_publicacion', 'contenido', ['publicado', 'fecha_publicacion'], unique=False)
+    op.create_index(op.f('ix_envio_contenido_id'), 'envio', ['contenido_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_envio_contenido_id'), table_name='envio')
+    op.drop_index('ix_contenido_publicado_fecha_publicacion', table_name='contenido')
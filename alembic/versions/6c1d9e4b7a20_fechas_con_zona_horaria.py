@@ -0,0 +1,56 @@
+"""fechas con zona horaria
+
+Revision ID: 6c1d9e4b7a20
+Revises: 4f7c2e9a1b86
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1d9e4b7a20'
+down_revision: Union[str, Sequence[str], None] = '4f7c2e9a1b86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNAS = {
+    'usuario': ['create_at', 'update_at'],
+    'tema': ['create_at', 'update_at'],
+    'prompt': ['create_at', 'update_at'],
+    'redsocial': ['create_at', 'update_at'],
+    'archivo': ['create_at', 'update_at'],
+    'contenido': ['fecha_publicacion', 'create_at', 'update_at'],
+    'envio': ['proximo_intento', 'create_at', 'update_at'],
+    'limitered': ['actualizado', 'bloqueado_hasta'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Los valores guardados están en UTC (psycopg2 los convertía con la zona de la sesión)
+    for tabla, columnas in COLUMNAS.items():
+        for columna in columnas:
+            op.alter_column(
+                tabla, columna,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                postgresql_using=f"{columna} AT TIME ZONE 'UTC'",
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for tabla, columnas in COLUMNAS.items():
+        for columna in columnas:
+            op.alter_column(
+                tabla, columna,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                postgresql_using=f"{columna} AT TIME ZONE 'UTC'",
+            )
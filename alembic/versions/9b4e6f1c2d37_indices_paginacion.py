@@ -0,0 +1,35 @@
+"""indices paginacion
+
+Revision ID: 9b4e6f1c2d37
+Revises: 5e2d7b80c914
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e6f1c2d37'
+down_revision: Union[str, Sequence[str], None] = '5e2d7b80c914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tema_update_at_id', 'tema', ['update_at', 'id'], unique=False)
+    op.create_index('ix_prompt_update_at_id', 'prompt', ['update_at', 'id'], unique=False)
+    op.create_index('ix_contenido_update_at_id', 'contenido', ['update_at', 'id'], unique=False)
+    op.create_index('ix_archivo_update_at_id', 'archivo', ['update_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_archivo_update_at_id', table_name='archivo')
+    op.drop_index('ix_contenido_update_at_id', table_name='contenido')
+    op.drop_index('ix_prompt_update_at_id', table_name='prompt')
+    op.drop_index('ix_tema_update_at_id', table_name='tema')
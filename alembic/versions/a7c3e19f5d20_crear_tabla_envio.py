@@ -0,0 +1,53 @@
+"""crear tabla envio
+
+Revision ID: a7c3e19f5d20
+Revises: 3b9d2c41e7a5
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e19f5d20'
+down_revision: Union[str, Sequence[str], None] = '3b9d2c41e7a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('envio',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('red_social', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('parametros', sa.JSON(), nullable=False),
+    sa.Column('clave_idempotencia', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('estado', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('intentos', sa.Integer(), nullable=False),
+    sa.Column('proximo_intento', sa.DateTime(), nullable=False),
+    sa.Column('ultimo_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('resultado', sa.JSON(), nullable=True),
+    sa.Column('enlace_publicacion', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('contenido_id', sa.Integer(), nullable=True),
+    sa.Column('create_at', sa.DateTime(), nullable=False),
+    sa.Column('update_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['contenido_id'], ['contenido.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_envio_clave_idempotencia'), 'envio', ['clave_idempotencia'], unique=True)
+    op.create_index(op.f('ix_envio_estado'), 'envio', ['estado'], unique=False)
+    op.create_index(op.f('ix_envio_proximo_intento'), 'envio', ['proximo_intento'], unique=False)
+    op.create_index(op.f('ix_envio_red_social'), 'envio', ['red_social'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_envio_red_social'), table_name='envio')
+    op.drop_index(op.f('ix_envio_proximo_intento'), table_name='envio')
+    op.drop_index(op.f('ix_envio_estado'), table_name='envio')
+    op.drop_index(op.f('ix_envio_clave_idempotencia'), table_name='envio')
+    op.drop_table('envio')
@@ -0,0 +1,35 @@
+"""crear tabla limitered
+
+Revision ID: c41f8a2b9e63
+Revises: a7c3e19f5d20
+Create Date: 2026-10-18 17:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f8a2b9e63'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e19f5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('limitered',
+    sa.Column('red', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('actualizado', sa.DateTime(), nullable=False),
+    sa.Column('bloqueado_hasta', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('red')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('limitered')
@@ -0,0 +1,29 @@
+"""indices conteos
+
+Revision ID: d8a1f3c7b052
+Revises: 9b4e6f1c2d37
+Create Date: 2026-10-18 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a1f3c7b052'
+down_revision: Union[str, Sequence[str], None] = '9b4e6f1c2d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_contenido_redsocial_id'), 'contenido', ['redsocial_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_contenido_redsocial_id'), table_name='contenido')
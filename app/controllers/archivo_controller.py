@@ -1,19 +1,29 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, desc
+from app.core.consultas import contar
+from app.core.paginacion import paginar
 from app.models.modelos import Archivo, Contenido
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 class ArchivoController:
     
     @staticmethod
-    def crear_archivo(session: Session, url: str, prompt_text: Optional[str] = None) -> Archivo:
+    def crear_archivo(
+        session: Session,
+        url: str,
+        prompt_text: Optional[str] = None,
+        hash_contenido: Optional[str] = None,
+        hash_prompt: Optional[str] = None
+    ) -> Archivo:
         """
         Crear un nuevo archivo
         """
         nuevo_archivo = Archivo(
             url=url,
-            prompt_text=prompt_text
+            prompt_text=prompt_text,
+            hash_contenido=hash_contenido,
+            hash_prompt=hash_prompt
         )
         session.add(nuevo_archivo)
         session.commit()
@@ -31,13 +41,50 @@ class ArchivoController:
     
     
     @staticmethod
-    def obtener_todos_archivos(session: Session) -> List[Archivo]:
+    def obtener_archivo_por_url(session: Session, url: str) -> Optional[Archivo]:
         """
-        Obtener todos los archivos
+        Obtener un archivo por su URL
         """
-        statement = select(Archivo)
-        archivos = session.exec(statement).all()
-        return list(archivos)
+        statement = select(Archivo).where(Archivo.url == url)
+        return session.exec(statement).first()
+    
+    
+    @staticmethod
+    def obtener_archivo_por_hash_prompt(session: Session, hash_prompt: str) -> Optional[Archivo]:
+        """
+        Obtener el archivo más reciente generado con un prompt (por su hash)
+        """
+        statement = (
+            select(Archivo)
+            .where(Archivo.hash_prompt == hash_prompt)
+            .order_by(desc(Archivo.create_at))
+        )
+        return session.exec(statement).first()
+    
+    
+    @staticmethod
+    def obtener_archivo_por_hash(
+        session: Session, hash_contenido: str, hash_prompt: Optional[str] = None
+    ) -> Optional[Archivo]:
+        """
+        Obtener un archivo por el hash de su contenido (y opcionalmente de su prompt)
+        """
+        statement = select(Archivo).where(Archivo.hash_contenido == hash_contenido)
+        if hash_prompt is not None:
+            statement = statement.where(Archivo.hash_prompt == hash_prompt)
+        return session.exec(statement).first()
+    
+    
+    @staticmethod
+    def obtener_todos_archivos(
+        session: Session,
+        limite: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Archivo], Optional[str]]:
+        """
+        Obtener una página de archivos y el cursor de la siguiente
+        """
+        return paginar(session, select(Archivo), Archivo, limite, cursor)
     
     
     @staticmethod
@@ -102,6 +149,4 @@ class ArchivoController:
         """
         Contar cuántos archivos hay en total
         """
-        statement = select(Archivo)
-        archivos = session.exec(statement).all()
-        return len(list(archivos))
+        return contar(session, Archivo)
@@ -0,0 +1,119 @@
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.consultas import contar_async
+from app.core.fechas import ahora_utc
+from app.core.paginacion import paginar_async
+from app.models.modelos import Archivo, Contenido
+from typing import List, Optional, Tuple
+
+
+class ArchivoControllerAsync:
+    """
+    Versión con AsyncSession de los métodos de ArchivoController que usa el
+    router. Las búsquedas por hash y URL de los servicios de medios siguen
+    en ArchivoController.
+    """
+    
+    @staticmethod
+    async def crear_archivo(
+        session: AsyncSession,
+        url: str,
+        prompt_text: Optional[str] = None,
+        hash_contenido: Optional[str] = None,
+        hash_prompt: Optional[str] = None
+    ) -> Archivo:
+        """
+        Crear un nuevo archivo
+        """
+        nuevo_archivo = Archivo(
+            url=url,
+            prompt_text=prompt_text,
+            hash_contenido=hash_contenido,
+            hash_prompt=hash_prompt
+        )
+        session.add(nuevo_archivo)
+        await session.commit()
+        return nuevo_archivo
+    
+    
+    @staticmethod
+    async def obtener_archivo_por_id(session: AsyncSession, archivo_id: int) -> Optional[Archivo]:
+        """
+        Obtener un archivo por su ID
+        """
+        return await session.get(Archivo, archivo_id)
+    
+    
+    @staticmethod
+    async def obtener_todos_archivos(
+        session: AsyncSession,
+        limite: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Archivo], Optional[str]]:
+        """
+        Obtener una página de archivos y el cursor de la siguiente
+        """
+        return await paginar_async(session, select(Archivo), Archivo, limite, cursor)
+    
+    
+    @staticmethod
+    async def obtener_archivos_por_contenido(session: AsyncSession, contenido_id: int) -> Optional[Archivo]:
+        """
+        Obtener el archivo de un contenido específico
+        """
+        contenido = await session.get(Contenido, contenido_id)
+        if not contenido:
+            return None
+        
+        return await session.get(Archivo, contenido.archivo_id)
+    
+    
+    @staticmethod
+    async def actualizar_archivo(
+        session: AsyncSession,
+        archivo_id: int,
+        url: Optional[str] = None,
+        prompt_text: Optional[str] = None
+    ) -> Optional[Archivo]:
+        """
+        Actualizar un archivo existente
+        """
+        archivo = await session.get(Archivo, archivo_id)
+        if not archivo:
+            return None
+        
+        # Actualizar campos si se proporcionan
+        if url is not None:
+            archivo.url = url
+        
+        if prompt_text is not None:
+            archivo.prompt_text = prompt_text
+        
+        # Actualizar fecha de modificación
+        archivo.update_at = ahora_utc()
+        
+        session.add(archivo)
+        await session.commit()
+        return archivo
+    
+    
+    @staticmethod
+    async def eliminar_archivo(session: AsyncSession, archivo_id: int) -> bool:
+        """
+        Eliminar un archivo por su ID
+        """
+        archivo = await session.get(Archivo, archivo_id)
+        if not archivo:
+            return False
+        
+        await session.delete(archivo)
+        await session.commit()
+        return True
+    
+    
+    @staticmethod
+    async def contar_archivos_sin_contenido(session: AsyncSession) -> int:
+        """
+        Contar cuántos archivos hay en total
+        """
+        return await contar_async(session, Archivo)
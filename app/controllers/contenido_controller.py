@@ -1,7 +1,11 @@
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
-from app.models.modelos import Contenido, Tema, Redsocial
+from app.core.consultas import contar
+from app.core.paginacion import paginar
+from app.models.modelos import Contenido, Envio, Tema, Redsocial
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 class ContenidoController:
@@ -61,13 +65,36 @@ class ContenidoController:
     
     
     @staticmethod
-    def obtener_todos_contenidos(session: Session) -> List[Contenido]:
+    def obtener_todos_contenidos(
+        session: Session,
+        limite: int,
+        cursor: Optional[str] = None,
+        tema_id: Optional[int] = None,
+        redsocial_id: Optional[int] = None,
+        publicado: Optional[bool] = None,
+    ) -> Tuple[List[Contenido], Optional[str]]:
         """
-        Obtener todos los contenidos
+        Obtener una página de contenidos (los filtros se combinan) y el cursor
+        de la siguiente
         """
+        statement = ContenidoController._consulta_todos(tema_id, redsocial_id, publicado)
+        return paginar(session, statement, Contenido, limite, cursor)
+    
+    
+    @staticmethod
+    def _consulta_todos(
+        tema_id: Optional[int] = None,
+        redsocial_id: Optional[int] = None,
+        publicado: Optional[bool] = None,
+    ):
         statement = select(Contenido)
-        contenidos = session.exec(statement).all()
-        return list(contenidos)
+        if tema_id is not None:
+            statement = statement.where(Contenido.tema_id == tema_id)
+        if redsocial_id is not None:
+            statement = statement.where(Contenido.redsocial_id == redsocial_id)
+        if publicado is not None:
+            statement = statement.where(Contenido.publicado == publicado)
+        return statement
     
     
     @staticmethod
@@ -100,6 +127,75 @@ class ContenidoController:
         return list(contenidos)
     
     
+    @staticmethod
+    def obtener_contenido_por_enlace(session: Session, enlace_publicacion: str) -> Optional[Contenido]:
+        """
+        Obtener un contenido por su enlace de publicación
+        """
+        statement = select(Contenido).where(Contenido.enlace_publicacion == enlace_publicacion)
+        return session.exec(statement).first()
+    
+    
+    @staticmethod
+    def obtener_contenidos_por_enlace_prefijo(session: Session, prefijo: str) -> List[Contenido]:
+        """
+        Obtener los contenidos cuyo enlace de publicación empieza con un prefijo
+        """
+        statement = select(Contenido).where(Contenido.enlace_publicacion.startswith(prefijo))  # type: ignore[union-attr]
+        contenidos = session.exec(statement).all()
+        return list(contenidos)
+    
+    
+    @staticmethod
+    def obtener_contenidos_programados(session: Session, hasta: datetime, limite: int) -> List[Contenido]:
+        """
+        Obtener los contenidos sin publicar con fecha de publicación hasta `hasta`
+        que todavía no se encolaron, con su red social y archivo ya cargados.
+        Usa el índice (publicado, fecha_publicacion).
+        """
+        encolado = select(Envio.id).where(Envio.contenido_id == Contenido.id).exists()
+        statement = (
+            select(Contenido)
+            .where(
+                Contenido.publicado == False,  # noqa: E712
+                Contenido.fecha_publicacion != None,  # noqa: E711
+                Contenido.fecha_publicacion <= hasta,  # type: ignore[operator]
+                ~encolado,
+            )
+            .options(selectinload(Contenido.redsocial), selectinload(Contenido.archivo))  # type: ignore[arg-type]
+            .order_by(Contenido.fecha_publicacion)  # type: ignore[arg-type]
+            .limit(limite)
+        )
+        contenidos = session.exec(statement).all()
+        return list(contenidos)
+    
+    
+    @staticmethod
+    def registrar_resultado_publicacion(
+        session: Session,
+        contenido_id: int,
+        publicado: bool,
+        enlace_publicacion: Optional[str]
+    ) -> Optional[Contenido]:
+        """
+        Guardar el resultado final de una publicación (el enlace puede quedar vacío)
+        """
+        contenido = session.get(Contenido, contenido_id)
+        if not contenido:
+            return None
+        
+        contenido.publicado = publicado
+        contenido.enlace_publicacion = enlace_publicacion
+        if publicado:
+            contenido.fecha_publicacion = datetime.now(timezone.utc)
+        contenido.update_at = datetime.now(timezone.utc)
+        
+        session.add(contenido)
+        session.commit()
+        session.refresh(contenido)
+        return contenido
+    
+    
     @staticmethod
     def actualizar_contenido(
         session: Session, 
@@ -182,9 +278,7 @@ class ContenidoController:
         """
         Contar cuántos contenidos tiene un tema
         """
-        statement = select(Contenido).where(Contenido.tema_id == tema_id)
-        contenidos = session.exec(statement).all()
-        return len(list(contenidos))
+        return contar(session, Contenido, Contenido.tema_id == tema_id)
     
     
     @staticmethod
@@ -192,6 +286,50 @@ class ContenidoController:
         """
         Contar cuántos contenidos tiene una red social
         """
-        statement = select(Contenido).where(Contenido.redsocial_id == redsocial_id)
-        contenidos = session.exec(statement).all()
-        return len(list(contenidos))
+        return contar(session, Contenido, Contenido.redsocial_id == redsocial_id)
+    
+    
+    @staticmethod
+    def obtener_estadisticas(session: Session) -> dict:
+        """
+        Cantidad de contenidos por tema, por red social y por estado de
+        publicación en una sola consulta agregada (GROUPING SETS)
+        """
+        filas = session.exec(ContenidoController._consulta_estadisticas()).all()
+        return ContenidoController._agrupar_estadisticas(filas)
+    
+    
+    @staticmethod
+    def _consulta_estadisticas():
+        return (
+            select(Contenido.tema_id, Contenido.redsocial_id, Contenido.publicado, func.count())
+            .group_by(
+                func.grouping_sets(
+                    tuple_(Contenido.tema_id),
+                    tuple_(Contenido.redsocial_id),
+                    tuple_(Contenido.publicado),
+                )
+            )
+        )
+    
+    
+    @staticmethod
+    def _agrupar_estadisticas(filas) -> dict:
+        por_tema = []
+        por_redsocial = []
+        por_estado = {"publicados": 0, "sin_publicar": 0}
+        # Las tres columnas son NOT NULL: la que no es NULL indica el grupo de la fila
+        for tema_id, redsocial_id, publicado, cantidad in filas:
+            if tema_id is not None:
+                por_tema.append({"tema_id": tema_id, "cantidad": cantidad})
+            elif redsocial_id is not None:
+                por_redsocial.append({"redsocial_id": redsocial_id, "cantidad": cantidad})
+            else:
+                por_estado["publicados" if publicado else "sin_publicar"] = cantidad
+        
+        return {
+            "total": por_estado["publicados"] + por_estado["sin_publicar"],
+            "por_estado": por_estado,
+            "por_tema": sorted(por_tema, key=lambda g: g["tema_id"]),
+            "por_redsocial": sorted(por_redsocial, key=lambda g: g["redsocial_id"]),
+        }
@@ -0,0 +1,215 @@
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.controllers.contenido_controller import ContenidoController
+from app.core.consultas import contar_async
+from app.core.fechas import ahora_utc
+from app.core.paginacion import paginar_async
+from app.models.modelos import Archivo, Contenido, Tema, Redsocial
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+
+class ContenidoControllerAsync:
+    """
+    Versión con AsyncSession de los métodos de ContenidoController que usa
+    el router. Las consultas son las mismas; la sesión no expira al hacer
+    commit, así que no hace falta el refresh posterior.
+    """
+    
+    @staticmethod
+    async def crear_contenido(
+        session: AsyncSession,
+        descripcion: str,
+        tema_id: int,
+        redsocial_id: int,
+        archivo_id: int,
+        publicado: bool = True,
+        fecha_publicacion: Optional[datetime] = None,
+        enlace_publicacion: Optional[str] = None
+    ) -> Contenido:
+        """
+        Crear un nuevo contenido
+        """
+        # Verificar que el tema existe
+        tema = await session.get(Tema, tema_id)
+        if not tema:
+            raise ValueError(f"Tema con id {tema_id} no existe")
+        
+        # Verificar que la red social existe
+        redsocial = await session.get(Redsocial, redsocial_id)
+        if not redsocial:
+            raise ValueError(f"Red social con id {redsocial_id} no existe")
+        
+        # Verificar que el archivo existe
+        archivo = await session.get(Archivo, archivo_id)
+        if not archivo:
+            raise ValueError(f"Archivo con id {archivo_id} no existe")
+        
+        nuevo_contenido = Contenido(
+            descripcion=descripcion,
+            publicado=publicado,
+            fecha_publicacion=fecha_publicacion,
+            enlace_publicacion=enlace_publicacion,
+            tema_id=tema_id,
+            redsocial_id=redsocial_id,
+            archivo_id=archivo_id
+        )
+        session.add(nuevo_contenido)
+        await session.commit()
+        return nuevo_contenido
+    
+    
+    @staticmethod
+    async def obtener_contenido_por_id(session: AsyncSession, contenido_id: int) -> Optional[Contenido]:
+        """
+        Obtener un contenido por su ID
+        """
+        return await session.get(Contenido, contenido_id)
+    
+    
+    @staticmethod
+    async def obtener_todos_contenidos(
+        session: AsyncSession,
+        limite: int,
+        cursor: Optional[str] = None,
+        tema_id: Optional[int] = None,
+        redsocial_id: Optional[int] = None,
+        publicado: Optional[bool] = None,
+    ) -> Tuple[List[Contenido], Optional[str]]:
+        """
+        Obtener una página de contenidos (los filtros se combinan) y el cursor
+        de la siguiente
+        """
+        statement = ContenidoController._consulta_todos(tema_id, redsocial_id, publicado)
+        return await paginar_async(session, statement, Contenido, limite, cursor)
+    
+    
+    @staticmethod
+    async def obtener_contenidos_por_tema(session: AsyncSession, tema_id: int) -> List[Contenido]:
+        """
+        Obtener todos los contenidos de un tema específico
+        """
+        statement = select(Contenido).where(Contenido.tema_id == tema_id)
+        contenidos = (await session.exec(statement)).all()
+        return list(contenidos)
+    
+    
+    @staticmethod
+    async def obtener_contenidos_por_redsocial(session: AsyncSession, redsocial_id: int) -> List[Contenido]:
+        """
+        Obtener todos los contenidos de una red social específica
+        """
+        statement = select(Contenido).where(Contenido.redsocial_id == redsocial_id)
+        contenidos = (await session.exec(statement)).all()
+        return list(contenidos)
+    
+    
+    @staticmethod
+    async def obtener_contenidos_publicados(session: AsyncSession, publicado: bool = True) -> List[Contenido]:
+        """
+        Obtener contenidos filtrados por estado de publicación
+        """
+        statement = select(Contenido).where(Contenido.publicado == publicado)
+        contenidos = (await session.exec(statement)).all()
+        return list(contenidos)
+    
+    
+    @staticmethod
+    async def actualizar_contenido(
+        session: AsyncSession,
+        contenido_id: int,
+        descripcion: Optional[str] = None,
+        publicado: Optional[bool] = None,
+        fecha_publicacion: Optional[datetime] = None,
+        enlace_publicacion: Optional[str] = None,
+        tema_id: Optional[int] = None,
+        redsocial_id: Optional[int] = None,
+        archivo_id: Optional[int] = None
+    ) -> Optional[Contenido]:
+        """
+        Actualizar un contenido existente
+        """
+        contenido = await session.get(Contenido, contenido_id)
+        if not contenido:
+            return None
+        
+        # Actualizar campos si se proporcionan
+        if descripcion is not None:
+            contenido.descripcion = descripcion
+        
+        if publicado is not None:
+            contenido.publicado = publicado
+        
+        if fecha_publicacion is not None:
+            contenido.fecha_publicacion = fecha_publicacion
+        
+        if enlace_publicacion is not None:
+            contenido.enlace_publicacion = enlace_publicacion
+        
+        if tema_id is not None:
+            # Verificar que el nuevo tema existe
+            tema = await session.get(Tema, tema_id)
+            if not tema:
+                raise ValueError(f"Tema con id {tema_id} no existe")
+            contenido.tema_id = tema_id
+        
+        if redsocial_id is not None:
+            # Verificar que la nueva red social existe
+            redsocial = await session.get(Redsocial, redsocial_id)
+            if not redsocial:
+                raise ValueError(f"Red social con id {redsocial_id} no existe")
+            contenido.redsocial_id = redsocial_id
+        
+        if archivo_id is not None:
+            # Verificar que el nuevo archivo existe
+            archivo = await session.get(Archivo, archivo_id)
+            if not archivo:
+                raise ValueError(f"Archivo con id {archivo_id} no existe")
+            contenido.archivo_id = archivo_id
+        
+        # Actualizar fecha de modificación
+        contenido.update_at = ahora_utc()
+        
+        session.add(contenido)
+        await session.commit()
+        return contenido
+    
+    
+    @staticmethod
+    async def eliminar_contenido(session: AsyncSession, contenido_id: int) -> bool:
+        """
+        Eliminar un contenido por su ID
+        """
+        contenido = await session.get(Contenido, contenido_id)
+        if not contenido:
+            return False
+        
+        await session.delete(contenido)
+        await session.commit()
+        return True
+    
+    
+    @staticmethod
+    async def contar_contenidos_por_tema(session: AsyncSession, tema_id: int) -> int:
+        """
+        Contar cuántos contenidos tiene un tema
+        """
+        return await contar_async(session, Contenido, Contenido.tema_id == tema_id)
+    
+    
+    @staticmethod
+    async def contar_contenidos_por_redsocial(session: AsyncSession, redsocial_id: int) -> int:
+        """
+        Contar cuántos contenidos tiene una red social
+        """
+        return await contar_async(session, Contenido, Contenido.redsocial_id == redsocial_id)
+    
+    
+    @staticmethod
+    async def obtener_estadisticas(session: AsyncSession) -> dict:
+        """
+        Cantidad de contenidos por tema, por red social y por estado de
+        publicación en una sola consulta agregada (GROUPING SETS)
+        """
+        filas = (await session.exec(ContenidoController._consulta_estadisticas())).all()
+        return ContenidoController._agrupar_estadisticas(filas)
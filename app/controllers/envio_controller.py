@@ -0,0 +1,196 @@
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from app.models.modelos import Envio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class EnvioController:
+
+    @staticmethod
+    def encolar(
+        session: Session,
+        red_social: str,
+        parametros: Dict[str, Any],
+        clave_idempotencia: str,
+        contenido_id: Optional[int] = None,
+    ) -> Tuple[Envio, bool]:
+        """
+        Encolar un envío. Si ya existe uno con la misma clave de idempotencia
+        se retorna ese (y False) en lugar de crear otro.
+        """
+        existente = EnvioController.obtener_envio_por_clave(session, clave_idempotencia)
+        if existente:
+            EnvioController._verificar_mismo_envio(existente, red_social, parametros)
+            return existente, False
+
+        nuevo_envio = Envio(
+            red_social=red_social,
+            parametros=parametros,
+            clave_idempotencia=clave_idempotencia,
+            contenido_id=contenido_id,
+        )
+        session.add(nuevo_envio)
+        try:
+            session.commit()
+        except IntegrityError:
+            # Otra petición encoló la misma clave al mismo tiempo
+            session.rollback()
+            existente = EnvioController.obtener_envio_por_clave(session, clave_idempotencia)
+            if existente is None:
+                raise
+            EnvioController._verificar_mismo_envio(existente, red_social, parametros)
+            return existente, False
+        session.refresh(nuevo_envio)
+        return nuevo_envio, True
+
+
+    @staticmethod
+    def _verificar_mismo_envio(envio: Envio, red_social: str, parametros: Dict[str, Any]) -> None:
+        if envio.red_social != red_social or envio.parametros != parametros:
+            raise ValueError(
+                f"La clave de idempotencia '{envio.clave_idempotencia}' ya se usó para otra publicación"
+            )
+
+
+    @staticmethod
+    def obtener_envio_por_id(session: Session, envio_id: int) -> Optional[Envio]:
+        """
+        Obtener un envío por su ID
+        """
+        return session.get(Envio, envio_id)
+
+
+    @staticmethod
+    def obtener_envio_por_clave(session: Session, clave_idempotencia: str) -> Optional[Envio]:
+        """
+        Obtener un envío por su clave de idempotencia
+        """
+        statement = select(Envio).where(Envio.clave_idempotencia == clave_idempotencia)
+        return session.exec(statement).first()
+
+
+    @staticmethod
+    def tomar_vencidos(session: Session, red_social: str, limite: int) -> List[Envio]:
+        """
+        Marcar como "enviando" hasta `limite` envíos pendientes de la red cuyo
+        próximo intento ya venció, y retornarlos. Con FOR UPDATE SKIP LOCKED
+        dos procesos nunca toman el mismo envío.
+        """
+        ahora = datetime.now(timezone.utc)
+        statement = (
+            select(Envio)
+            .where(
+                Envio.red_social == red_social,
+                Envio.estado == "pendiente",
+                Envio.proximo_intento <= ahora,
+            )
+            .order_by(Envio.proximo_intento)  # type: ignore[arg-type]
+            .limit(limite)
+            .with_for_update(skip_locked=True)
+        )
+        envios = list(session.exec(statement).all())
+
+        for envio in envios:
+            envio.estado = "enviando"
+            envio.intentos += 1
+            envio.update_at = ahora
+            session.add(envio)
+        session.commit()
+
+        for envio in envios:
+            session.refresh(envio)
+        return envios
+
+
+    @staticmethod
+    def marcar_publicado(
+        session: Session,
+        envio_id: int,
+        resultado: Dict[str, Any],
+        enlace_publicacion: Optional[str] = None,
+    ) -> Optional[Envio]:
+        """
+        Registrar que la red aceptó la publicación
+        """
+        return EnvioController._actualizar(
+            session, envio_id,
+            estado="publicado", resultado=resultado,
+            enlace_publicacion=enlace_publicacion, ultimo_error=None,
+        )
+
+
+    @staticmethod
+    def reprogramar(session: Session, envio_id: int, error: str, espera: float) -> Optional[Envio]:
+        """
+        Volver a dejar pendiente un envío fallido para reintentarlo en `espera` segundos
+        """
+        return EnvioController._actualizar(
+            session, envio_id,
+            estado="pendiente", ultimo_error=error,
+            proximo_intento=datetime.now(timezone.utc) + timedelta(seconds=espera),
+        )
+
+
+    @staticmethod
+    def marcar_fallido(session: Session, envio_id: int, error: str, estado: str = "fallido") -> Optional[Envio]:
+        """
+        Terminar un envío sin reintentos ("fallido", o "incierto" si no se sabe
+        si la red llegó a publicar)
+        """
+        return EnvioController._actualizar(session, envio_id, estado=estado, ultimo_error=error)
+
+
+    @staticmethod
+    def reintentar(session: Session, envio_id: int) -> Optional[Envio]:
+        """
+        Volver a encolar un envío fallido o incierto (reintento manual)
+        """
+        envio = session.get(Envio, envio_id)
+        if not envio:
+            return None
+        if envio.estado not in ("fallido", "incierto"):
+            raise ValueError(f"Solo se pueden reintentar envíos fallidos o inciertos (estado actual: {envio.estado})")
+
+        return EnvioController._actualizar(
+            session, envio_id,
+            estado="pendiente", intentos=0, proximo_intento=datetime.now(timezone.utc),
+        )
+
+
+    @staticmethod
+    def marcar_inciertos(session: Session, enviando_desde: datetime) -> int:
+        """
+        Pasar a "incierto" los envíos que siguen "enviando" desde antes de
+        `enviando_desde` (el proceso que los enviaba se detuvo). No se reintentan
+        solos: la red pudo haber publicado.
+        """
+        statement = select(Envio).where(Envio.estado == "enviando", Envio.update_at < enviando_desde)
+        envios = list(session.exec(statement).all())
+
+        ahora = datetime.now(timezone.utc)
+        for envio in envios:
+            envio.estado = "incierto"
+            envio.ultimo_error = "El envío se interrumpió sin respuesta de la red"
+            envio.update_at = ahora
+            session.add(envio)
+        session.commit()
+        return len(envios)
+
+
+    @staticmethod
+    def _actualizar(session: Session, envio_id: int, **campos: Any) -> Optional[Envio]:
+        envio = session.get(Envio, envio_id)
+        if not envio:
+            return None
+
+        for campo, valor in campos.items():
+            setattr(envio, campo, valor)
+
+        # Actualizar fecha de modificación
+        envio.update_at = datetime.now(timezone.utc)
+
+        session.add(envio)
+        session.commit()
+        session.refresh(envio)
+        return envio
@@ -1,7 +1,9 @@
 from sqlmodel import Session, select
+from app.core.consultas import contar
+from app.core.paginacion import paginar
 from app.models.modelos import Prompt, Tema
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 class PromptController:
@@ -36,13 +38,19 @@ class PromptController:
     
     
     @staticmethod
-    def obtener_todos_prompts(session: Session) -> List[Prompt]:
+    def obtener_todos_prompts(
+        session: Session,
+        limite: int,
+        cursor: Optional[str] = None,
+        tema_id: Optional[int] = None,
+    ) -> Tuple[List[Prompt], Optional[str]]:
         """
-        Obtener todos los prompts
+        Obtener una página de prompts y el cursor de la siguiente
         """
         statement = select(Prompt)
-        prompts = session.exec(statement).all()
-        return list(prompts)
+        if tema_id is not None:
+            statement = statement.where(Prompt.tema_id == tema_id)
+        return paginar(session, statement, Prompt, limite, cursor)
     
     
     @staticmethod
@@ -104,6 +112,4 @@ class PromptController:
         """
         Contar cuántos prompts tiene un tema
         """
-        statement = select(Prompt).where(Prompt.tema_id == tema_id)
-        prompts = session.exec(statement).all()
-        return len(list(prompts))
+        return contar(session, Prompt, Prompt.tema_id == tema_id)
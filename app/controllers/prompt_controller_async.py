@@ -0,0 +1,117 @@
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.consultas import contar_async
+from app.core.fechas import ahora_utc
+from app.core.paginacion import paginar_async
+from app.models.modelos import Prompt, Tema
+from typing import List, Optional, Tuple
+
+
+class PromptControllerAsync:
+    """
+    Versión con AsyncSession de los métodos de PromptController que usa el
+    router.
+    """
+    
+    @staticmethod
+    async def crear_prompt(session: AsyncSession, descripcion: str, tema_id: int) -> Prompt:
+        """
+        Crear un nuevo prompt
+        """
+        # Verificar que el tema existe
+        tema = await session.get(Tema, tema_id)
+        if not tema:
+            raise ValueError(f"Tema con id {tema_id} no existe")
+        
+        nuevo_prompt = Prompt(
+            descripcion=descripcion,
+            tema_id=tema_id
+        )
+        session.add(nuevo_prompt)
+        await session.commit()
+        return nuevo_prompt
+    
+    
+    @staticmethod
+    async def obtener_prompt_por_id(session: AsyncSession, prompt_id: int) -> Optional[Prompt]:
+        """
+        Obtener un prompt por su ID
+        """
+        return await session.get(Prompt, prompt_id)
+    
+    
+    @staticmethod
+    async def obtener_todos_prompts(
+        session: AsyncSession,
+        limite: int,
+        cursor: Optional[str] = None,
+        tema_id: Optional[int] = None,
+    ) -> Tuple[List[Prompt], Optional[str]]:
+        """
+        Obtener una página de prompts y el cursor de la siguiente
+        """
+        statement = select(Prompt)
+        if tema_id is not None:
+            statement = statement.where(Prompt.tema_id == tema_id)
+        return await paginar_async(session, statement, Prompt, limite, cursor)
+    
+    
+    @staticmethod
+    async def obtener_prompts_por_tema(session: AsyncSession, tema_id: int) -> List[Prompt]:
+        """
+        Obtener todos los prompts de un tema específico
+        """
+        statement = select(Prompt).where(Prompt.tema_id == tema_id)
+        prompts = (await session.exec(statement)).all()
+        return list(prompts)
+    
+    
+    @staticmethod
+    async def actualizar_prompt(session: AsyncSession, prompt_id: int, descripcion: Optional[str] = None,
+                                tema_id: Optional[int] = None) -> Optional[Prompt]:
+        """
+        Actualizar un prompt existente
+        """
+        prompt = await session.get(Prompt, prompt_id)
+        if not prompt:
+            return None
+        
+        # Actualizar campos si se proporcionan
+        if descripcion is not None:
+            prompt.descripcion = descripcion
+        
+        if tema_id is not None:
+            # Verificar que el nuevo tema existe
+            tema = await session.get(Tema, tema_id)
+            if not tema:
+                raise ValueError(f"Tema con id {tema_id} no existe")
+            prompt.tema_id = tema_id
+        
+        # Actualizar fecha de modificación
+        prompt.update_at = ahora_utc()
+        
+        session.add(prompt)
+        await session.commit()
+        return prompt
+    
+    
+    @staticmethod
+    async def eliminar_prompt(session: AsyncSession, prompt_id: int) -> bool:
+        """
+        Eliminar un prompt por su ID
+        """
+        prompt = await session.get(Prompt, prompt_id)
+        if not prompt:
+            return False
+        
+        await session.delete(prompt)
+        await session.commit()
+        return True
+    
+    
+    @staticmethod
+    async def contar_prompts_por_tema(session: AsyncSession, tema_id: int) -> int:
+        """
+        Contar cuántos prompts tiene un tema
+        """
+        return await contar_async(session, Prompt, Prompt.tema_id == tema_id)
@@ -1,4 +1,5 @@
 from sqlmodel import Session, select
+from app.core.consultas import contar
 from app.models.modelos import Redsocial
 from datetime import datetime, timezone
 from typing import List, Optional
@@ -88,6 +89,4 @@ class RedsocialController:
         """
         Contar cuántas redes sociales hay registradas
         """
-        statement = select(Redsocial)
-        redsociales = session.exec(statement).all()
-        return len(list(redsociales))
+        return contar(session, Redsocial)
@@ -0,0 +1,92 @@
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.consultas import contar_async
+from app.core.fechas import ahora_utc
+from app.models.modelos import Redsocial
+from typing import List, Optional
+
+
+class RedsocialControllerAsync:
+    """
+    Versión con AsyncSession de los métodos de RedsocialController que usa
+    el router.
+    """
+    
+    @staticmethod
+    async def crear_redsocial(session: AsyncSession, nombre: str) -> Redsocial:
+        """
+        Crear una nueva red social
+        """
+        nueva_redsocial = Redsocial(nombre=nombre)
+        session.add(nueva_redsocial)
+        await session.commit()
+        return nueva_redsocial
+    
+    
+    @staticmethod
+    async def obtener_redsocial_por_id(session: AsyncSession, redsocial_id: int) -> Optional[Redsocial]:
+        """
+        Obtener una red social por su ID
+        """
+        return await session.get(Redsocial, redsocial_id)
+    
+    
+    @staticmethod
+    async def obtener_todas_redsociales(session: AsyncSession) -> List[Redsocial]:
+        """
+        Obtener todas las redes sociales
+        """
+        redsociales = (await session.exec(select(Redsocial))).all()
+        return list(redsociales)
+    
+    
+    @staticmethod
+    async def obtener_redsocial_por_nombre(session: AsyncSession, nombre: str) -> Optional[Redsocial]:
+        """
+        Obtener una red social por su nombre
+        """
+        statement = select(Redsocial).where(Redsocial.nombre == nombre)
+        return (await session.exec(statement)).first()
+    
+    
+    @staticmethod
+    async def actualizar_redsocial(session: AsyncSession, redsocial_id: int, nombre: Optional[str] = None) -> Optional[Redsocial]:
+        """
+        Actualizar una red social existente
+        """
+        redsocial = await session.get(Redsocial, redsocial_id)
+        if not redsocial:
+            return None
+        
+        # Actualizar campos si se proporcionan
+        if nombre is not None:
+            redsocial.nombre = nombre
+        
+        # Actualizar fecha de modificación
+        redsocial.update_at = ahora_utc()
+        
+        session.add(redsocial)
+        await session.commit()
+        return redsocial
+    
+    
+    @staticmethod
+    async def eliminar_redsocial(session: AsyncSession, redsocial_id: int) -> bool:
+        """
+        Eliminar una red social por su ID
+        """
+        redsocial = await session.get(Redsocial, redsocial_id)
+        if not redsocial:
+            return False
+        
+        await session.delete(redsocial)
+        await session.commit()
+        return True
+    
+    
+    @staticmethod
+    async def contar_redsociales(session: AsyncSession) -> int:
+        """
+        Contar cuántas redes sociales hay registradas
+        """
+        return await contar_async(session, Redsocial)
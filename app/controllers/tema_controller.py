@@ -1,7 +1,10 @@
-from sqlmodel import Session, select, desc
-from app.models.modelos import Tema, Usuario
+from sqlalchemy import desc, literal, null, tuple_, union_all
+from sqlmodel import Session, select
+from app.core.consultas import contar
+from app.core.paginacion import codificar_cursor, decodificar_cursor, paginar
+from app.models.modelos import Archivo, Contenido, Prompt, Redsocial, Tema, Usuario
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 class TemaController:
@@ -30,10 +33,16 @@ class TemaController:
     
     
     @staticmethod
-    def obtener_todos_temas(session: Session) -> List[Tema]:
-        statement = select(Tema).order_by(desc(Tema.update_at))
-        temas = session.exec(statement).all()
-        return list(temas)
+    def obtener_todos_temas(
+        session: Session,
+        limite: int,
+        cursor: Optional[str] = None,
+        usuario_id: Optional[int] = None,
+    ) -> Tuple[List[Tema], Optional[str]]:
+        statement = select(Tema)
+        if usuario_id is not None:
+            statement = statement.where(Tema.usuario_id == usuario_id)
+        return paginar(session, statement, Tema, limite, cursor)
     
     
     
@@ -86,75 +95,138 @@ class TemaController:
     
     @staticmethod
     def contar_temas_por_usuario(session: Session, usuario_id: int) -> int:
-        statement = select(Tema).where(Tema.usuario_id == usuario_id)
-        temas = session.exec(statement).all()
-        return len(list(temas))
+        return contar(session, Tema, Tema.usuario_id == usuario_id)
     
     
     @staticmethod
-    def obtener_historial_tema(session: Session, tema_id: int) -> Optional[dict]:
+    def obtener_historial_tema(
+        session: Session,
+        tema_id: int,
+        limite: int,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> Optional[dict]:
         """
-        Obtiene todos los prompts y contenidos de un tema ordenados por fecha de creación.
-        Retorna una lista combinada ordenada cronológicamente para simular un chat.
-        """
-        from app.models.modelos import Prompt, Contenido, Archivo, Redsocial
+        Obtiene una página del historial de un tema (prompts y contenidos)
+        ordenada cronológicamente para simular un chat.
         
+        Sin `cursor` ni `since` retorna los `limite` elementos más recientes;
+        con `cursor` (el `next_cursor` de la página anterior) los anteriores a
+        esa página; con `since` (un `since_cursor`) solo los posteriores, para
+        consultar periódicamente lo nuevo. Prompts y contenidos (con su red
+        social y archivo) salen de una sola consulta UNION ALL ordenada en la
+        base por (create_at, tipo, id).
+        """
         tema = session.get(Tema, tema_id)
         if not tema:
             return None
         
-        # Obtener todos los prompts del tema
-        statement_prompts = select(Prompt).where(Prompt.tema_id == tema_id)
-        prompts = session.exec(statement_prompts).all()
-        
-        # Obtener todos los contenidos del tema con sus relaciones
-        statement_contenidos = select(Contenido).where(Contenido.tema_id == tema_id)
-        contenidos = session.exec(statement_contenidos).all()
-        
-        # Crear lista unificada con información formateada
-        historial = []
-        
-        # Agregar prompts
-        for prompt in prompts:
-            historial.append({
-                "tipo": "prompt",
-                "id": prompt.id,
-                "descripcion": prompt.descripcion,
-                "tema_id": prompt.tema_id,
-                "create_at": prompt.create_at,
-                "update_at": prompt.update_at
-            })
-        
-        # Agregar contenidos con sus relaciones
-        for contenido in contenidos:
-            # Obtener archivo relacionado
-            archivo = session.get(Archivo, contenido.archivo_id)
-            # Obtener red social relacionada
-            redsocial = session.get(Redsocial, contenido.redsocial_id)
-            
-            historial.append({
-                "tipo": "contenido",
-                "id": contenido.id,
-                "descripcion": contenido.descripcion,
-                "publicado": contenido.publicado,
-                "fecha_publicacion": contenido.fecha_publicacion,
-                "enlace_publicacion": contenido.enlace_publicacion,
-                "tema_id": contenido.tema_id,
-                "redsocial_id": contenido.redsocial_id,
-                "redsocial_nombre": redsocial.nombre if redsocial else None,
-                "archivo_id": contenido.archivo_id,
-                "archivo_url": archivo.url if archivo else None,
-                "archivo_prompt_text": archivo.prompt_text if archivo else None,
-                "create_at": contenido.create_at,
-                "update_at": contenido.update_at
-            })
+        # Una fila de más para saber si hay otra página
+        statement = TemaController._pagina_historial(tema_id, limite + 1, cursor, since)
+        filas = session.exec(statement).all()
+        return TemaController._respuesta_historial(tema, filas, limite, since)
+    
+    
+    @staticmethod
+    def _respuesta_historial(tema: Tema, filas, limite: int, since: Optional[str]) -> dict:
+        hay_mas = len(filas) > limite
+        items = [TemaController._item_historial(fila._mapping) for fila in filas[:limite]]
+        if not since:
+            items.reverse()
         
-        # Ordenar toda la lista por fecha de creación (más antiguo primero)
-        historial.sort(key=lambda x: x["create_at"])
+        def cursor_de(item: dict) -> str:
+            return codificar_cursor(item["create_at"], item["tipo"], item["id"])
         
         return {
             "tema_id": tema.id,
             "tema_nombre": tema.nombre,
             "usuario_id": tema.usuario_id,
-            "historial": historial
+            "historial": items,
+            "next_cursor": cursor_de(items[0]) if hay_mas and not since else None,
+            "since_cursor": cursor_de(items[-1]) if items else since,
+            "hay_mas_nuevos": hay_mas and bool(since),
         }
+    
+    
+    @staticmethod
+    def _pagina_historial(tema_id: int, limite: int, cursor: Optional[str] = None, since: Optional[str] = None):
+        """
+        Los `limite` elementos anteriores a `cursor` (del más nuevo al más
+        antiguo) o, con `since`, los posteriores (del más antiguo al más nuevo).
+        """
+        historial = TemaController._consulta_historial(tema_id).subquery()
+        clave = tuple_(historial.c.create_at, historial.c.tipo, historial.c.id)
+        statement = select(*historial.c)
+        if since:
+            statement = statement.where(clave > tuple_(*TemaController._clave_historial(since)))
+            orden = [historial.c.create_at, historial.c.tipo, historial.c.id]
+        else:
+            if cursor:
+                statement = statement.where(clave < tuple_(*TemaController._clave_historial(cursor)))
+            orden = [desc(historial.c.create_at), desc(historial.c.tipo), desc(historial.c.id)]
+        return statement.order_by(*orden).limit(limite)
+    
+    
+    @staticmethod
+    def _clave_historial(cursor: str) -> Tuple[datetime, str, int]:
+        create_at, tipo, id = decodificar_cursor(cursor, str, int)
+        if tipo not in ("contenido", "prompt"):
+            raise ValueError("Cursor inválido")
+        return create_at, tipo, id
+    
+    
+    # Columnas de los contenidos que los prompts no tienen
+    _COLUMNAS_CONTENIDO = (
+        "publicado", "fecha_publicacion", "enlace_publicacion", "redsocial_id",
+        "redsocial_nombre", "archivo_id", "archivo_url", "archivo_prompt_text",
+    )
+    
+    
+    @staticmethod
+    def _consulta_historial(tema_id: int):
+        """
+        Prompts y contenidos de un tema en una sola lista con las mismas
+        columnas. Los contenidos van primero en el UNION para que los tipos de las columnas salgan de
+        columnas reales y no de los NULL de los prompts.
+        """
+        contenidos = (
+            select(
+                literal("contenido").label("tipo"),
+                Contenido.id,
+                Contenido.descripcion,
+                Contenido.tema_id,
+                Contenido.create_at,
+                Contenido.update_at,
+                Contenido.publicado,
+                Contenido.fecha_publicacion,
+                Contenido.enlace_publicacion,
+                Contenido.redsocial_id,
+                Redsocial.nombre.label("redsocial_nombre"),
+                Contenido.archivo_id,
+                Archivo.url.label("archivo_url"),
+                Archivo.prompt_text.label("archivo_prompt_text"),
+            )
+            .outerjoin(Redsocial, Redsocial.id == Contenido.redsocial_id)
+            .outerjoin(Archivo, Archivo.id == Contenido.archivo_id)
+            .where(Contenido.tema_id == tema_id)
+        )
+        prompts = select(
+            literal("prompt").label("tipo"),
+            Prompt.id,
+            Prompt.descripcion,
+            Prompt.tema_id,
+            Prompt.create_at,
+            Prompt.update_at,
+            *(null().label(columna) for columna in TemaController._COLUMNAS_CONTENIDO),
+        ).where(Prompt.tema_id == tema_id)
+        
+        return union_all(contenidos, prompts)
+    
+    
+    @staticmethod
+    def _item_historial(fila) -> dict:
+        item = dict(fila)
+        if item["tipo"] == "prompt":
+            for columna in TemaController._COLUMNAS_CONTENIDO:
+                del item[columna]
+        return item
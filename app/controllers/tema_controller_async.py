@@ -0,0 +1,121 @@
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.controllers.tema_controller import TemaController
+from app.core.consultas import contar_async
+from app.core.fechas import ahora_utc
+from app.core.paginacion import paginar_async
+from app.models.modelos import Tema, Usuario
+from typing import List, Optional, Tuple
+
+
+class TemaControllerAsync:
+    """
+    Versión con AsyncSession de los métodos de TemaController que usa el
+    router. El historial usa la misma consulta UNION ALL.
+    """
+    
+    @staticmethod
+    async def crear_tema(session: AsyncSession, nombre: str, usuario_id: int) -> Tema:
+        
+        usuario = await session.get(Usuario, usuario_id)
+        if not usuario:
+            raise ValueError(f"Usuario con id {usuario_id} no existe")
+        
+        nuevo_tema = Tema(
+            nombre=nombre,
+            usuario_id=usuario_id
+        )
+        session.add(nuevo_tema)
+        await session.commit()
+        return nuevo_tema
+    
+    
+    @staticmethod
+    async def obtener_tema_por_id(session: AsyncSession, tema_id: int) -> Optional[Tema]:
+        return await session.get(Tema, tema_id)
+    
+    
+    @staticmethod
+    async def obtener_todos_temas(
+        session: AsyncSession,
+        limite: int,
+        cursor: Optional[str] = None,
+        usuario_id: Optional[int] = None,
+    ) -> Tuple[List[Tema], Optional[str]]:
+        statement = select(Tema)
+        if usuario_id is not None:
+            statement = statement.where(Tema.usuario_id == usuario_id)
+        return await paginar_async(session, statement, Tema, limite, cursor)
+    
+    
+    @staticmethod
+    async def obtener_temas_por_usuario(session: AsyncSession, usuario_id: int) -> List[Tema]:
+        statement = select(Tema).where(Tema.usuario_id == usuario_id)
+        temas = (await session.exec(statement)).all()
+        return list(temas)
+    
+    
+    @staticmethod
+    async def actualizar_tema(session: AsyncSession, tema_id: int, nombre: Optional[str] = None,
+                              usuario_id: Optional[int] = None) -> Optional[Tema]:
+        tema = await session.get(Tema, tema_id)
+        if not tema:
+            return None
+        
+        # Actualizar campos si se proporcionan
+        if nombre is not None:
+            tema.nombre = nombre
+        
+        if usuario_id is not None:
+            # Verificar que el nuevo usuario existe
+            usuario = await session.get(Usuario, usuario_id)
+            if not usuario:
+                raise ValueError(f"Usuario con id {usuario_id} no existe")
+            tema.usuario_id = usuario_id
+        
+        # Actualizar fecha de modificación
+        tema.update_at = ahora_utc()
+        
+        session.add(tema)
+        await session.commit()
+        return tema
+    
+    @staticmethod
+    async def eliminar_tema(session: AsyncSession, tema_id: int) -> bool:
+        """
+        Eliminar un tema por su ID
+        """
+        tema = await session.get(Tema, tema_id)
+        if not tema:
+            return False
+        
+        await session.delete(tema)
+        await session.commit()
+        return True
+    
+    
+    @staticmethod
+    async def contar_temas_por_usuario(session: AsyncSession, usuario_id: int) -> int:
+        return await contar_async(session, Tema, Tema.usuario_id == usuario_id)
+    
+    
+    @staticmethod
+    async def obtener_historial_tema(
+        session: AsyncSession,
+        tema_id: int,
+        limite: int,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Obtiene una página del historial de un tema; ver
+        `TemaController.obtener_historial_tema`.
+        """
+        tema = await session.get(Tema, tema_id)
+        if not tema:
+            return None
+        
+        # Una fila de más para saber si hay otra página
+        statement = TemaController._pagina_historial(tema_id, limite + 1, cursor, since)
+        filas = (await session.exec(statement)).all()
+        return TemaController._respuesta_historial(tema, filas, limite, since)
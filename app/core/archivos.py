@@ -0,0 +1,89 @@
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional, Tuple
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from app.core.http_client import ClienteHttp
+
+
+def escribir_atomico(ruta: str, datos: bytes) -> None:
+    """
+    Escribe en un archivo temporal del mismo directorio y luego lo renombra.
+    `os.replace` es atómico, así que quien lea `ruta` ve el archivo anterior
+    o el nuevo completo, nunca uno a medio escribir.
+    """
+    directorio = os.path.dirname(ruta) or "."
+    os.makedirs(directorio, exist_ok=True)
+
+    fd, temporal = tempfile.mkstemp(dir=directorio, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(datos)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+TAMANO_LECTURA = 1024 * 1024
+STATIC_DIR = "app/static/"
+
+
+def ruta_local(ruta_o_url: str) -> Optional[str]:
+    """
+    Ruta en disco de un archivo propio, o None si es una URL remota.
+    Acepta rutas locales y las URLs relativas de /static que retorna la app
+    (ej: "static/images/<hash>.png" -> "app/static/images/<hash>.png").
+    """
+    if urlparse(ruta_o_url).scheme in ("http", "https"):
+        return None
+
+    for ruta in (ruta_o_url, os.path.join(STATIC_DIR, ruta_o_url.lstrip("/").removeprefix("static/"))):
+        if os.path.isfile(ruta):
+            return ruta
+    raise FileNotFoundError(f"El archivo no existe en la ruta: {ruta_o_url}")
+
+
+async def leer_por_partes(
+    ruta: str, inicio: int = 0, largo: Optional[int] = None, tamano: int = TAMANO_LECTURA
+) -> AsyncIterator[bytes]:
+    """Lee `largo` bytes desde `inicio` en bloques de `tamano`, sin cargar el archivo entero."""
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio)
+        pendiente = os.path.getsize(ruta) - inicio if largo is None else largo
+        while pendiente > 0:
+            datos = await asyncio.to_thread(archivo.read, min(tamano, pendiente))
+            if not datos:
+                raise IOError(f"El archivo terminó antes de lo esperado: {ruta}")
+            pendiente -= len(datos)
+            yield datos
+
+
+async def _en_memoria(datos: bytes) -> AsyncIterator[bytes]:
+    yield datos
+
+
+@asynccontextmanager
+async def abrir_fuente(ruta_o_url: str, http: "ClienteHttp") -> AsyncIterator[Tuple[int, AsyncIterator[bytes]]]:
+    """
+    Abre un archivo local o remoto como (tamaño, partes) para enviarlo como cuerpo
+    de otra petición sin tenerlo entero en memoria. Si el servidor remoto no
+    informa el tamaño (o comprime la respuesta) se descarga completo.
+    """
+    local = ruta_local(ruta_o_url)
+    if local is not None:
+        yield os.path.getsize(local), leer_por_partes(local)
+        return
+
+    async with http.cliente.stream("GET", ruta_o_url, timeout=http.timeout_para(ruta_o_url)) as respuesta:
+        respuesta.raise_for_status()
+        largo = respuesta.headers.get("content-length")
+        if largo is not None and "content-encoding" not in respuesta.headers:
+            yield int(largo), respuesta.aiter_raw(TAMANO_LECTURA)
+        else:
+            datos = await respuesta.aread()
+            yield len(datos), _en_memoria(datos)
@@ -12,10 +12,86 @@ class Settings:
     DB_PORT = os.getenv("DB_PORT")
     DB_NAME = os.getenv("DB_NAME")
     DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    # La misma base con asyncpg, para los endpoints async (AsyncSession)
+    DATABASE_URL_ASYNC = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    
+    # Pool de conexiones: hasta DB_POOL_SIZE + DB_MAX_OVERFLOW conexiones por engine
+    # (cada worker tiene dos: el síncrono y el async)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # espera máxima por una conexión libre
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # renueva las conexiones más viejas que esto
+    # Verifica la conexión antes de usarla: descarta las que murieron con un reinicio de Postgres
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))  # 0: sin límite
 
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
     AI_PROVIDER = os.getenv("AI_PROVIDER", "gemini")
     
+    # Proveedor "local": simula el cliente de Gemini sin conexión (desarrollo y pruebas)
+    LOCAL_IA_LATENCIA = float(os.getenv("LOCAL_IA_LATENCIA", "0"))
+    LOCAL_IA_SEG_POR_TOKEN = float(os.getenv("LOCAL_IA_SEG_POR_TOKEN", "0"))
+    LOCAL_IA_CONSULTAS_VIDEO = int(os.getenv("LOCAL_IA_CONSULTAS_VIDEO", "2"))
+    
+    # Reintentos al LLM cuando la respuesta no se puede reparar localmente
+    IA_REINTENTOS = int(os.getenv("IA_REINTENTOS", "1"))
+    
+    # Cache de respuestas del LLM (IA_CACHE_DIR vacío = solo memoria)
+    IA_CACHE_HABILITADO = os.getenv("IA_CACHE_HABILITADO", "true").lower() == "true"
+    IA_CACHE_MAX_ENTRADAS = int(os.getenv("IA_CACHE_MAX_ENTRADAS", "512"))
+    IA_CACHE_TTL = int(os.getenv("IA_CACHE_TTL", "86400"))
+    IA_CACHE_DIR = os.getenv("IA_CACHE_DIR", "")
+    IA_CACHE_DISCO_MAX_MB = int(os.getenv("IA_CACHE_DISCO_MAX_MB", "100"))
+    
+    # Llamadas simultáneas a Imagen en /chat/generar/imagenes
+    IA_IMAGENES_CONCURRENCIA = int(os.getenv("IA_IMAGENES_CONCURRENCIA", "4"))
+    
+    # Cola de trabajos de video
+    VIDEO_INTERVALO_CONSULTA = float(os.getenv("VIDEO_INTERVALO_CONSULTA", "10"))
+    VIDEO_TRABAJOS_TTL = int(os.getenv("VIDEO_TRABAJOS_TTL", "3600"))
+    
+    # Tiempo máximo por red en /publicar/multi (TikTok sube video, tiene el suyo)
+    PUBLICACION_TIMEOUT = float(os.getenv("PUBLICACION_TIMEOUT", "60"))
+    PUBLICACION_TIMEOUT_VIDEO = float(os.getenv("PUBLICACION_TIMEOUT_VIDEO", "300"))
+    
+    # Bandeja de salida: publicaciones encoladas que se envían en segundo plano
+    BANDEJA_CONCURRENCIA = os.getenv("BANDEJA_CONCURRENCIA", "facebook=4,instagram=2,linkedin=2,whatsapp=2,tiktok=1")
+    BANDEJA_INTERVALO = float(os.getenv("BANDEJA_INTERVALO", "5"))
+    BANDEJA_MAX_INTENTOS = int(os.getenv("BANDEJA_MAX_INTENTOS", "8"))
+    BANDEJA_BACKOFF_BASE = float(os.getenv("BANDEJA_BACKOFF_BASE", "5"))
+    BANDEJA_BACKOFF_MAX = float(os.getenv("BANDEJA_BACKOFF_MAX", "1800"))
+    # Un envío que sigue "enviando" pasado este tiempo (p. ej. se reinició la app) queda "incierto"
+    BANDEJA_ENVIANDO_MAX_SEG = float(os.getenv("BANDEJA_ENVIANDO_MAX_SEG", "900"))
+    
+    # Listados paginados (/contenidos/, /temas/, /prompts/, /archivos/)
+    PAGINA_TAMANO = int(os.getenv("PAGINA_TAMANO", "50"))
+    PAGINA_TAMANO_MAX = int(os.getenv("PAGINA_TAMANO_MAX", "200"))
+    
+    # Programador: publica los contenidos con fecha_publicacion cuando llega la hora
+    PROGRAMADOR_ACTIVO = os.getenv("PROGRAMADOR_ACTIVO", "true").lower() == "true"
+    PROGRAMADOR_INTERVALO = float(os.getenv("PROGRAMADOR_INTERVALO", "30"))  # cada cuánto se lee la base
+    PROGRAMADOR_HORIZONTE = float(os.getenv("PROGRAMADOR_HORIZONTE", "600"))  # cuánto por adelantado
+    PROGRAMADOR_LOTE = int(os.getenv("PROGRAMADOR_LOTE", "500"))
+    # Clave del advisory lock de Postgres que elige al único worker que dispara
+    PROGRAMADOR_CLAVE_LIDER = int(os.getenv("PROGRAMADOR_CLAVE_LIDER", "7209183"))
+    
+    # Límite de llamadas salientes por red: red=llamadas_por_segundo:ráfaga
+    LIMITE_REDES = os.getenv("LIMITE_REDES", "facebook=3:20,instagram=1:10,linkedin=1:5,tiktok=0.1:6,tiktok_estado=0.5:10")
+    # Comparte las cubetas entre workers a través de la base de datos (tabla limitered)
+    LIMITE_COMPARTIDO = os.getenv("LIMITE_COMPARTIDO", "false").lower() == "true"
+    LIMITE_PAUSA_429 = float(os.getenv("LIMITE_PAUSA_429", "30"))  # si el 429 no trae Retry-After
+    LIMITE_FACTOR_MINIMO = float(os.getenv("LIMITE_FACTOR_MINIMO", "0.1"))
+    LIMITE_RECUPERACION = float(os.getenv("LIMITE_RECUPERACION", "0.05"))
+    
+    # Cliente HTTP compartido para las APIs de redes sociales
+    HTTP_MAX_CONEXIONES = int(os.getenv("HTTP_MAX_CONEXIONES", "100"))
+    HTTP_MAX_CONEXIONES_KEEPALIVE = int(os.getenv("HTTP_MAX_CONEXIONES_KEEPALIVE", "20"))
+    HTTP_KEEPALIVE_SEG = float(os.getenv("HTTP_KEEPALIVE_SEG", "60"))
+    HTTP_HTTP2 = os.getenv("HTTP_HTTP2", "true").lower() == "true"  # requiere el paquete h2
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+    HTTP_TIMEOUT_CONEXION = float(os.getenv("HTTP_TIMEOUT_CONEXION", "10"))
+    HTTP_TIMEOUTS_POR_HOST = os.getenv("HTTP_TIMEOUTS_POR_HOST", "open.tiktokapis.com=60,open-upload.tiktokapis.com=300,api.linkedin.com=60")
+    
     SECRET_KEY = os.getenv("SECRET_KEY")
     ALGORITHM = os.getenv("ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
@@ -29,6 +105,12 @@ class Settings:
     INSTAGRAM_API_URL = os.getenv("INSTAGRAM_API_URL")
     INSTAGRAM_TOKEN = os.getenv("INSTAGRAM_TOKEN")
     INSTAGRAM_ID_CUENTA = os.getenv("INSTAGRAM_ID_CUENTA")
+    # Consulta del estado de los contenedores antes de publicar. Hijos y carrusel
+    # esperan uno después del otro: 2 * INSTAGRAM_ESTADO_MAX_SEG < PUBLICACION_TIMEOUT
+    INSTAGRAM_ESTADO_INTERVALO = float(os.getenv("INSTAGRAM_ESTADO_INTERVALO", "1"))
+    INSTAGRAM_ESTADO_INTERVALO_MAX = float(os.getenv("INSTAGRAM_ESTADO_INTERVALO_MAX", "10"))
+    INSTAGRAM_ESTADO_MAX_SEG = float(os.getenv("INSTAGRAM_ESTADO_MAX_SEG", "25"))
+    INSTAGRAM_LOTE_CONCURRENCIA = int(os.getenv("INSTAGRAM_LOTE_CONCURRENCIA", "5"))
     
     TIKTOK_CLIENT_KEY = os.getenv("TIKTOK_CLIENT_KEY")
     TIKTOK_CLIENT_SECRET = os.getenv("TIKTOK_CLIENT_SECRET")
@@ -37,6 +119,18 @@ class Settings:
     TIKTOK_ACCESS_TOKEN = os.getenv("TIKTOK_ACCESS_TOKEN")
     TIKTOK_OPEN_ID = os.getenv("TIKTOK_OPEN_ID")
     
+    # Subida por partes: chunks de 5 a 64 MB
+    TIKTOK_CHUNK_MB = int(os.getenv("TIKTOK_CHUNK_MB", "10"))
+    TIKTOK_REINTENTOS_CHUNK = int(os.getenv("TIKTOK_REINTENTOS_CHUNK", "3"))
+    
+    # Seguimiento del estado de las publicaciones (backoff exponencial)
+    TIKTOK_ESTADO_INTERVALO = float(os.getenv("TIKTOK_ESTADO_INTERVALO", "5"))
+    TIKTOK_ESTADO_INTERVALO_MAX = float(os.getenv("TIKTOK_ESTADO_INTERVALO_MAX", "300"))
+    TIKTOK_ESTADO_LOTE = int(os.getenv("TIKTOK_ESTADO_LOTE", "20"))
+    TIKTOK_ESTADO_MAX_SEG = float(os.getenv("TIKTOK_ESTADO_MAX_SEG", "7200"))
+    TIKTOK_ESTADO_TTL = int(os.getenv("TIKTOK_ESTADO_TTL", "86400"))
+    TIKTOK_USUARIO = os.getenv("TIKTOK_USUARIO", "")  # para armar el enlace del post
+    
     TIKTOK_AUTH_URL = os.getenv("TIKTOK_AUTH_URL")
     TIKTOK_TOKEN_URL = os.getenv("TIKTOK_TOKEN_URL")
     
@@ -52,5 +146,5 @@ settings = Settings()
 if not settings.DATABASE_URL:
     raise RuntimeError("variable de entorno 'DATABASE_URL' es requerida.")
 
-if not settings.GEMINI_API_KEY:
+if settings.AI_PROVIDER == "gemini" and not settings.GEMINI_API_KEY:
     raise RuntimeError("variable de entorno 'GEMINI_API_KEY' es requerida.")
\ No newline at end of file
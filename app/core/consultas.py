@@ -0,0 +1,23 @@
+from typing import Any, Type
+
+from sqlalchemy import func
+from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def contar(session: Session, modelo: Type[SQLModel], *condiciones: Any) -> int:
+    """
+    SELECT count(*) en la base: no trae las filas a Python. Con un índice
+    sobre las columnas de las condiciones Postgres lo resuelve con un
+    index-only scan.
+    """
+    return session.exec(_consulta_conteo(modelo, *condiciones)).one()
+
+
+async def contar_async(session: AsyncSession, modelo: Type[SQLModel], *condiciones: Any) -> int:
+    """`contar` con una AsyncSession."""
+    return (await session.exec(_consulta_conteo(modelo, *condiciones))).one()
+
+
+def _consulta_conteo(modelo: Type[SQLModel], *condiciones: Any):
+    return select(func.count()).select_from(modelo).where(*condiciones)
@@ -1,12 +1,158 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
+from app.core.metricas import percentil
 # from app.models import *
 
-engine = create_engine(settings.DATABASE_URL, echo=False)
+
+class PoolConMetricas(QueuePool):
+    """
+    QueuePool que registra cuánto espera cada checkout por una conexión
+    (incluye abrir una nueva mientras haya overflow disponible) y cuántos
+    se rindieron al vencer `pool_timeout`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._max_overflow_configurado = kwargs.get("max_overflow", 10)
+        self._candado = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.conexiones_abiertas = 0
+        self.invalidadas = 0
+        self.max_en_uso = 0
+        self._esperas: Deque[float] = deque(maxlen=1000)
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except PoolTimeoutError:
+            with self._candado:
+                self.timeouts += 1
+            raise
+        espera = time.perf_counter() - inicio
+        with self._candado:
+            self.checkouts += 1
+            self._esperas.append(espera)
+            self.max_en_uso = max(self.max_en_uso, self.checkedout())
+        return conexion
+
+    def registrar_conexion(self) -> None:
+        with self._candado:
+            self.conexiones_abiertas += 1
+
+    def registrar_invalidacion(self) -> None:
+        with self._candado:
+            self.invalidadas += 1
+
+    def metricas(self) -> Dict[str, Any]:
+        with self._candado:
+            esperas = list(self._esperas)
+        return {
+            "tamano": self.size(),
+            "max_overflow": self._max_overflow_configurado,
+            "en_uso": self.checkedout(),
+            "libres": self.checkedin(),
+            # QueuePool lleva overflow negativo mientras no se llenó el pool
+            "overflow": max(0, self.overflow()),
+            "max_en_uso": self.max_en_uso,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "conexiones_abiertas": self.conexiones_abiertas,
+            "invalidadas": self.invalidadas,
+            # Sobre los últimos 1000 checkouts
+            "espera_p50_ms": round(percentil(esperas, 0.50) * 1000, 1),
+            "espera_p95_ms": round(percentil(esperas, 0.95) * 1000, 1),
+            "espera_max_ms": round(max(esperas, default=0.0) * 1000, 1),
+        }
+
+
+class PoolAsyncConMetricas(PoolConMetricas, AsyncAdaptedQueuePool):
+    """Las mismas métricas para el pool del engine async."""
+
+
+def _parametros_engine(url: str, poolclass: type, opciones: Dict[str, Any]) -> Dict[str, Any]:
+    connect_args: Dict[str, Any] = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        # Lo aplica el servidor: una consulta colgada se cancela en lugar de
+        # retener la conexión y dejar al resto esperando en el pool
+        if url.startswith("postgresql+asyncpg"):
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        elif url.startswith("postgresql"):
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    parametros: Dict[str, Any] = {
+        "echo": False,
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+    parametros.update(opciones)
+    return parametros
+
+
+def _registrar_eventos(sincrono: Engine) -> None:
+    # Se consulta `sincrono.pool` en cada evento: dispose() reemplaza el pool
+    if isinstance(sincrono.pool, PoolConMetricas):
+        event.listen(sincrono, "connect", lambda *_: sincrono.pool.registrar_conexion())
+        event.listen(sincrono, "invalidate", lambda *_: sincrono.pool.registrar_invalidacion())
+
+
+def crear_engine(url: str = settings.DATABASE_URL, **opciones: Any) -> Engine:
+    """
+    Engine con el pool configurado en Settings; `opciones` reemplaza
+    cualquiera de los parámetros de `create_engine`.
+    """
+    nuevo = create_engine(url, **_parametros_engine(url, PoolConMetricas, opciones))
+    _registrar_eventos(nuevo)
+    return nuevo
+
+
+def crear_engine_async(url: str = settings.DATABASE_URL_ASYNC, **opciones: Any) -> AsyncEngine:
+    """
+    Engine async (asyncpg) con la misma configuración de pool que
+    `crear_engine`. Mientras espera a Postgres no ocupa un hilo del
+    threadpool, solo una conexión del pool.
+    """
+    nuevo = create_async_engine(url, **_parametros_engine(url, PoolAsyncConMetricas, opciones))
+    _registrar_eventos(nuevo.sync_engine)
+    return nuevo
+
+
+engine = crear_engine()
+async_engine = crear_engine_async()
+
+
+def metricas_pool() -> Dict[str, Any]:
+    return {
+        "sincrono": engine.pool.metricas(),
+        "async": async_engine.sync_engine.pool.metricas(),
+    }
 
 def get_session():
     with Session(engine) as session:
         yield session
-    
+
+async def get_async_session():
+    # Sin expirar al hacer commit: leer un atributo expirado haría I/O
+    # implícito, que en una AsyncSession no está permitido
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
 def init_db():
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    SQLModel.metadata.create_all(engine)
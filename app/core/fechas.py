@@ -0,0 +1,12 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime
+
+# Las fechas se guardan como timestamptz: asyncpg no acepta fechas con zona
+# horaria en columnas `timestamp` (sin zona) y las fechas de la app siempre
+# la tienen
+FechaHora = DateTime(timezone=True)
+
+
+def ahora_utc() -> datetime:
+    return datetime.now(timezone.utc)
@@ -0,0 +1,95 @@
+import importlib.util
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.core.limitador import limitador
+
+
+def _timeouts_por_host(valor: str) -> Dict[str, float]:
+    """Convierte "graph.facebook.com=30,open.tiktokapis.com=120" en un dict host -> segundos."""
+    timeouts = {}
+    for par in valor.split(","):
+        if "=" in par:
+            host, segundos = par.split("=", 1)
+            timeouts[host.strip().lower()] = float(segundos)
+    return timeouts
+
+
+class ClienteHttp:
+    """
+    Cliente HTTP asíncrono compartido por todos los servicios de publicación.
+
+    Se crea una sola vez en el `lifespan` de la app y mantiene un pool de
+    conexiones keep-alive (HTTP/2 si está instalado `h2`), así cada publicación
+    reutiliza DNS, TCP y TLS en lugar de abrir una conexión nueva.
+    """
+
+    def __init__(self):
+        self._cliente: Optional[httpx.AsyncClient] = None
+        self.timeout = settings.HTTP_TIMEOUT
+        self.timeouts_por_host = _timeouts_por_host(settings.HTTP_TIMEOUTS_POR_HOST)
+
+    @property
+    def cliente(self) -> httpx.AsyncClient:
+        # Fuera del lifespan (scripts, consola) se crea bajo demanda
+        self.iniciar()
+        return self._cliente
+
+    @property
+    def http2(self) -> bool:
+        return settings.HTTP_HTTP2 and importlib.util.find_spec("h2") is not None
+
+    def iniciar(self) -> None:
+        if self._cliente is None or self._cliente.is_closed:
+            self._cliente = self._crear()
+
+    async def cerrar(self) -> None:
+        if self._cliente is not None:
+            await self._cliente.aclose()
+            self._cliente = None
+
+    def timeout_para(self, url: str) -> httpx.Timeout:
+        host = (urlparse(url).hostname or "").lower()
+        segundos = self.timeouts_por_host.get(host, self.timeout)
+        return httpx.Timeout(segundos, connect=min(segundos, settings.HTTP_TIMEOUT_CONEXION))
+
+    async def solicitar(self, metodo: str, url: str, red: Optional[str] = None, **kwargs: Any) -> httpx.Response:
+        """
+        Envía la petición por el pool compartido con el timeout del host de destino.
+        Con `red` la petición espera su turno en el limitador de esa red y la
+        respuesta ajusta su tasa (ver `app.core.limitador`).
+        """
+        kwargs.setdefault("timeout", self.timeout_para(url))
+        if red is None:
+            return await self.cliente.request(metodo, url, **kwargs)
+
+        await limitador.esperar_turno(red)
+        respuesta = await self.cliente.request(metodo, url, **kwargs)
+        await limitador.registrar_respuesta(red, respuesta)
+        return respuesta
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.solicitar("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.solicitar("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.solicitar("PUT", url, **kwargs)
+
+    def _crear(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONEXIONES,
+                max_keepalive_connections=settings.HTTP_MAX_CONEXIONES_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_SEG,
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=settings.HTTP_TIMEOUT_CONEXION),
+        )
+
+
+cliente_http = ClienteHttp()
@@ -0,0 +1,244 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import httpx
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metricas import percentil
+from app.core.reintentos import espera_sugerida
+
+
+def _limites_por_red(valor: str) -> Dict[str, Tuple[float, float]]:
+    """Convierte "facebook=3:20,tiktok=0.1:6" en un dict red -> (llamadas por segundo, ráfaga)."""
+    limites = {}
+    for par in valor.split(","):
+        if "=" in par:
+            red, limite = par.split("=", 1)
+            tasa, _, rafaga = limite.partition(":")
+            limites[red.strip().lower()] = (float(tasa), float(rafaga or 1))
+    return limites
+
+
+class CubetaTokens:
+    """
+    Cubeta de tokens de una red: admite ráfagas de hasta `capacidad` llamadas
+    y después `tasa` llamadas por segundo.
+
+    Las llamadas esperan en fila (FIFO); la primera vuelve a mirar la cubeta
+    cada vez que despierta, así una pausa o una baja de tasa por un 429 se
+    aplica también a las llamadas que ya estaban esperando. Al recibir un 429
+    la tasa se reduce a la mitad y se recupera de a poco con cada respuesta
+    exitosa (aumento aditivo, reducción multiplicativa).
+    """
+
+    def __init__(self, red: str, tasa: float, capacidad: float):
+        self.red = red
+        self.tasa = tasa
+        self.capacidad = capacidad
+        self.factor = 1.0
+
+        self.tokens = capacidad
+        self.actualizado = time.monotonic()
+        self.pausado_hasta = 0.0
+        self.fila = asyncio.Lock()
+        self.en_fila = 0
+
+        self.solicitudes = 0
+        self.demoradas = 0
+        self.espera_total = 0.0
+        self.respuestas_429 = 0
+        self.esperas: Deque[float] = deque(maxlen=1000)
+
+    @property
+    def tasa_actual(self) -> float:
+        return self.tasa * self.factor
+
+    def _reponer(self) -> None:
+        ahora = time.monotonic()
+        self.tokens = min(self.capacidad, self.tokens + (ahora - self.actualizado) * self.tasa_actual)
+        self.actualizado = ahora
+
+    def tomar(self) -> float:
+        """Toma un token si hay; si no, retorna los segundos hasta que haya uno."""
+        self._reponer()
+        pausa = self.pausado_hasta - time.monotonic()
+        if pausa > 0:
+            return pausa
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.tasa_actual
+
+    def pausar(self, segundos: float) -> None:
+        self.pausado_hasta = max(self.pausado_hasta, time.monotonic() + segundos)
+
+    def frenar(self) -> None:
+        self._reponer()
+        self.respuestas_429 += 1
+        self.factor = max(settings.LIMITE_FACTOR_MINIMO, self.factor / 2)
+
+    def recuperar(self) -> None:
+        self._reponer()
+        self.factor = min(1.0, self.factor + settings.LIMITE_RECUPERACION)
+
+    def registrar_espera(self, espera: float) -> None:
+        self.solicitudes += 1
+        self.esperas.append(espera)
+        if espera > 0:
+            self.demoradas += 1
+            self.espera_total += espera
+
+    def metricas(self) -> Dict[str, Any]:
+        esperas = list(self.esperas)
+        return {
+            "red": self.red,
+            "tasa": self.tasa,
+            "tasa_actual": round(self.tasa_actual, 4),
+            "capacidad": self.capacidad,
+            "tokens": round(min(self.capacidad, self.tokens + (time.monotonic() - self.actualizado) * self.tasa_actual), 2),
+            "en_fila": self.en_fila,
+            "pausa_restante_seg": round(max(0.0, self.pausado_hasta - time.monotonic()), 1),
+            "solicitudes": self.solicitudes,
+            "demoradas": self.demoradas,
+            "respuestas_429": self.respuestas_429,
+            "espera_total_seg": round(self.espera_total, 3),
+            # Sobre las últimas 1000 solicitudes
+            "espera_p50_ms": round(percentil(esperas, 0.50) * 1000, 1),
+            "espera_p95_ms": round(percentil(esperas, 0.95) * 1000, 1),
+            "espera_max_ms": round(max(esperas, default=0.0) * 1000, 1),
+        }
+
+
+class LimitadorRedes:
+    """
+    Limita las llamadas salientes a cada red con una cubeta de tokens
+    (LIMITE_REDES). Con LIMITE_COMPARTIDO la cubeta vive en la tabla
+    `limitered` de Postgres y la comparten todos los workers; si la base
+    falla se sigue con la cubeta en memoria del proceso.
+    """
+
+    def __init__(self, limites: Optional[Dict[str, Tuple[float, float]]] = None, compartido: Optional[bool] = None):
+        limites = _limites_por_red(settings.LIMITE_REDES) if limites is None else limites
+        self.cubetas = {red: CubetaTokens(red, tasa, rafaga) for red, (tasa, rafaga) in limites.items()}
+        self.compartido = settings.LIMITE_COMPARTIDO if compartido is None else compartido
+
+    async def esperar_turno(self, red: str) -> float:
+        """Espera hasta que la red admita otra llamada. Retorna los segundos esperados."""
+        cubeta = self.cubetas.get(red)
+        if cubeta is None:
+            return 0.0
+
+        inicio = time.monotonic()
+        cubeta.en_fila += 1
+        try:
+            async with cubeta.fila:
+                while (espera := await self._tomar(cubeta)) > 0:
+                    await asyncio.sleep(espera)
+        finally:
+            cubeta.en_fila -= 1
+
+        espera = time.monotonic() - inicio
+        cubeta.registrar_espera(espera)
+        return espera
+
+    async def _tomar(self, cubeta: CubetaTokens) -> float:
+        if self.compartido:
+            try:
+                espera = await asyncio.to_thread(self._tomar_en_bd, cubeta)
+                return max(espera, cubeta.pausado_hasta - time.monotonic())
+            except Exception as e:
+                print(f"Limitador compartido no disponible, se usa el local ({cubeta.red}): {e}")
+        return cubeta.tomar()
+
+    async def registrar_respuesta(self, red: str, respuesta: httpx.Response) -> None:
+        """Ajusta la tasa de la red según la respuesta: frena ante un 429, se recupera con los éxitos."""
+        cubeta = self.cubetas.get(red)
+        if cubeta is None:
+            return
+
+        if respuesta.status_code != 429:
+            if respuesta.is_success:
+                cubeta.recuperar()
+            return
+
+        cubeta.frenar()
+        pausa = espera_sugerida(respuesta.headers)
+        pausa = settings.LIMITE_PAUSA_429 if pausa is None else pausa
+        cubeta.pausar(pausa)
+        print(f"{red} respondió 429: pausa de {pausa:g}s y tasa reducida a {cubeta.tasa_actual:.3g}/s")
+
+        if self.compartido:
+            try:
+                await asyncio.to_thread(self._pausar_en_bd, red, pausa)
+            except Exception as e:
+                print(f"No se pudo compartir la pausa de {red}: {e}")
+
+    def metricas(self) -> Dict[str, Any]:
+        return {
+            "compartido": self.compartido,
+            "redes": [cubeta.metricas() for cubeta in self.cubetas.values()],
+        }
+
+    @staticmethod
+    def _tomar_en_bd(cubeta: CubetaTokens) -> float:
+        # Repone los tokens según el tiempo transcurrido y toma uno si hay y la
+        # red no está en pausa, todo con la fila bloqueada (FOR UPDATE)
+        consulta = text("""
+            WITH actual AS (
+                SELECT red,
+                       LEAST(
+                           CAST(:capacidad AS double precision),
+                           tokens + EXTRACT(EPOCH FROM now() - actualizado) * :tasa
+                       ) AS disponibles,
+                       EXTRACT(EPOCH FROM bloqueado_hasta - now()) AS bloqueado
+                FROM limitered
+                WHERE red = :red
+                FOR UPDATE
+            )
+            UPDATE limitered
+            SET tokens = actual.disponibles
+                    - CASE WHEN actual.bloqueado <= 0 AND actual.disponibles >= 1 THEN 1 ELSE 0 END,
+                actualizado = now()
+            FROM actual
+            WHERE limitered.red = actual.red
+            RETURNING actual.disponibles, actual.bloqueado
+        """)
+        with engine.begin() as conexion:
+            fila = conexion.execute(
+                consulta, {"red": cubeta.red, "capacidad": cubeta.capacidad, "tasa": cubeta.tasa_actual}
+            ).one_or_none()
+            if fila is None:
+                # Primera llamada a la red: la cubeta arranca llena (menos este token)
+                conexion.execute(
+                    text("""
+                        INSERT INTO limitered (red, tokens, actualizado, bloqueado_hasta)
+                        VALUES (:red, CAST(:capacidad AS double precision) - 1, now(), now())
+                        ON CONFLICT (red) DO NOTHING
+                    """),
+                    {"red": cubeta.red, "capacidad": cubeta.capacidad},
+                )
+                return 0.0
+
+        disponibles, bloqueado = float(fila[0]), float(fila[1])
+        if bloqueado > 0:
+            return bloqueado
+        if disponibles >= 1:
+            return 0.0
+        return (1 - disponibles) / cubeta.tasa_actual
+
+    @staticmethod
+    def _pausar_en_bd(red: str, segundos: float) -> None:
+        consulta = text("""
+            UPDATE limitered
+            SET bloqueado_hasta = GREATEST(bloqueado_hasta, now() + make_interval(secs => :segundos))
+            WHERE red = :red
+        """)
+        with engine.begin() as conexion:
+            conexion.execute(consulta, {"red": red, "segundos": segundos})
+
+
+limitador = LimitadorRedes()
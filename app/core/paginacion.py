@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Type, TypeVar
+
+from sqlalchemy import desc, tuple_
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+T = TypeVar("T", bound=SQLModel)
+
+
+def codificar_cursor(fecha: datetime, *claves: Any) -> str:
+    """Cursor opaco con la clave de orden de una fila: (fecha, ..., id)."""
+    datos = json.dumps([fecha.isoformat(), *claves]).encode()
+    return base64.urlsafe_b64encode(datos).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, *tipos: type) -> Tuple[Any, ...]:
+    """
+    Retorna (fecha, *claves), convirtiendo cada clave con su tipo en `tipos`
+    (por defecto una sola clave, el id). Lanza ValueError si el cursor no es
+    uno emitido por `codificar_cursor`.
+    """
+    tipos = tipos or (int,)
+    try:
+        datos = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        fecha, *claves = json.loads(datos)
+        if len(claves) != len(tipos):
+            raise ValueError(f"Se esperaban {len(tipos)} claves")
+        return (datetime.fromisoformat(fecha), *(tipo(clave) for tipo, clave in zip(tipos, claves)))
+    except Exception as e:
+        raise ValueError("Cursor inválido") from e
+
+
+def paginar(
+    session: Session,
+    statement: SelectOfScalar[T],
+    modelo: Type[T],
+    limite: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[T], Optional[str]]:
+    """
+    Pagina por keyset sobre (update_at, id), de lo más reciente a lo más
+    antiguo: cada página sigue desde la última fila de la anterior en lugar
+    de usar OFFSET, así el costo no crece con la página. Retorna las filas y
+    el cursor de la siguiente página (None si es la última).
+    """
+    statement = _consulta_pagina(statement, modelo, limite, cursor)
+    return _resultado_pagina(list(session.exec(statement).all()), limite)
+
+
+async def paginar_async(
+    session: AsyncSession,
+    statement: SelectOfScalar[T],
+    modelo: Type[T],
+    limite: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[T], Optional[str]]:
+    """`paginar` con una AsyncSession."""
+    statement = _consulta_pagina(statement, modelo, limite, cursor)
+    return _resultado_pagina(list((await session.exec(statement)).all()), limite)
+
+
+def _consulta_pagina(
+    statement: SelectOfScalar[T], modelo: Type[T], limite: int, cursor: Optional[str]
+) -> SelectOfScalar[T]:
+    if cursor:
+        update_at, id = decodificar_cursor(cursor)
+        statement = statement.where(tuple_(modelo.update_at, modelo.id) < tuple_(update_at, id))  # type: ignore[attr-defined]
+
+    # Una fila de más para saber si hay otra página sin contar el total
+    return statement.order_by(desc(modelo.update_at), desc(modelo.id)).limit(limite + 1)  # type: ignore[attr-defined]
+
+
+def _resultado_pagina(filas: List[T], limite: int) -> Tuple[List[T], Optional[str]]:
+    if len(filas) <= limite:
+        return filas, None
+    filas = filas[:limite]
+    ultima = filas[-1]
+    return filas, codificar_cursor(ultima.update_at, ultima.id)  # type: ignore[attr-defined]
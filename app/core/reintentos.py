@@ -0,0 +1,95 @@
+import json
+import math
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+import httpx
+
+
+def _segundos_retry_after(valor: str) -> Optional[float]:
+    # Retry-After puede venir en segundos o como fecha HTTP
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        fecha = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return max(0.0, (fecha - datetime.now(timezone.utc)).total_seconds())
+
+
+def _segundos_uso_graph(valor: str) -> Optional[float]:
+    """
+    X-Business-Use-Case-Usage de la Graph API (Facebook e Instagram):
+    {"<id>": [{"type": "pages", "call_count": 100, ..., "estimated_time_to_regain_access": 12}]}
+    con el tiempo en minutos.
+    """
+    try:
+        uso = json.loads(valor)
+    except ValueError:
+        return None
+
+    minutos = [
+        limite.get("estimated_time_to_regain_access") or 0
+        for limites in (uso.values() if isinstance(uso, dict) else [])
+        for limite in (limites if isinstance(limites, list) else [])
+        if isinstance(limite, dict)
+    ]
+    return max(minutos) * 60 if minutos and max(minutos) > 0 else None
+
+
+def espera_sugerida(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Segundos que la red pide esperar antes de volver a intentar, o None si no
+    lo indica. Se leen Retry-After (estándar; LinkedIn, WhatsApp), X-RateLimit-Reset
+    (segundos o epoch) y el uso de la Graph API de Facebook/Instagram.
+    """
+    if not headers:
+        return None
+    cabeceras = {clave.lower(): valor for clave, valor in headers.items()}
+
+    esperas = []
+    if "retry-after" in cabeceras:
+        esperas.append(_segundos_retry_after(cabeceras["retry-after"]))
+
+    if "x-ratelimit-reset" in cabeceras:
+        try:
+            reset = float(cabeceras["x-ratelimit-reset"])
+            # Valores grandes son un epoch, no una cantidad de segundos
+            esperas.append(max(0.0, reset - time.time()) if reset > 1_000_000_000 else reset)
+        except ValueError:
+            pass
+
+    if "x-business-use-case-usage" in cabeceras:
+        esperas.append(_segundos_uso_graph(cabeceras["x-business-use-case-usage"]))
+
+    esperas = [espera for espera in esperas if espera is not None]
+    return max(esperas) if esperas else None
+
+
+def cabeceras_reintento(respuesta: httpx.Response) -> Optional[Dict[str, str]]:
+    """
+    Traduce las cabeceras de límite de la red a un Retry-After para el
+    `HTTPException` que lanzan los servicios, así quien lo reciba (la API o la
+    bandeja de salida) sabe cuánto esperar.
+    """
+    espera = espera_sugerida(respuesta.headers)
+    if espera is None:
+        return None
+    return {"Retry-After": str(math.ceil(espera))}
+
+
+def backoff_con_jitter(intento: int, base: float, maximo: float) -> float:
+    """
+    Espera exponencial (base * 2^intento, hasta `maximo`) con jitter: un valor
+    al azar entre la mitad y el total, para que los reintentos de varios envíos
+    fallidos a la vez no lleguen juntos a la red.
+    """
+    tope = min(maximo, base * (2 ** max(0, intento)))
+    return random.uniform(tope / 2, tope)
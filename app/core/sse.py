@@ -0,0 +1,9 @@
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+
+
+def evento_sse(evento: str, datos: Any) -> str:
+    """Formatea un evento de Server-Sent Events con datos JSON."""
+    return f"event: {evento}\ndata: {json.dumps(jsonable_encoder(datos), ensure_ascii=False)}\n\n"
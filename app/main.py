@@ -4,9 +4,15 @@ from fastapi import Depends, FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from app.controllers import tema_controller
-from app.core.database import init_db
-from app.routers import archivo_router, chat_router, contenido_router, linkedin_router, login_router, prompt_router, publicar_router, redsocial_router, tema_router, tiktok_router, whatsapp_router
+from app.core.database import async_engine, init_db
+from app.core.config import settings
+from app.core.http_client import cliente_http
+from app.routers import archivo_router, chat_router, contenido_router, interno_router, linkedin_router, login_router, prompt_router, publicar_router, redsocial_router, tema_router, tiktok_router, whatsapp_router
+from app.services.bandeja_salida_service import bandeja_salida
 from app.services.jwt_service import get_current_user
+from app.services.programador_service import programador
+from app.services.trabajo_service import gestor_trabajos
+from app.services.tiktok_seguimiento_service import seguimiento_tiktok
 from app.core.cors import configuracion_cors
 
 
@@ -14,7 +20,19 @@ from app.core.cors import configuracion_cors
 async def lifespan(app: FastAPI):
     print("Iniciando app")
     init_db()
+    cliente_http.iniciar()
+    gestor_trabajos.iniciar()
+    seguimiento_tiktok.iniciar()
+    bandeja_salida.iniciar()
+    if settings.PROGRAMADOR_ACTIVO:
+        programador.iniciar()
     yield
+    await programador.detener()
+    await bandeja_salida.detener()
+    await seguimiento_tiktok.detener()
+    await gestor_trabajos.detener()
+    await cliente_http.cerrar()
+    await async_engine.dispose()
     print("Cerrando app")
 
 
@@ -44,3 +62,4 @@ app.include_router(prompt_router.router)
 app.include_router(redsocial_router.router)
 app.include_router(archivo_router.router)
 app.include_router(contenido_router.router)
+app.include_router(interno_router.router)
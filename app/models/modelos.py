@@ -1,5 +1,7 @@
-from datetime import datetime, timezone
-from sqlmodel import SQLModel, Field, Relationship
+from datetime import datetime
+from typing import Any
+from sqlmodel import JSON, Column, Index, SQLModel, Field, Relationship
+from app.core.fechas import FechaHora, ahora_utc
 
 class Usuario(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
@@ -7,20 +9,26 @@ class Usuario(SQLModel, table=True):
     email: str = Field(index=True, unique=True)
     password: str
     
-    create_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    update_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    create_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
+    update_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
     
     # Relación: Un usuario puede crear muchos temas
     temas: list["Tema"] = Relationship(back_populates="usuario")
 
 
 class Tema(SQLModel, table=True):
+    __table_args__ = (
+        # Orden de los listados paginados (ver app.core.paginacion), también por usuario
+        Index("ix_tema_update_at_id", "update_at", "id"),
+        Index("ix_tema_usuario_id_update_at", "usuario_id", "update_at", "id"),
+    )
+    
     id: int | None = Field(default=None, primary_key=True)
     nombre: str
     usuario_id: int = Field(foreign_key="usuario.id")
     
-    create_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    update_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    create_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
+    update_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
     
     # Relación: Un tema pertenece a un usuario
     usuario: "Usuario" = Relationship(back_populates="temas")
@@ -29,12 +37,18 @@ class Tema(SQLModel, table=True):
     
     
 class Prompt(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_prompt_update_at_id", "update_at", "id"),
+        # Historial y conteo de un tema
+        Index("ix_prompt_tema_id_create_at", "tema_id", "create_at", "id"),
+    )
+    
     id: int | None = Field(default=None, primary_key=True)
     descripcion: str
     tema_id: int = Field(foreign_key="tema.id")
     
-    create_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    update_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    create_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
+    update_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
     
     # Relación: Un prompt pertenece a un tema
     tema: "Tema" = Relationship(back_populates="prompts")
@@ -44,26 +58,34 @@ class Redsocial(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     nombre: str
     
-    create_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    update_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    create_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
+    update_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
     
     # Relación: Una red social publica muchos contenidos
     contenidos: list["Contenido"] = Relationship(back_populates="redsocial")
     
     
 class Contenido(SQLModel, table=True):
+    __table_args__ = (
+        # El programador busca los contenidos sin publicar por fecha
+        Index("ix_contenido_publicado_fecha_publicacion", "publicado", "fecha_publicacion"),
+        Index("ix_contenido_update_at_id", "update_at", "id"),
+        # Historial y conteo de un tema
+        Index("ix_contenido_tema_id_create_at", "tema_id", "create_at", "id"),
+    )
+    
     id: int | None = Field(default=None, primary_key=True)
     descripcion: str
     publicado: bool = Field(default=True)
-    fecha_publicacion: datetime | None = None
+    fecha_publicacion: datetime | None = Field(default=None, sa_type=FechaHora)
     enlace_publicacion: str | None = None
     
     tema_id: int = Field(foreign_key="tema.id")
-    redsocial_id: int = Field(foreign_key="redsocial.id")
-    archivo_id: int = Field(foreign_key="archivo.id")
+    redsocial_id: int = Field(foreign_key="redsocial.id", index=True)
+    archivo_id: int = Field(foreign_key="archivo.id", index=True)
     
-    create_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    update_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    create_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
+    update_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
    
     # Relación: Un contenido pertenece a un tema
     tema: "Tema" = Relationship(back_populates="contenidos")
@@ -74,12 +96,47 @@ class Contenido(SQLModel, table=True):
     
 
 class Archivo(SQLModel, table=True):
+    __table_args__ = (Index("ix_archivo_update_at_id", "update_at", "id"),)
+    
     id: int | None = Field(default=None, primary_key=True)
     url: str
     prompt_text: str | None = None
+    # SHA-256 de los bytes del archivo y del prompt que lo generó (media generada por IA)
+    hash_contenido: str | None = Field(default=None, index=True)
+    hash_prompt: str | None = Field(default=None, index=True)
     
-    create_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    update_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    create_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
+    update_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
     
     # Relación: Un archivo puede pertenecer a muchos contenidos
     contenidos: list["Contenido"] = Relationship(back_populates="archivo")
+
+
+class Envio(SQLModel, table=True):
+    """Publicación encolada en la bandeja de salida, pendiente de enviar a una red."""
+    id: int | None = Field(default=None, primary_key=True)
+    red_social: str = Field(index=True)
+    # Argumentos del servicio de la red (texto, url de la imagen o video, ...)
+    parametros: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    # Un mismo envío nunca se encola dos veces con la misma clave
+    clave_idempotencia: str = Field(index=True, unique=True)
+    # pendiente | enviando | publicado | fallido | incierto
+    estado: str = Field(default="pendiente", index=True)
+    intentos: int = Field(default=0)
+    proximo_intento: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora, index=True)
+    ultimo_error: str | None = None
+    resultado: dict[str, Any] | None = Field(default=None, sa_column=Column(JSON))
+    enlace_publicacion: str | None = None
+    
+    contenido_id: int | None = Field(default=None, foreign_key="contenido.id", index=True)
+    
+    create_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
+    update_at: datetime = Field(default_factory=ahora_utc, sa_type=FechaHora)
+
+
+class LimiteRed(SQLModel, table=True):
+    """Cubeta de tokens de una red compartida entre workers (LIMITE_COMPARTIDO)."""
+    red: str = Field(primary_key=True)
+    tokens: float
+    actualizado: datetime = Field(sa_type=FechaHora)
+    bloqueado_hasta: datetime = Field(sa_type=FechaHora)
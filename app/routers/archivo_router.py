@@ -1,20 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from app.controllers.archivo_controller import ArchivoController
-from app.schemas.archivo_schema import ArchivoCreateRequest, ArchivoUpdateRequest, ArchivoResponse
-from app.core.database import get_session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.controllers.archivo_controller_async import ArchivoControllerAsync
+from app.schemas.archivo_schema import ArchivoCreateRequest, ArchivoUpdateRequest, ArchivoResponse, ArchivoPaginaResponse
+from app.core.config import settings
+from app.core.database import get_async_session
+from typing import List, Optional
 
 router = APIRouter(prefix="/archivos", tags=["Archivos"])
 
 
 @router.post("/", response_model=ArchivoResponse, status_code=status.HTTP_201_CREATED)
-def crear_archivo(request: ArchivoCreateRequest, session: Session = Depends(get_session)):
+async def crear_archivo(request: ArchivoCreateRequest, session: AsyncSession = Depends(get_async_session)):
     """
     Crear un nuevo archivo
     """
     try:
-        archivo = ArchivoController.crear_archivo(
+        archivo = await ArchivoControllerAsync.crear_archivo(
             session=session, url=request.url, prompt_text=request.prompt_text
         )
         return archivo
@@ -26,14 +27,23 @@ def crear_archivo(request: ArchivoCreateRequest, session: Session = Depends(get_
         )
 
 
-@router.get("/", response_model=List[ArchivoResponse])
-def obtener_todos_archivos(session: Session = Depends(get_session)):
+@router.get("/", response_model=ArchivoPaginaResponse)
+async def obtener_todos_archivos(
+    limite: int = Query(settings.PAGINA_TAMANO, ge=1, le=settings.PAGINA_TAMANO_MAX),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+):
     """
-    Obtener todos los archivos
+    Obtener los archivos por páginas, de los más recientes a los más antiguos.
+    Para la página siguiente se envía `next_cursor` como `cursor`.
     """
     try:
-        archivos = ArchivoController.obtener_todos_archivos(session=session)
-        return archivos
+        archivos, next_cursor = await ArchivoControllerAsync.obtener_todos_archivos(
+            session=session, limite=limite, cursor=cursor
+        )
+        return {"items": archivos, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -41,12 +51,12 @@ def obtener_todos_archivos(session: Session = Depends(get_session)):
 
 
 @router.get("/{archivo_id}", response_model=ArchivoResponse)
-def obtener_archivo(archivo_id: int, session: Session = Depends(get_session)):
+async def obtener_archivo(archivo_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Obtener un archivo por su ID
     """
     try:
-        archivo = ArchivoController.obtener_archivo_por_id(
+        archivo = await ArchivoControllerAsync.obtener_archivo_por_id(
             session=session, archivo_id=archivo_id
         )
         if not archivo:
@@ -64,12 +74,12 @@ def obtener_archivo(archivo_id: int, session: Session = Depends(get_session)):
 
 
 @router.get("/contenido/{contenido_id}", response_model=ArchivoResponse)
-def obtener_archivo_por_contenido(contenido_id: int, session: Session = Depends(get_session)):
+async def obtener_archivo_por_contenido(contenido_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Obtener el archivo de un contenido específico
     """
     try:
-        archivo = ArchivoController.obtener_archivos_por_contenido(
+        archivo = await ArchivoControllerAsync.obtener_archivos_por_contenido(
             session=session, contenido_id=contenido_id
         )
         if not archivo:
@@ -87,14 +97,14 @@ def obtener_archivo_por_contenido(contenido_id: int, session: Session = Depends(
 
 
 @router.put("/{archivo_id}", response_model=ArchivoResponse)
-def actualizar_archivo(
-    archivo_id: int, request: ArchivoUpdateRequest, session: Session = Depends(get_session)
+async def actualizar_archivo(
+    archivo_id: int, request: ArchivoUpdateRequest, session: AsyncSession = Depends(get_async_session)
 ):
     """
     Actualizar un archivo existente
     """
     try:
-        archivo = ArchivoController.actualizar_archivo(
+        archivo = await ArchivoControllerAsync.actualizar_archivo(
             session=session,
             archivo_id=archivo_id,
             url=request.url,
@@ -117,12 +127,12 @@ def actualizar_archivo(
 
 
 @router.delete("/{archivo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def eliminar_archivo(archivo_id: int, session: Session = Depends(get_session)):
+async def eliminar_archivo(archivo_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Eliminar un archivo por su ID
     """
     try:
-        eliminado = ArchivoController.eliminar_archivo(
+        eliminado = await ArchivoControllerAsync.eliminar_archivo(
             session=session, archivo_id=archivo_id
         )
         if not eliminado:
@@ -140,12 +150,12 @@ def eliminar_archivo(archivo_id: int, session: Session = Depends(get_session)):
 
 
 @router.get("/stats/count", response_model=dict)
-def contar_archivos(session: Session = Depends(get_session)):
+async def contar_archivos(session: AsyncSession = Depends(get_async_session)):
     """
     Contar cuántos archivos hay en total
     """
     try:
-        cantidad = ArchivoController.contar_archivos_sin_contenido(session=session)
+        cantidad = await ArchivoControllerAsync.contar_archivos_sin_contenido(session=session)
         return {"cantidad_archivos": cantidad}
     except Exception as e:
         raise HTTPException(
@@ -1,22 +1,110 @@
-from fastapi import APIRouter
-from app.schemas.chat_schema import ChatRequest
-from app.services.chat_service import generar_contenido
-from app.services.ia import imagen_service, video_service
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from app.core.sse import evento_sse
+from app.schemas.chat_schema import ChatRequest, ImagenesRequest
+from app.schemas.trabajo_schema import TrabajoResponse
+from app.services.chat_service import generar_contenido, generar_contenido_stream
+from app.services.ia import imagen_service, texto_service
+from app.services.ia.cache_service import cache_respuestas
+from app.services.ia.reparacion_json import metricas_reparacion
+from app.services.trabajo_service import gestor_trabajos
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
 
 @router.post("/generar", response_model=dict)
-def obtener_contenido(solicitud: ChatRequest):
-    return generar_contenido(solicitud)
+async def obtener_contenido(solicitud: ChatRequest):
+    return await generar_contenido(solicitud)
+
+
+@router.post("/generar/stream")
+async def obtener_contenido_stream(solicitud: ChatRequest):
+    """
+    Igual que /chat/generar, pero emite cada red social como Server-Sent Event
+    apenas la IA termina de escribirla.
+    """
+    return StreamingResponse(
+        generar_contenido_stream(solicitud), media_type="text/event-stream"
+    )
+
+
+@router.get("/metricas", response_model=dict)
+def obtener_metricas():
+    """Contadores de la cache, tokens consumidos y reparaciones de JSON."""
+    return {
+        "cache": cache_respuestas.estadisticas(),
+        "tokens": texto_service.uso_tokens,
+        "reparaciones": metricas_reparacion,
+    }
 
 
 @router.post("/generar/imagen")
-def generar_imagen(prompt: str):
-    return imagen_service.generar_imagen(prompt)
+async def generar_imagen(prompt: str):
+    return await imagen_service.generar_imagen(prompt)
+
+
+@router.post("/generar/imagenes", response_model=dict)
+async def generar_imagenes(solicitud: ImagenesRequest):
+    """
+    Genera varias variantes por prompt en el menor número de llamadas a la IA.
+    Retorna las URLs con los tiempos de generación y guardado de cada imagen.
+    """
+    try:
+        return await imagen_service.generar_imagenes(
+            [(i.prompt, i.cantidad) for i in solicitud.imagenes]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Error al generar las imágenes: {str(e)}",
+        )
+
+
+@router.post("/generar/video", response_model=TrabajoResponse, status_code=status.HTTP_202_ACCEPTED)
+async def generar_video(prompt: str, duracion_segs: int = 4):
+    """
+    Encola la generación del video y retorna el trabajo de inmediato.
+    El progreso se consulta en /chat/jobs/{job_id}. Es `async` para encolar
+    desde el event loop del bucle de trabajos y no desde el threadpool.
+    """
+    trabajo = gestor_trabajos.encolar_video(prompt=prompt, duration_seconds=duracion_segs)
+    return trabajo.a_dict()
+
+
+@router.get("/jobs/{job_id}", response_model=TrabajoResponse)
+def obtener_trabajo(job_id: str):
+    trabajo = gestor_trabajos.obtener(job_id)
+    if not trabajo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Trabajo con id {job_id} no encontrado",
+        )
+    return trabajo.a_dict()
+
 
+@router.get("/jobs/{job_id}/stream")
+async def stream_trabajo(job_id: str):
+    """
+    Emite el estado del trabajo como Server-Sent Events cada vez que cambia,
+    hasta que termina (completado o error).
+    """
+    trabajo = gestor_trabajos.obtener(job_id)
+    if not trabajo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Trabajo con id {job_id} no encontrado",
+        )
 
-@router.post("/generar/video")
-def generar_video(prompt: str, duracion_segs: int = 4):
+    async def eventos():
+        version = -1
+        while True:
+            if trabajo.version != version:
+                version = trabajo.version
+                yield evento_sse("estado", trabajo.a_dict())
+                if trabajo.terminado:
+                    return
+            elif not await gestor_trabajos.esperar_cambio(trabajo, version, timeout=15):
+                # Mantiene viva la conexión mientras no hay cambios
+                yield ": ping\n\n"
 
-    return video_service.generar_video(prompt=prompt, duration_seconds=duracion_segs)
+    return StreamingResponse(eventos(), media_type="text/event-stream")
@@ -1,20 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from app.controllers.contenido_controller import ContenidoController
-from app.schemas.contenido_schema import ContenidoCreateRequest, ContenidoUpdateRequest, ContenidoResponse
-from app.core.database import get_session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.controllers.contenido_controller_async import ContenidoControllerAsync
+from app.schemas.contenido_schema import ContenidoCreateRequest, ContenidoUpdateRequest, ContenidoResponse, ContenidoPaginaResponse
+from app.core.config import settings
+from app.core.database import get_async_session
+from typing import List, Optional
 
 router = APIRouter(prefix="/contenidos", tags=["Contenidos"])
 
 
 @router.post("/", response_model=ContenidoResponse, status_code=status.HTTP_201_CREATED)
-def crear_contenido(request: ContenidoCreateRequest, session: Session = Depends(get_session)):
+async def crear_contenido(request: ContenidoCreateRequest, session: AsyncSession = Depends(get_async_session)):
     """
     Crear un nuevo contenido
     """
     try:
-        contenido = ContenidoController.crear_contenido(
+        contenido = await ContenidoControllerAsync.crear_contenido(
             session=session,
             descripcion=request.descripcion,
             tema_id=request.tema_id,
@@ -33,14 +34,44 @@ def crear_contenido(request: ContenidoCreateRequest, session: Session = Depends(
         )
 
 
-@router.get("/", response_model=List[ContenidoResponse])
-def obtener_todos_contenidos(session: Session = Depends(get_session)):
+@router.get("/", response_model=ContenidoPaginaResponse)
+async def obtener_todos_contenidos(
+    tema_id: Optional[int] = None,
+    redsocial_id: Optional[int] = None,
+    publicado: Optional[bool] = None,
+    limite: int = Query(settings.PAGINA_TAMANO, ge=1, le=settings.PAGINA_TAMANO_MAX),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+):
     """
-    Obtener todos los contenidos
+    Obtener los contenidos por páginas, de los más recientes a los más antiguos,
+    con filtros opcionales. Para la página siguiente se envía `next_cursor` como `cursor`.
     """
     try:
-        contenidos = ContenidoController.obtener_todos_contenidos(session=session)
-        return contenidos
+        contenidos, next_cursor = await ContenidoControllerAsync.obtener_todos_contenidos(
+            session=session,
+            limite=limite,
+            cursor=cursor,
+            tema_id=tema_id,
+            redsocial_id=redsocial_id,
+            publicado=publicado,
+        )
+        return {"items": contenidos, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@router.get("/stats", response_model=dict)
+async def obtener_estadisticas_contenidos(session: AsyncSession = Depends(get_async_session)):
+    """
+    Cantidad de contenidos por tema, por red social y publicados / sin publicar
+    """
+    try:
+        return await ContenidoControllerAsync.obtener_estadisticas(session=session)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -48,12 +79,12 @@ def obtener_todos_contenidos(session: Session = Depends(get_session)):
 
 
 @router.get("/{contenido_id}", response_model=ContenidoResponse)
-def obtener_contenido(contenido_id: int, session: Session = Depends(get_session)):
+async def obtener_contenido(contenido_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Obtener un contenido por su ID
     """
     try:
-        contenido = ContenidoController.obtener_contenido_por_id(
+        contenido = await ContenidoControllerAsync.obtener_contenido_por_id(
             session=session, contenido_id=contenido_id
         )
         if not contenido:
@@ -71,12 +102,12 @@ def obtener_contenido(contenido_id: int, session: Session = Depends(get_session)
 
 
 @router.get("/tema/{tema_id}", response_model=List[ContenidoResponse])
-def obtener_contenidos_por_tema(tema_id: int, session: Session = Depends(get_session)):
+async def obtener_contenidos_por_tema(tema_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Obtener todos los contenidos de un tema específico
     """
     try:
-        contenidos = ContenidoController.obtener_contenidos_por_tema(
+        contenidos = await ContenidoControllerAsync.obtener_contenidos_por_tema(
             session=session, tema_id=tema_id
         )
         return contenidos
@@ -87,12 +118,12 @@ def obtener_contenidos_por_tema(tema_id: int, session: Session = Depends(get_ses
 
 
 @router.get("/redsocial/{redsocial_id}", response_model=List[ContenidoResponse])
-def obtener_contenidos_por_redsocial(redsocial_id: int, session: Session = Depends(get_session)):
+async def obtener_contenidos_por_redsocial(redsocial_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Obtener todos los contenidos de una red social específica
     """
     try:
-        contenidos = ContenidoController.obtener_contenidos_por_redsocial(
+        contenidos = await ContenidoControllerAsync.obtener_contenidos_por_redsocial(
             session=session, redsocial_id=redsocial_id
         )
         return contenidos
@@ -103,12 +134,12 @@ def obtener_contenidos_por_redsocial(redsocial_id: int, session: Session = Depen
 
 
 @router.get("/publicados/{publicado}", response_model=List[ContenidoResponse])
-def obtener_contenidos_publicados(publicado: bool, session: Session = Depends(get_session)):
+async def obtener_contenidos_publicados(publicado: bool, session: AsyncSession = Depends(get_async_session)):
     """
     Obtener contenidos filtrados por estado de publicación
     """
     try:
-        contenidos = ContenidoController.obtener_contenidos_publicados(
+        contenidos = await ContenidoControllerAsync.obtener_contenidos_publicados(
             session=session, publicado=publicado
         )
         return contenidos
@@ -119,14 +150,14 @@ def obtener_contenidos_publicados(publicado: bool, session: Session = Depends(ge
 
 
 @router.put("/{contenido_id}", response_model=ContenidoResponse)
-def actualizar_contenido(
-    contenido_id: int, request: ContenidoUpdateRequest, session: Session = Depends(get_session)
+async def actualizar_contenido(
+    contenido_id: int, request: ContenidoUpdateRequest, session: AsyncSession = Depends(get_async_session)
 ):
     """
     Actualizar un contenido existente
     """
     try:
-        contenido = ContenidoController.actualizar_contenido(
+        contenido = await ContenidoControllerAsync.actualizar_contenido(
             session=session,
             contenido_id=contenido_id,
             descripcion=request.descripcion,
@@ -154,12 +185,12 @@ def actualizar_contenido(
 
 
 @router.delete("/{contenido_id}", status_code=status.HTTP_204_NO_CONTENT)
-def eliminar_contenido(contenido_id: int, session: Session = Depends(get_session)):
+async def eliminar_contenido(contenido_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Eliminar un contenido por su ID
     """
     try:
-        eliminado = ContenidoController.eliminar_contenido(
+        eliminado = await ContenidoControllerAsync.eliminar_contenido(
             session=session, contenido_id=contenido_id
         )
         if not eliminado:
@@ -177,12 +208,12 @@ def eliminar_contenido(contenido_id: int, session: Session = Depends(get_session
 
 
 @router.get("/tema/{tema_id}/count", response_model=dict)
-def contar_contenidos_tema(tema_id: int, session: Session = Depends(get_session)):
+async def contar_contenidos_tema(tema_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Contar cuántos contenidos tiene un tema
     """
     try:
-        cantidad = ContenidoController.contar_contenidos_por_tema(
+        cantidad = await ContenidoControllerAsync.contar_contenidos_por_tema(
             session=session, tema_id=tema_id
         )
         return {"tema_id": tema_id, "cantidad_contenidos": cantidad}
@@ -193,12 +224,12 @@ def contar_contenidos_tema(tema_id: int, session: Session = Depends(get_session)
 
 
 @router.get("/redsocial/{redsocial_id}/count", response_model=dict)
-def contar_contenidos_redsocial(redsocial_id: int, session: Session = Depends(get_session)):
+async def contar_contenidos_redsocial(redsocial_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Contar cuántos contenidos tiene una red social
     """
     try:
-        cantidad = ContenidoController.contar_contenidos_por_redsocial(
+        cantidad = await ContenidoControllerAsync.contar_contenidos_por_redsocial(
             session=session, redsocial_id=redsocial_id
         )
         return {"redsocial_id": redsocial_id, "cantidad_contenidos": cantidad}
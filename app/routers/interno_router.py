@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from app.core.database import metricas_pool
+from app.services.jwt_service import get_current_user
+
+router = APIRouter(prefix="/interno", tags=["Interno"])
+
+
+@router.get("/pool", response_model=dict)
+def obtener_pool(usuario_id: int = Depends(get_current_user)):
+    """
+    Estado de los pools de conexiones de este worker (el del engine síncrono
+    y el del async): conexiones en uso, libres y de overflow, checkouts que
+    vencieron `DB_POOL_TIMEOUT` y espera de los últimos checkouts por una
+    conexión libre.
+    """
+    return metricas_pool()
@@ -1,10 +1,13 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+from typing import Optional
+from fastapi import APIRouter, Header, status
+from app.schemas.envio_schema import EnvioResponse
 from app.schemas.publicar_linkedin_schema import PublicarLinkedinRequest
-from app.services.linkedin_service import linkedin_service
+from app.services.bandeja_salida_service import encolar_envio
 
 router = APIRouter(prefix="/linkedin", tags=["Linkedin"])
 
-@router.post("/publicar", response_model=dict)
-def publicar(request: PublicarLinkedinRequest):
-    return linkedin_service.publicar_imagen(request.imagen_ruta, request.texto)
\ No newline at end of file
+@router.post("/publicar", response_model=EnvioResponse, status_code=status.HTTP_202_ACCEPTED)
+async def publicar(request: PublicarLinkedinRequest, idempotency_key: Optional[str] = Header(default=None)):
+    return await encolar_envio(
+        "linkedin", {"imagen_ruta": request.imagen_ruta, "texto": request.texto}, idempotency_key
+    )
\ No newline at end of file
@@ -1,20 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from app.controllers.prompt_controller import PromptController
-from app.schemas.prompt_schema import PromptCreateRequest, PromptUpdateRequest, PromptResponse
-from app.core.database import get_session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.controllers.prompt_controller_async import PromptControllerAsync
+from app.schemas.prompt_schema import PromptCreateRequest, PromptUpdateRequest, PromptResponse, PromptPaginaResponse
+from app.core.config import settings
+from app.core.database import get_async_session
+from typing import List, Optional
 
 router = APIRouter(prefix="/prompts", tags=["Prompts"])
 
 
 @router.post("/", response_model=PromptResponse, status_code=status.HTTP_201_CREATED)
-def crear_prompt(request: PromptCreateRequest, session: Session = Depends(get_session)):
+async def crear_prompt(request: PromptCreateRequest, session: AsyncSession = Depends(get_async_session)):
     """
     Crear un nuevo prompt
     """
     try:
-        prompt = PromptController.crear_prompt(
+        prompt = await PromptControllerAsync.crear_prompt(
             session=session, descripcion=request.descripcion, tema_id=request.tema_id
         )
         return prompt
@@ -26,14 +27,24 @@ def crear_prompt(request: PromptCreateRequest, session: Session = Depends(get_se
         )
 
 
-@router.get("/", response_model=List[PromptResponse])
-def obtener_todos_prompts(session: Session = Depends(get_session)):
+@router.get("/", response_model=PromptPaginaResponse)
+async def obtener_todos_prompts(
+    tema_id: Optional[int] = None,
+    limite: int = Query(settings.PAGINA_TAMANO, ge=1, le=settings.PAGINA_TAMANO_MAX),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+):
     """
-    Obtener todos los prompts
+    Obtener los prompts por páginas, de los más recientes a los más antiguos.
+    Para la página siguiente se envía `next_cursor` como `cursor`.
     """
     try:
-        prompts = PromptController.obtener_todos_prompts(session=session)
-        return prompts
+        prompts, next_cursor = await PromptControllerAsync.obtener_todos_prompts(
+            session=session, limite=limite, cursor=cursor, tema_id=tema_id
+        )
+        return {"items": prompts, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -41,12 +52,12 @@ def obtener_todos_prompts(session: Session = Depends(get_session)):
 
 
 @router.get("/{prompt_id}", response_model=PromptResponse)
-def obtener_prompt(prompt_id: int, session: Session = Depends(get_session)):
+async def obtener_prompt(prompt_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Obtener un prompt por su ID
     """
     try:
-        prompt = PromptController.obtener_prompt_por_id(session=session, prompt_id=prompt_id)
+        prompt = await PromptControllerAsync.obtener_prompt_por_id(session=session, prompt_id=prompt_id)
         if not prompt:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -62,12 +73,12 @@ def obtener_prompt(prompt_id: int, session: Session = Depends(get_session)):
 
 
 @router.get("/tema/{tema_id}", response_model=List[PromptResponse])
-def obtener_prompts_por_tema(tema_id: int, session: Session = Depends(get_session)):
+async def obtener_prompts_por_tema(tema_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Obtener todos los prompts de un tema específico
     """
     try:
-        prompts = PromptController.obtener_prompts_por_tema(
+        prompts = await PromptControllerAsync.obtener_prompts_por_tema(
             session=session, tema_id=tema_id
         )
         return prompts
@@ -78,14 +89,14 @@ def obtener_prompts_por_tema(tema_id: int, session: Session = Depends(get_sessio
 
 
 @router.put("/{prompt_id}", response_model=PromptResponse)
-def actualizar_prompt(
-    prompt_id: int, request: PromptUpdateRequest, session: Session = Depends(get_session)
+async def actualizar_prompt(
+    prompt_id: int, request: PromptUpdateRequest, session: AsyncSession = Depends(get_async_session)
 ):
     """
     Actualizar un prompt existente
     """
     try:
-        prompt = PromptController.actualizar_prompt(
+        prompt = await PromptControllerAsync.actualizar_prompt(
             session=session,
             prompt_id=prompt_id,
             descripcion=request.descripcion,
@@ -108,12 +119,12 @@ def actualizar_prompt(
 
 
 @router.delete("/{prompt_id}", status_code=status.HTTP_204_NO_CONTENT)
-def eliminar_prompt(prompt_id: int, session: Session = Depends(get_session)):
+async def eliminar_prompt(prompt_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Eliminar un prompt por su ID
     """
     try:
-        eliminado = PromptController.eliminar_prompt(session=session, prompt_id=prompt_id)
+        eliminado = await PromptControllerAsync.eliminar_prompt(session=session, prompt_id=prompt_id)
         if not eliminado:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -129,12 +140,12 @@ def eliminar_prompt(prompt_id: int, session: Session = Depends(get_session)):
 
 
 @router.get("/tema/{tema_id}/count", response_model=dict)
-def contar_prompts_tema(tema_id: int, session: Session = Depends(get_session)):
+async def contar_prompts_tema(tema_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Contar cuántos prompts tiene un tema
     """
     try:
-        cantidad = PromptController.contar_prompts_por_tema(
+        cantidad = await PromptControllerAsync.contar_prompts_por_tema(
             session=session, tema_id=tema_id
         )
         return {"tema_id": tema_id, "cantidad_prompts": cantidad}
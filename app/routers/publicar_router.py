@@ -1,43 +1,184 @@
-from typing import Dict
-from fastapi import APIRouter
+import time
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlmodel import Session
+from app.controllers.envio_controller import EnvioController
+from app.core.database import get_session
+from app.core.limitador import limitador
+from app.schemas.envio_schema import EnvioResponse
 from app.schemas.publicar_facebook_schema import PublicarFacebookRequest
-from app.schemas.publicar_instagram_schema import PublicarInstagramRequest
+from app.schemas.publicar_instagram_schema import (
+    PrepararInstagramRequest,
+    PrepararInstagramResponse,
+    PublicarCarruselRequest,
+    PublicarInstagramRequest,
+    PublicarPreparadoRequest,
+)
 from app.schemas.publicar_linkedin_schema import PublicarLinkedinRequest
-from app.services.tiktok_post_service import TiktokPostService
-from app.services.whatsapp_service import whatsapp_service
-from app.services.linkedin_service import linkedin_service
+from app.schemas.publicar_multi_schema import PublicarMultiRequest, PublicarMultiResponse
+from app.services.bandeja_salida_service import bandeja_salida, encolar_envio
 from app.services.instagram_service import instagram_service
-from app.services.facebook_service import facebook_service
-
-tiktok_post_service = TiktokPostService()
+from app.services.programador_service import programador
+from app.services.publicacion_service import publicacion_service
 
 router = APIRouter(prefix="/publicar", tags=["Publicar"])
 
 
-@router.post("/facebook", response_model=dict)
-def publicar_facebook(publicacion: PublicarFacebookRequest):
-    return facebook_service.publicar_post(
-        texto=publicacion.texto, url_img=publicacion.url_img
+@router.post("/facebook", response_model=EnvioResponse, status_code=status.HTTP_202_ACCEPTED)
+async def publicar_facebook(
+    publicacion: PublicarFacebookRequest,
+    idempotency_key: Optional[str] = Header(default=None),
+):
+    return await encolar_envio(
+        "facebook", {"texto": publicacion.texto, "url_img": publicacion.url_img}, idempotency_key
+    )
+
+
+@router.post("/instagram", response_model=EnvioResponse, status_code=status.HTTP_202_ACCEPTED)
+async def publicar_instagram(
+    publicacion: PublicarInstagramRequest,
+    idempotency_key: Optional[str] = Header(default=None),
+):
+    return await encolar_envio(
+        "instagram", {"texto": publicacion.texto, "url_img": publicacion.url_img}, idempotency_key
+    )
+
+
+
+@router.post("/instagram/carrusel", response_model=EnvioResponse, status_code=status.HTTP_202_ACCEPTED)
+async def publicar_carrusel_instagram(
+    publicacion: PublicarCarruselRequest,
+    idempotency_key: Optional[str] = Header(default=None),
+):
+    """
+    Encola un carrusel de 2 a 10 imágenes. Al enviarlo, los contenedores de
+    cada imagen se crean en paralelo y se publica cuando todos están listos.
+    """
+    return await encolar_envio(
+        "instagram", {"texto": publicacion.texto, "urls_img": publicacion.urls_img}, idempotency_key
+    )
+
+
+@router.post("/instagram/preparar", response_model=PrepararInstagramResponse)
+async def preparar_instagram(solicitud: PrepararInstagramRequest):
+    """
+    Prepara por adelantado (en paralelo) los contenedores de varias
+    publicaciones, sin publicarlas. Cada `creation_id` listo se publica
+    después con /publicar/instagram/preparado en una sola llamada.
+    Los contenedores vencen a las 24 horas.
+    """
+    inicio = time.perf_counter()
+    preparados = await instagram_service.preparar_lote(
+        [(publicacion.urls_img, publicacion.texto) for publicacion in solicitud.publicaciones]
     )
+    return {
+        "preparados": preparados,
+        "listos": sum(1 for p in preparados if p["creation_id"]),
+        "tiempo_total_ms": round((time.perf_counter() - inicio) * 1000, 1),
+    }
 
 
-@router.post("/instagram", response_model=dict)
-def publicar_instagram(publicacion: PublicarInstagramRequest):
-    return instagram_service.publicar_post(
-        texto=publicacion.texto, url_img=publicacion.url_img
+@router.post("/instagram/preparado", response_model=EnvioResponse, status_code=status.HTTP_202_ACCEPTED)
+async def publicar_preparado_instagram(
+    publicacion: PublicarPreparadoRequest,
+    idempotency_key: Optional[str] = Header(default=None),
+):
+    # Un contenedor se publica una sola vez: sirve de clave si no se envía otra
+    return await encolar_envio(
+        "instagram", {"creation_id": publicacion.creation_id},
+        idempotency_key or f"instagram:{publicacion.creation_id}",
     )
     
     
-@router.post("/linkedin", response_model=dict)
-def publicar_linkedin(request: PublicarLinkedinRequest):
-    return linkedin_service.publicar_imagen(request.imagen_ruta, request.texto)
+@router.post("/linkedin", response_model=EnvioResponse, status_code=status.HTTP_202_ACCEPTED)
+async def publicar_linkedin(
+    request: PublicarLinkedinRequest,
+    idempotency_key: Optional[str] = Header(default=None),
+):
+    return await encolar_envio(
+        "linkedin", {"imagen_ruta": request.imagen_ruta, "texto": request.texto}, idempotency_key
+    )
+
+
+@router.post("/whatsapp", response_model=EnvioResponse, status_code=status.HTTP_202_ACCEPTED)
+async def publicar_historia(
+    imagen_url: str, texto: str,
+    idempotency_key: Optional[str] = Header(default=None),
+):
+    return await encolar_envio("whatsapp", {"imagen_url": imagen_url, "texto": texto}, idempotency_key)
+
+
+@router.post("/tiktok", response_model=EnvioResponse, status_code=status.HTTP_202_ACCEPTED)
+async def publicar_video(
+    texto: str, video_url: str,
+    idempotency_key: Optional[str] = Header(default=None),
+):
+    return await encolar_envio("tiktok", {"texto": texto, "video_url": video_url}, idempotency_key)
+
+
+@router.get("/envios/{envio_id}", response_model=EnvioResponse)
+def obtener_envio(envio_id: int, session: Session = Depends(get_session)):
+    """
+    Estado de una publicación encolada (intentos, último error y resultado de la red)
+    """
+    envio = EnvioController.obtener_envio_por_id(session, envio_id)
+    if not envio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Envío con id {envio_id} no encontrado",
+        )
+    return envio
+
+
+@router.post("/envios/{envio_id}/reintentar", response_model=EnvioResponse, status_code=status.HTTP_202_ACCEPTED)
+async def reintentar_envio(envio_id: int):
+    """
+    Vuelve a encolar un envío "fallido" o "incierto". Antes de reintentar un
+    envío incierto conviene revisar en la red que no se haya publicado.
+    """
+    try:
+        envio = await bandeja_salida.reintentar(envio_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if not envio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Envío con id {envio_id} no encontrado",
+        )
+    return envio
+
+
+@router.get("/limites", response_model=dict)
+def obtener_limites():
+    """
+    Estado del limitador de llamadas de cada red: tasa configurada y actual
+    (se reduce tras un 429), tokens disponibles y demora en cola de las
+    últimas solicitudes.
+    """
+    return limitador.metricas()
 
 
-@router.post("/whatsapp", response_model=dict)
-def publicar_historia(imagen_url: str, texto: str):
-    return whatsapp_service.publicar_historia(imagen_url=imagen_url, texto=texto)
+@router.get("/programador", response_model=dict)
+def obtener_programador():
+    """
+    Estado del programador de publicaciones en este worker: si es el líder,
+    cuántos contenidos tiene en espera y cuándo vence el próximo.
+    """
+    return programador.estado()
 
 
-@router.post("/tiktok", response_model=dict)
-async def publicar_video(texto: str, video_url: str) -> Dict[str, str | Dict]:
-    return await tiktok_post_service.publicar_video(texto, video_url)
+@router.post("/multi", response_model=PublicarMultiResponse)
+async def publicar_multi(solicitud: PublicarMultiRequest):
+    """
+    Publica el contenido en todas las redes indicadas en paralelo.
+    Retorna el resultado y el tiempo de cada red; cada resultado queda
+    registrado como un contenido del tema.
+    """
+    try:
+        return await publicacion_service.publicar_multi(solicitud)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
@@ -1,20 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from app.controllers.redsocial_controller import RedsocialController
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.controllers.redsocial_controller_async import RedsocialControllerAsync
 from app.schemas.redsocial_schema import RedsocialCreateRequest, RedsocialUpdateRequest, RedsocialResponse
-from app.core.database import get_session
+from app.core.database import get_async_session
 from typing import List
 
 router = APIRouter(prefix="/redsociales", tags=["Redes Sociales"])
 
 
 @router.post("/", response_model=RedsocialResponse, status_code=status.HTTP_201_CREATED)
-def crear_redsocial(request: RedsocialCreateRequest, session: Session = Depends(get_session)):
+async def crear_redsocial(request: RedsocialCreateRequest, session: AsyncSession = Depends(get_async_session)):
     """
     Crear una nueva red social
     """
     try:
-        redsocial = RedsocialController.crear_redsocial(
+        redsocial = await RedsocialControllerAsync.crear_redsocial(
             session=session, nombre=request.nombre
         )
         return redsocial
@@ -25,12 +25,12 @@ def crear_redsocial(request: RedsocialCreateRequest, session: Session = Depends(
 
 
 @router.get("/", response_model=List[RedsocialResponse])
-def obtener_todas_redsociales(session: Session = Depends(get_session)):
+async def obtener_todas_redsociales(session: AsyncSession = Depends(get_async_session)):
     """
     Obtener todas las redes sociales
     """
     try:
-        redsociales = RedsocialController.obtener_todas_redsociales(session=session)
+        redsociales = await RedsocialControllerAsync.obtener_todas_redsociales(session=session)
         return redsociales
     except Exception as e:
         raise HTTPException(
@@ -39,12 +39,12 @@ def obtener_todas_redsociales(session: Session = Depends(get_session)):
 
 
 @router.get("/{redsocial_id}", response_model=RedsocialResponse)
-def obtener_redsocial(redsocial_id: int, session: Session = Depends(get_session)):
+async def obtener_redsocial(redsocial_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Obtener una red social por su ID
     """
     try:
-        redsocial = RedsocialController.obtener_redsocial_por_id(
+        redsocial = await RedsocialControllerAsync.obtener_redsocial_por_id(
             session=session, redsocial_id=redsocial_id
         )
         if not redsocial:
@@ -62,12 +62,12 @@ def obtener_redsocial(redsocial_id: int, session: Session = Depends(get_session)
 
 
 @router.get("/nombre/{nombre}", response_model=RedsocialResponse)
-def obtener_redsocial_por_nombre(nombre: str, session: Session = Depends(get_session)):
+async def obtener_redsocial_por_nombre(nombre: str, session: AsyncSession = Depends(get_async_session)):
     """
     Obtener una red social por su nombre
     """
     try:
-        redsocial = RedsocialController.obtener_redsocial_por_nombre(
+        redsocial = await RedsocialControllerAsync.obtener_redsocial_por_nombre(
             session=session, nombre=nombre
         )
         if not redsocial:
@@ -85,14 +85,14 @@ def obtener_redsocial_por_nombre(nombre: str, session: Session = Depends(get_ses
 
 
 @router.put("/{redsocial_id}", response_model=RedsocialResponse)
-def actualizar_redsocial(
-    redsocial_id: int, request: RedsocialUpdateRequest, session: Session = Depends(get_session)
+async def actualizar_redsocial(
+    redsocial_id: int, request: RedsocialUpdateRequest, session: AsyncSession = Depends(get_async_session)
 ):
     """
     Actualizar una red social existente
     """
     try:
-        redsocial = RedsocialController.actualizar_redsocial(
+        redsocial = await RedsocialControllerAsync.actualizar_redsocial(
             session=session,
             redsocial_id=redsocial_id,
             nombre=request.nombre,
@@ -112,12 +112,12 @@ def actualizar_redsocial(
 
 
 @router.delete("/{redsocial_id}", status_code=status.HTTP_204_NO_CONTENT)
-def eliminar_redsocial(redsocial_id: int, session: Session = Depends(get_session)):
+async def eliminar_redsocial(redsocial_id: int, session: AsyncSession = Depends(get_async_session)):
     """
     Eliminar una red social por su ID
     """
     try:
-        eliminado = RedsocialController.eliminar_redsocial(
+        eliminado = await RedsocialControllerAsync.eliminar_redsocial(
             session=session, redsocial_id=redsocial_id
         )
         if not eliminado:
@@ -135,12 +135,12 @@ def eliminar_redsocial(redsocial_id: int, session: Session = Depends(get_session
 
 
 @router.get("/stats/count", response_model=dict)
-def contar_redsociales(session: Session = Depends(get_session)):
+async def contar_redsociales(session: AsyncSession = Depends(get_async_session)):
     """
     Contar cuántas redes sociales hay registradas
     """
     try:
-        cantidad = RedsocialController.contar_redsociales(session=session)
+        cantidad = await RedsocialControllerAsync.contar_redsociales(session=session)
         return {"cantidad_redsociales": cantidad}
     except Exception as e:
         raise HTTPException(
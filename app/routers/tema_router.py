@@ -1,27 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
-from typing import Annotated, List
-from app.controllers.tema_controller import TemaController
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Annotated, List, Optional
+from app.controllers.tema_controller_async import TemaControllerAsync
 from app.schemas.tema_schema import (
     TemaCreateRequest,
     TemaUpdateRequest,
     TemaResponse,
+    TemaPaginaResponse,
     TemaHistorialResponse
 )
-from app.core.database import get_session
+from app.core.config import settings
+from app.core.database import get_async_session
 from app.services.jwt_service import get_current_user
 
 router = APIRouter(prefix="/temas", tags=["Temas"])
 
 
 @router.post("/", response_model=TemaResponse, status_code=status.HTTP_201_CREATED)
-def crear_tema(
+async def crear_tema(
     request: TemaCreateRequest,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     usuario_id: int = Depends(get_current_user)
 ):
     try:
-        tema = TemaController.crear_tema(
+        tema = await TemaControllerAsync.crear_tema(
             session=session, nombre=request.nombre, usuario_id=usuario_id
         )
         return tema
@@ -33,14 +35,21 @@ def crear_tema(
         )
 
 
-@router.get("/", response_model=List[TemaResponse])
-def obtener_todos_temas(
-    session: Session = Depends(get_session),
+@router.get("/", response_model=TemaPaginaResponse)
+async def obtener_todos_temas(
+    usuario: Optional[int] = Query(None, description="Solo los temas de este usuario"),
+    limite: int = Query(settings.PAGINA_TAMANO, ge=1, le=settings.PAGINA_TAMANO_MAX),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
     usuario_id: int = Depends(get_current_user)
 ):
     try:
-        temas = TemaController.obtener_todos_temas(session=session)
-        return temas
+        temas, next_cursor = await TemaControllerAsync.obtener_todos_temas(
+            session=session, limite=limite, cursor=cursor, usuario_id=usuario
+        )
+        return {"items": temas, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -48,13 +57,13 @@ def obtener_todos_temas(
 
 
 @router.get("/{tema_id}", response_model=TemaResponse)
-def obtener_tema(
+async def obtener_tema(
     tema_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     usuario_id: int = Depends(get_current_user)
 ):
     try:
-        tema = TemaController.obtener_tema_por_id(session=session, tema_id=tema_id)
+        tema = await TemaControllerAsync.obtener_tema_por_id(session=session, tema_id=tema_id)
         if not tema:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -70,23 +79,37 @@ def obtener_tema(
 
 
 @router.get("/{tema_id}/historial", response_model=TemaHistorialResponse)
-def obtener_historial_tema(
+async def obtener_historial_tema(
     tema_id: int,
-    session: Session = Depends(get_session),
+    limite: int = Query(settings.PAGINA_TAMANO, ge=1, le=settings.PAGINA_TAMANO_MAX),
+    cursor: Optional[str] = Query(None, description="`next_cursor` de la página anterior: elementos más antiguos"),
+    since: Optional[str] = Query(None, description="`since_cursor` de una respuesta anterior: solo elementos nuevos"),
+    session: AsyncSession = Depends(get_async_session),
     usuario_id: int = Depends(get_current_user)
 ):
     """
-    Obtiene el historial completo de un tema: todos sus prompts y contenidos
-    ordenados cronológicamente para mostrar como un chat.
+    Obtiene el historial de un tema por páginas: sus prompts y contenidos
+    ordenados cronológicamente para mostrar como un chat, empezando por los
+    más recientes. `next_cursor` carga los anteriores; `since_cursor` sirve
+    para pedir después solo lo nuevo.
     """
+    if cursor and since:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use cursor o since, no ambos",
+        )
     try:
-        historial = TemaController.obtener_historial_tema(session=session, tema_id=tema_id)
+        historial = await TemaControllerAsync.obtener_historial_tema(
+            session=session, tema_id=tema_id, limite=limite, cursor=cursor, since=since
+        )
         if not historial:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Tema con id {tema_id} no encontrado",
             )
         return historial
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -96,12 +119,12 @@ def obtener_historial_tema(
 
 
 @router.get("/usuario/mis-temas", response_model=List[TemaResponse])
-def obtener_temas_por_usuario(
-    session: Session = Depends(get_session),
+async def obtener_temas_por_usuario(
+    session: AsyncSession = Depends(get_async_session),
     usuario_id: int = Depends(get_current_user)
 ):
     try:
-        temas = TemaController.obtener_temas_por_usuario(
+        temas = await TemaControllerAsync.obtener_temas_por_usuario(
             session=session, usuario_id=usuario_id
         )
         return temas
@@ -112,14 +135,14 @@ def obtener_temas_por_usuario(
 
 
 @router.put("/{tema_id}", response_model=TemaResponse)
-def actualizar_tema(
+async def actualizar_tema(
     tema_id: int,
     request: TemaUpdateRequest,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     usuario_id: int = Depends(get_current_user)
 ):
     try:
-        tema = TemaController.actualizar_tema(
+        tema = await TemaControllerAsync.actualizar_tema(
             session=session,
             tema_id=tema_id,
             nombre=request.nombre,
@@ -142,13 +165,13 @@ def actualizar_tema(
 
 
 @router.delete("/{tema_id}", status_code=status.HTTP_204_NO_CONTENT)
-def eliminar_tema(
+async def eliminar_tema(
     tema_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     usuario_id: int = Depends(get_current_user)
 ):
     try:
-        eliminado = TemaController.eliminar_tema(session=session, tema_id=tema_id)
+        eliminado = await TemaControllerAsync.eliminar_tema(session=session, tema_id=tema_id)
         if not eliminado:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -164,12 +187,12 @@ def eliminar_tema(
 
 
 @router.get("/usuario/count", response_model=dict)
-def contar_temas_usuario(
-    session: Session = Depends(get_session),
+async def contar_temas_usuario(
+    session: AsyncSession = Depends(get_async_session),
     usuario_id: int = Depends(get_current_user)
 ):
     try:
-        cantidad = TemaController.contar_temas_por_usuario(
+        cantidad = await TemaControllerAsync.contar_temas_por_usuario(
             session=session, usuario_id=usuario_id
         )
         return {"usuario_id": usuario_id, "cantidad_temas": cantidad}
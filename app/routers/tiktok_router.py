@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Request, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File, Form, status
 from fastapi.responses import RedirectResponse, JSONResponse
 from typing import Dict
 
 from app.services.tiktok_oaut_service import TiktokOauthService
-from app.services.tiktok_post_service import TiktokPostService
+from app.schemas.publicar_tiktok_schema import PublicacionTiktokResponse
+from app.services.tiktok_post_service import tiktok_post_service
+from app.services.tiktok_seguimiento_service import seguimiento_tiktok
 
 
 router = APIRouter(prefix="/tiktok", tags=["TikTok"])
 
 tiktok_oauth_service = TiktokOauthService()
-tiktok_post_service = TiktokPostService()
 
 
 @router.get("/auth/login")
@@ -30,4 +31,21 @@ async def callback(request: Request) -> JSONResponse:
 @router.post("/publicar", response_model=Dict)
 async def publicar_video(texto: str = Form(...), archivo: UploadFile = File(...)) -> Dict[str, str | Dict]:
     """Publica un video en TikTok."""
-    return await tiktok_post_service.publicar_video(texto, archivo)
+    respuesta = await tiktok_post_service.publicar_archivo(texto, archivo)
+    respuesta["estado_publicacion"] = seguimiento_tiktok.registrar(respuesta["publish_id"]).a_dict()
+    return respuesta
+
+
+@router.get("/publicaciones/{publish_id}", response_model=PublicacionTiktokResponse)
+def obtener_publicacion(publish_id: str):
+    """
+    Estado de una publicación según el seguimiento en segundo plano
+    (no consulta a TikTok en cada petición).
+    """
+    publicacion = seguimiento_tiktok.obtener(publish_id)
+    if not publicacion:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Publicación de TikTok {publish_id} no encontrada",
+        )
+    return publicacion.a_dict()
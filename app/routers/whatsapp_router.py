@@ -1,8 +1,12 @@
-from fastapi import APIRouter
-from app.services.whatsapp_service import whatsapp_service
+from typing import Optional
+from fastapi import APIRouter, Header, status
+from app.schemas.envio_schema import EnvioResponse
+from app.services.bandeja_salida_service import encolar_envio
 
 router = APIRouter(prefix="/whatsapp", tags=["WhatsApp"])
 
-@router.post("/publicar-historia", response_model=dict)
-def publicar_historia(imagen_url: str, texto: str):
-    return whatsapp_service.publicar_historia(imagen_url=imagen_url, texto=texto)
\ No newline at end of file
+@router.post("/publicar-historia", response_model=EnvioResponse, status_code=status.HTTP_202_ACCEPTED)
+async def publicar_historia(imagen_url: str, texto: str, idempotency_key: Optional[str] = Header(default=None)):
+    return await encolar_envio(
+        "whatsapp", {"imagen_url": imagen_url, "texto": texto}, idempotency_key
+    )
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 
 class ArchivoCreateRequest(BaseModel):
@@ -17,8 +17,15 @@ class ArchivoResponse(BaseModel):
     id: int
     url: str
     prompt_text: Optional[str]
+    hash_contenido: Optional[str] = None
     create_at: datetime
     update_at: datetime
     
     class Config:
         from_attributes = True
+
+
+class ArchivoPaginaResponse(BaseModel):
+    items: List[ArchivoResponse]
+    # Se envía como `cursor` para pedir la página siguiente; None en la última
+    next_cursor: Optional[str] = None
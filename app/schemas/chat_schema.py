@@ -1,8 +1,67 @@
-from pydantic import BaseModel, Field
+import re
+from functools import lru_cache
+from pydantic import BaseModel, Field, create_model, field_validator, model_validator
 from typing import Dict
 
+MAX_IMAGENES_POR_SOLICITUD = 50
+
+# Cada red pasa a ser un campo del modelo de respuesta (construir_modelo_contenido)
+PATRON_RED_SOCIAL = re.compile(r"^[a-z][a-z0-9_]*$")
+
 class ChatRequest(BaseModel):
     prompt: str
     duracion_video: int = 4
     redes_sociales: list[str] = Field(examples=[["facebook", "instagram", "linkedin", "whatsapp", "tiktok"]])
-    
+    no_cache: bool = False  # True: ignora la cache y vuelve a generar
+    por_red: bool = False  # True: una generación en paralelo por cada red social
+
+    @field_validator("redes_sociales")
+    @classmethod
+    def validar_redes_sociales(cls, redes_sociales: list[str]) -> list[str]:
+        redes = [red.strip().lower() for red in redes_sociales]
+        for red in redes:
+            if not PATRON_RED_SOCIAL.match(red):
+                raise ValueError(f"Nombre de red social no válido: {red!r} (solo minúsculas, números y _)")
+            if red in NOMBRES_RESERVADOS or red.startswith("model_"):
+                raise ValueError(f"Nombre de red social reservado: {red!r}")
+        return redes
+
+
+class SolicitudImagen(BaseModel):
+    prompt: str
+    cantidad: int = Field(default=1, ge=1, le=MAX_IMAGENES_POR_SOLICITUD)
+
+
+class ImagenesRequest(BaseModel):
+    imagenes: list[SolicitudImagen] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def validar_total(self):
+        total = sum(i.cantidad for i in self.imagenes)
+        if total > MAX_IMAGENES_POR_SOLICITUD:
+            raise ValueError(f"Se pueden pedir como máximo {MAX_IMAGENES_POR_SOLICITUD} imágenes por solicitud")
+        return self
+
+
+# Estructura de la respuesta de la IA (se envía a Gemini como response_schema)
+
+class SeccionRedSocial(BaseModel):
+    texto: str
+    hashtags: list[str]
+
+
+class ContenidoBase(BaseModel):
+    tema: str
+    prompt_imagen: str
+    prompt_video: str
+
+
+# Campos comunes y atributos de BaseModel: una red con ese nombre los pisaría
+NOMBRES_RESERVADOS = frozenset(ContenidoBase.model_fields) | frozenset(dir(ContenidoBase))
+
+
+@lru_cache(maxsize=64)
+def construir_modelo_contenido(redes_sociales: tuple[str, ...]) -> type[BaseModel]:
+    """Modelo con los campos comunes más una `SeccionRedSocial` por cada red pedida."""
+    campos = {red: (SeccionRedSocial, ...) for red in redes_sociales}
+    return create_model("ContenidoGenerado", __base__=ContenidoBase, **campos)
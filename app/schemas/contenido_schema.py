@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 
 class ContenidoCreateRequest(BaseModel):
@@ -37,3 +37,9 @@ class ContenidoResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class ContenidoPaginaResponse(BaseModel):
+    items: List[ContenidoResponse]
+    # Se envía como `cursor` para pedir la página siguiente; None en la última
+    next_cursor: Optional[str] = None
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+
+class EnvioResponse(BaseModel):
+    id: int
+    red_social: str
+    estado: Literal["pendiente", "enviando", "publicado", "fallido", "incierto"]
+    clave_idempotencia: str
+    intentos: int
+    proximo_intento: datetime
+    ultimo_error: Optional[str]
+    resultado: Optional[Dict[str, Any]]
+    enlace_publicacion: Optional[str]
+    contenido_id: Optional[int]
+    create_at: datetime
+    update_at: datetime
+
+    class Config:
+        from_attributes = True
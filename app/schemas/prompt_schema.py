@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 
 class PromptCreateRequest(BaseModel):
@@ -22,3 +22,9 @@ class PromptResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class PromptPaginaResponse(BaseModel):
+    items: List[PromptResponse]
+    # Se envía como `cursor` para pedir la página siguiente; None en la última
+    next_cursor: Optional[str] = None
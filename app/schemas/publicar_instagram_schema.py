@@ -1,5 +1,40 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+# Límite de la API de Instagram
+MAX_IMAGENES_CARRUSEL = 10
+
 
 class PublicarInstagramRequest(BaseModel):
     texto: str | None
     url_img: str
+
+
+class PublicarCarruselRequest(BaseModel):
+    texto: str | None = None
+    urls_img: List[str] = Field(min_length=2, max_length=MAX_IMAGENES_CARRUSEL)
+
+
+class PublicacionInstagram(BaseModel):
+    texto: str | None = None
+    # Una imagen o varias (carrusel)
+    urls_img: List[str] = Field(min_length=1, max_length=MAX_IMAGENES_CARRUSEL)
+
+
+class PrepararInstagramRequest(BaseModel):
+    publicaciones: List[PublicacionInstagram] = Field(min_length=1)
+
+
+class ContenedorPreparado(BaseModel):
+    creation_id: Optional[str]
+    error: Optional[str]
+
+
+class PrepararInstagramResponse(BaseModel):
+    preparados: List[ContenedorPreparado]
+    listos: int
+    tiempo_total_ms: float
+
+
+class PublicarPreparadoRequest(BaseModel):
+    creation_id: str
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+
+class PublicarMultiRequest(BaseModel):
+    tema_id: int
+    redes_sociales: List[str] = Field(min_length=1, examples=[["facebook", "instagram", "linkedin", "whatsapp", "tiktok"]])
+    texto: str
+    textos: Dict[str, str] = {}  # Texto propio por red (ej: la salida de /chat/generar)
+    imagen_url: Optional[str] = None  # URL pública o ruta local (LinkedIn y WhatsApp)
+    video_url: Optional[str] = None  # Requerido para TikTok
+    archivo_id: Optional[int] = None  # Si no se envía, se registra la imagen o el video
+
+
+class ResultadoPublicacion(BaseModel):
+    red_social: str
+    estado: Literal["publicado", "error"]
+    enlace_publicacion: Optional[str] = None
+    respuesta: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    tiempo_ms: float
+    contenido_id: Optional[int] = None
+
+
+class PublicarMultiResponse(BaseModel):
+    resultados: List[ResultadoPublicacion]
+    publicados: int
+    fallidos: int
+    tiempo_total_ms: float
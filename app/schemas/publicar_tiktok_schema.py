@@ -1,6 +1,20 @@
+from datetime import datetime
+from typing import Optional
 from fastapi import UploadFile
 from pydantic import BaseModel
 
 class PublicarTiktokRequest(BaseModel):
     texto: str
     video: UploadFile
+
+
+class PublicacionTiktokResponse(BaseModel):
+    publish_id: str
+    contenido_id: Optional[int]
+    estado: str
+    terminado: bool
+    enlace_publicacion: Optional[str]
+    error: Optional[str]
+    consultas: int
+    create_at: datetime
+    update_at: datetime
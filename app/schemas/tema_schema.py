@@ -22,6 +22,12 @@ class TemaResponse(BaseModel):
         from_attributes = True
 
 
+class TemaPaginaResponse(BaseModel):
+    items: List[TemaResponse]
+    # Se envía como `cursor` para pedir la página siguiente; None en la última
+    next_cursor: Optional[str] = None
+
+
 class PromptHistorialItem(BaseModel):
     tipo: Literal["prompt"]
     id: int
@@ -53,3 +59,9 @@ class TemaHistorialResponse(BaseModel):
     tema_nombre: str
     usuario_id: int
     historial: List[PromptHistorialItem | ContenidoHistorialItem]
+    # Se envía como `cursor` para cargar los elementos anteriores; None si no hay más
+    next_cursor: Optional[str] = None
+    # Se envía como `since` para traer solo lo que se agregue después
+    since_cursor: Optional[str] = None
+    # Con `since`: quedaron elementos nuevos sin traer, se puede volver a pedir
+    hay_mas_nuevos: bool = False
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+
+
+class TrabajoResponse(BaseModel):
+    id: str
+    tipo: str
+    estado: Literal["pendiente", "procesando", "completado", "error"]
+    consultas: int
+    resultado: Optional[Dict[str, Any]]
+    error: Optional[str]
+    create_at: datetime
+    update_at: datetime
@@ -0,0 +1,274 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+
+import httpx
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app.controllers.contenido_controller import ContenidoController
+from app.controllers.envio_controller import EnvioController
+from app.core.config import settings
+from app.core.database import engine
+from app.core.reintentos import backoff_con_jitter, espera_sugerida
+from app.models.modelos import Envio
+from app.services.facebook_service import facebook_service
+from app.services.instagram_service import instagram_service
+from app.services.linkedin_service import linkedin_service
+from app.services.publicacion_service import REDES_SOPORTADAS, enlace_publicacion
+from app.services.tiktok_post_service import tiktok_post_service
+from app.services.tiktok_seguimiento_service import seguimiento_tiktok
+from app.services.whatsapp_service import whatsapp_service
+
+# Respuestas con las que la red no publicó y vale la pena volver a intentar
+ESTADOS_REINTENTABLES = {408, 425, 429, 500, 502, 503, 504}
+
+# Errores de conexión en los que la petición nunca llegó a la red
+ERRORES_SIN_ENVIO = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _concurrencia_por_red(valor: str) -> Dict[str, int]:
+    """Convierte "facebook=4,tiktok=1" en un dict red -> envíos simultáneos (1 por defecto)."""
+    concurrencia = {red: 1 for red in REDES_SOPORTADAS}
+    for par in valor.split(","):
+        if "=" in par:
+            red, cantidad = par.split("=", 1)
+            concurrencia[red.strip().lower()] = max(1, int(cantidad))
+    return concurrencia
+
+
+def clasificar_error(e: BaseException) -> Tuple[str, Optional[float]]:
+    """
+    Decide qué hacer con un envío que falló y cuánto pide esperar la red:
+    "reintentar" (la red no publicó), "fallido" (reintentar no sirve) o
+    "incierto" (no se sabe si la red publicó; reintentar podría duplicar el post).
+    """
+    if isinstance(e, HTTPException):
+        # Los servicios envuelven los errores de httpx: se clasifica el original
+        causa = e.__cause__
+        if isinstance(causa, httpx.HTTPError) and not isinstance(causa, httpx.HTTPStatusError):
+            return clasificar_error(causa)
+        decision = "reintentar" if e.status_code in ESTADOS_REINTENTABLES else "fallido"
+        return decision, espera_sugerida(e.headers)
+
+    if isinstance(e, httpx.HTTPStatusError):
+        decision = "reintentar" if e.response.status_code in ESTADOS_REINTENTABLES else "fallido"
+        return decision, espera_sugerida(e.response.headers)
+
+    if isinstance(e, ERRORES_SIN_ENVIO):
+        return "reintentar", None
+    if isinstance(e, (FileNotFoundError, ValueError, KeyError, TypeError)):
+        return "fallido", None
+    # Timeouts de lectura, conexiones cortadas, respuestas ilegibles...
+    return "incierto", None
+
+
+async def _llamar_red(red: str, parametros: Dict[str, Any]) -> Dict[str, Any]:
+    if red == "facebook":
+        return await facebook_service.publicar_post(**parametros)
+    if red == "instagram":
+        if parametros.get("creation_id"):
+            return await instagram_service.publicar_preparado(parametros["creation_id"])
+        if parametros.get("urls_img"):
+            return await instagram_service.publicar_carrusel(parametros["urls_img"], parametros.get("texto"))
+        return await instagram_service.publicar_post(**parametros)
+    if red == "linkedin":
+        return await linkedin_service.publicar(**parametros)
+    if red == "whatsapp":
+        return await whatsapp_service.publicar_historia(**parametros)
+    return await tiktok_post_service.publicar_video(**parametros)
+
+
+class BandejaSalida:
+    """
+    Bandeja de salida de publicaciones (tabla `Envio`).
+
+    Los endpoints encolan y responden de inmediato; este despachador toma en
+    segundo plano los envíos vencidos respetando un máximo de envíos
+    simultáneos por red (BANDEJA_CONCURRENCIA). Si la red falla sin publicar
+    se reintenta con backoff exponencial y jitter, y nunca antes de lo que la
+    red pida (Retry-After, límites de uso): mientras tanto esa red queda en
+    pausa. Los envíos que pudieron haberse publicado quedan "incierto" y no
+    se reintentan solos, así un reintento nunca duplica un post.
+    """
+
+    def __init__(self):
+        self.concurrencia = _concurrencia_por_red(settings.BANDEJA_CONCURRENCIA)
+        self._en_curso: Dict[str, int] = {red: 0 for red in self.concurrencia}
+        self._pausa_hasta: Dict[str, float] = {}
+        self._envios: Set[asyncio.Task] = set()
+        self._tarea: Optional[asyncio.Task] = None
+        self._despertar = asyncio.Event()
+
+    async def encolar(
+        self,
+        red: str,
+        parametros: Dict[str, Any],
+        clave_idempotencia: Optional[str] = None,
+        contenido_id: Optional[int] = None,
+    ) -> Tuple[Envio, bool]:
+        """
+        Guarda el envío y retorna (envio, creado). Repetir la petición con la
+        misma clave de idempotencia retorna el envío ya encolado.
+        """
+        if red not in REDES_SOPORTADAS:
+            raise ValueError(f"Red social no soportada: {red}")
+
+        clave = clave_idempotencia or uuid.uuid4().hex
+        envio, creado = await asyncio.to_thread(
+            self._encolar_en_bd, red, parametros, clave, contenido_id
+        )
+        if creado:
+            self._despertar.set()
+        return envio, creado
+
+    async def reintentar(self, envio_id: int) -> Optional[Envio]:
+        envio = await asyncio.to_thread(self._reintentar_en_bd, envio_id)
+        if envio:
+            self._despertar.set()
+        return envio
+
+    def iniciar(self) -> None:
+        if self._tarea is None or self._tarea.done():
+            self._tarea = asyncio.create_task(self._bucle())
+
+    async def detener(self) -> None:
+        # Los envíos cortados a la mitad quedan "enviando" y pasan a "incierto" al reiniciar
+        tareas = [self._tarea, *self._envios] if self._tarea else list(self._envios)
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+        self._tarea = None
+        self._envios.clear()
+
+    async def _bucle(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self._marcar_inciertos)
+                await self._despachar()
+            except Exception as e:
+                print(f"Error en la bandeja de salida: {e}")
+
+            self._despertar.clear()
+            try:
+                await asyncio.wait_for(self._despertar.wait(), settings.BANDEJA_INTERVALO)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _despachar(self) -> None:
+        ahora = time.monotonic()
+        for red, limite in self.concurrencia.items():
+            libres = limite - self._en_curso.get(red, 0)
+            if libres <= 0 or self._pausa_hasta.get(red, 0) > ahora:
+                continue
+
+            envios = await asyncio.to_thread(self._tomar_vencidos, red, libres)
+            for envio in envios:
+                self._en_curso[red] = self._en_curso.get(red, 0) + 1
+                tarea = asyncio.create_task(self._enviar(envio))
+                self._envios.add(tarea)
+                tarea.add_done_callback(self._envio_terminado)
+
+    def _envio_terminado(self, tarea: asyncio.Task) -> None:
+        self._envios.discard(tarea)
+        # Se liberó un lugar: puede haber más envíos esperando
+        self._despertar.set()
+
+    async def _enviar(self, envio: Envio) -> None:
+        red = envio.red_social
+        timeout = settings.PUBLICACION_TIMEOUT_VIDEO if red == "tiktok" else settings.PUBLICACION_TIMEOUT
+        try:
+            respuesta = await asyncio.wait_for(_llamar_red(red, envio.parametros), timeout)
+        except Exception as e:
+            await self._registrar_error(envio, e)
+        else:
+            enlace = enlace_publicacion(red, respuesta)
+            await asyncio.to_thread(self._registrar_publicado, envio, respuesta, enlace)
+            # TikTok procesa el video después de subirlo: el resultado final lo registra el seguimiento
+            if red == "tiktok":
+                seguimiento_tiktok.registrar(respuesta["publish_id"], envio.contenido_id)
+            print(f"Envío {envio.id} a {red}: publicado (intento {envio.intentos})")
+        finally:
+            self._en_curso[red] -= 1
+
+    async def _registrar_error(self, envio: Envio, e: Exception) -> None:
+        red = envio.red_social
+        decision, espera_red = clasificar_error(e)
+        mensaje = str(getattr(e, "detail", None) or e) or type(e).__name__
+
+        if decision == "reintentar" and envio.intentos >= settings.BANDEJA_MAX_INTENTOS:
+            decision, mensaje = "fallido", f"{mensaje} (tras {envio.intentos} intentos)"
+
+        if decision != "reintentar":
+            print(f"Envío {envio.id} a {red}: {decision} ({mensaje})")
+            await asyncio.to_thread(self._terminar, envio, mensaje, decision)
+            return
+
+        espera = backoff_con_jitter(envio.intentos - 1, settings.BANDEJA_BACKOFF_BASE, settings.BANDEJA_BACKOFF_MAX)
+        if espera_red is not None:
+            # La red pidió esperar: se respeta para este envío y se pausa toda la red
+            espera = max(espera, espera_red)
+            self._pausa_hasta[red] = max(self._pausa_hasta.get(red, 0), time.monotonic() + espera_red)
+
+        print(f"Envío {envio.id} a {red}: reintento en {espera:.1f}s ({mensaje})")
+        await asyncio.to_thread(self._reprogramar, envio, mensaje, espera)
+
+    @staticmethod
+    def _encolar_en_bd(
+        red: str, parametros: Dict[str, Any], clave: str, contenido_id: Optional[int]
+    ) -> Tuple[Envio, bool]:
+        with Session(engine) as session:
+            return EnvioController.encolar(session, red, parametros, clave, contenido_id)
+
+    @staticmethod
+    def _reintentar_en_bd(envio_id: int) -> Optional[Envio]:
+        with Session(engine) as session:
+            return EnvioController.reintentar(session, envio_id)
+
+    @staticmethod
+    def _tomar_vencidos(red: str, limite: int) -> list[Envio]:
+        with Session(engine) as session:
+            return EnvioController.tomar_vencidos(session, red, limite)
+
+    @staticmethod
+    def _marcar_inciertos() -> None:
+        limite = datetime.now(timezone.utc) - timedelta(seconds=settings.BANDEJA_ENVIANDO_MAX_SEG)
+        with Session(engine) as session:
+            cantidad = EnvioController.marcar_inciertos(session, limite)
+        if cantidad:
+            print(f"Bandeja de salida: {cantidad} envíos interrumpidos quedaron inciertos")
+
+    @staticmethod
+    def _registrar_publicado(envio: Envio, respuesta: Dict[str, Any], enlace: Optional[str]) -> None:
+        with Session(engine) as session:
+            EnvioController.marcar_publicado(session, envio.id, respuesta, enlace)  # type: ignore[arg-type]
+            if envio.contenido_id is not None:
+                ContenidoController.registrar_resultado_publicacion(
+                    session, contenido_id=envio.contenido_id, publicado=True, enlace_publicacion=enlace
+                )
+
+    @staticmethod
+    def _reprogramar(envio: Envio, mensaje: str, espera: float) -> None:
+        with Session(engine) as session:
+            EnvioController.reprogramar(session, envio.id, mensaje, espera)  # type: ignore[arg-type]
+
+    @staticmethod
+    def _terminar(envio: Envio, mensaje: str, estado: str) -> None:
+        with Session(engine) as session:
+            EnvioController.marcar_fallido(session, envio.id, mensaje, estado)  # type: ignore[arg-type]
+
+
+bandeja_salida = BandejaSalida()
+
+
+async def encolar_envio(red: str, parametros: Dict[str, Any], clave_idempotencia: Optional[str]) -> Envio:
+    """Encola desde una ruta: la clave de idempotencia con otros datos es 409, otro error 500."""
+    try:
+        envio, _ = await bandeja_salida.encolar(red, parametros, clave_idempotencia)
+        return envio
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
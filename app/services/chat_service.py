@@ -1,8 +1,14 @@
-import json
+import asyncio
 from textwrap import dedent
+from typing import AsyncIterator
 from fastapi.responses import JSONResponse
-from app.schemas.chat_schema import ChatRequest
+from pydantic import BaseModel, ValidationError
+from app.core.config import settings
+from app.core.sse import evento_sse
+from app.schemas.chat_schema import ChatRequest, ContenidoBase, SeccionRedSocial, construir_modelo_contenido
 from app.services.ia import imagen_service, texto_service, video_service
+from app.services.ia.json_incremental import ParserJsonIncremental
+from app.services.ia.reparacion_json import metricas_reparacion, reparar_json
 
 
 def _construir_instrucciones(redes_sociales: list[str]) -> str:
@@ -44,41 +50,218 @@ def _construir_instrucciones(redes_sociales: list[str]) -> str:
     return instrucciones
 
 
-def generar_contenido(solicitud: ChatRequest) -> JSONResponse:
-    return __generar_contenido(solicitud, 0)
+def _construir_instrucciones_base() -> str:
+    """Instrucciones del modo por red: solo los campos comunes, sin secciones por red."""
+    instrucciones = dedent("""
+        Sos un asistente especializado en generar contenido académico para redes sociales de la administración de la 'Facultad de Computación - FICCT' de la UAGRM en Santa Cruz, Bolivia.
+
+        REGLAS IMPORTANTES:
+        - Respondé ÚNICAMENTE con formato JSON válido
+        - No incluyás texto adicional antes o después del JSON
+        - No uses markdown ni bloques de código
+
+        ESTRUCTURA DE LA RESPUESTA (JSON):
+        {
+        "tema": "Breve descripcion del tema (max 5 palabras)",
+        "prompt_imagen": "Prompt para generar imagen informativa relacionada con el contenido del tema",
+        "prompt_video": "Prompt para generar video informativo para tiktok relacionado con el contenido del tema"
+        }
+        """
+    ).strip()
+
+    return instrucciones
+
+
+def _construir_instrucciones_red(red_social: str) -> str:
+    """Instrucciones del modo por red: la sección de una sola red social."""
+    instrucciones = dedent(f"""
+        Sos un asistente especializado en generar contenido académico para redes sociales de la administración de la 'Facultad de Computación - FICCT' de la UAGRM en Santa Cruz, Bolivia.
+
+        REGLAS IMPORTANTES:
+        - Respondé ÚNICAMENTE con formato JSON válido
+        - No incluyás texto adicional antes o después del JSON
+        - No uses markdown ni bloques de código
+        - Adaptá el tono y contenido a la red social indicada (por ejemplo: formal, amigable, etc.)
+        - Longitud predeterminada: corta (a menos que se especifique otra)
+        - Utiliza el uso pronominal y verbal de "vos" en lugar de "tú"
+
+        RED SOCIAL:
+        {red_social}
+
+        ESTRUCTURA DE LA RESPUESTA (JSON):
+        {{
+        "texto": "Contenido adaptado para {red_social}",
+        "hashtags": ["#hashtag1", "#hashtag2"]
+        }}
+        """
+    ).strip()
+
+    return instrucciones
 
 
-def __generar_contenido(solicitud: ChatRequest, intentos: int) -> JSONResponse:
+MENSAJE_ERROR_JSON = "La IA No generó el formato correcto en JSON"
 
+
+async def generar_contenido(solicitud: ChatRequest) -> JSONResponse:
+    intentos = settings.IA_REINTENTOS
+
+    if solicitud.por_red:
+        contenido_ia = await __generar_contenido_por_red(solicitud, intentos, usar_cache=not solicitud.no_cache)
+    else:
+        contenido_ia = await __generar_contenido(solicitud, intentos, usar_cache=not solicitud.no_cache)
+
+    if contenido_ia is None:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "error": True,
+                "mensaje": MENSAJE_ERROR_JSON,
+            },
+        )
+
+    return JSONResponse(status_code=200, content=contenido_ia)
+
+
+async def generar_contenido_stream(solicitud: ChatRequest) -> AsyncIterator[str]:
+    """
+    Genera el contenido como eventos SSE:
+    - `seccion`: cada clave de primer nivel (tema, facebook, ...) apenas se completa.
+    - `fin`: el JSON completo; es la versión definitiva de la respuesta.
+    - `error`: si la IA no generó un JSON válido ni en los reintentos, o si
+      falló la llamada al proveedor (la respuesta ya empezó: no hay otro
+      modo de avisarle al cliente).
+    Si el texto del stream no se puede reparar se usa el camino sin streaming.
+    """
+    redes = list(dict.fromkeys(solicitud.redes_sociales))
     instrucciones: str = _construir_instrucciones(solicitud.redes_sociales)
-    respuesta: str = texto_service.generar_contenido(solicitud.prompt, instrucciones)
+    modelo = construir_modelo_contenido(tuple(redes))
+    parser = ParserJsonIncremental()
+    emitidas: dict = {}
 
     try:
-        print("generando contenido")
-        contenido_ia: dict = json.loads(respuesta)
-        
-        # print("generando video")
-        # video_ia: dict = video_service.generar_video(contenido_ia["prompt_video"], solicitud.duracion_video)
-        # contenido_ia["url_video"] = video_ia.get("url_video", "")
-
-        # print("generando imagen")
-        # imagen_ia: dict = imagen_service.generar_imagen(contenido_ia["prompt_imagen"])
-        # contenido_ia["url_imagen"] = imagen_ia.get("url_imagen", "")
-
-        return JSONResponse(status_code=200, content=contenido_ia)
+        fragmentos = texto_service.generar_contenido_stream(
+            solicitud.prompt, instrucciones, usar_cache=not solicitud.no_cache, esquema=modelo
+        )
+        async for fragmento in fragmentos:
+            for clave, valor in parser.alimentar(fragmento):
+                emitidas[clave] = valor
+                yield evento_sse("seccion", {"clave": clave, "valor": valor})
+
+        contenido_ia = _interpretar(parser.texto, modelo, redes)
+        if contenido_ia is None:
+            print("El texto del stream no es un JSON válido, se genera sin streaming")
+            await texto_service.invalidar_cache(solicitud.prompt, instrucciones)
+            contenido_ia = await __generar_contenido(solicitud, settings.IA_REINTENTOS, usar_cache=False)
     except Exception as e:
-        print(
-            f"Error al convertir el texto generado por la IA a JSON - Intentos restantes: {intentos-1}",
-            e,
+        print("Error al generar el contenido en streaming", e)
+        yield evento_sse("error", {"error": True, "mensaje": f"Error al generar el contenido: {e}"})
+        return
+
+    if contenido_ia is None:
+        yield evento_sse("error", {"error": True, "mensaje": MENSAJE_ERROR_JSON})
+        return
+
+    # Completar (o corregir, si hubo que reparar o regenerar) las secciones ya enviadas
+    for clave, valor in contenido_ia.items():
+        if emitidas.get(clave) != valor:
+            yield evento_sse("seccion", {"clave": clave, "valor": valor})
+
+    yield evento_sse("fin", contenido_ia)
+
+
+def _interpretar(respuesta: str, modelo: type[BaseModel], redes: list[str]) -> dict | None:
+    """Repara localmente la respuesta y la valida contra el modelo esperado."""
+    contenido_ia = reparar_json(respuesta, redes)
+    if contenido_ia is None:
+        return None
+
+    try:
+        return modelo.model_validate(contenido_ia).model_dump()
+    except ValidationError as e:
+        metricas_reparacion["esquema_invalido"] += 1
+        print("La respuesta de la IA no cumple con la estructura esperada", e)
+        return None
+
+
+async def __generar_seccion(
+    prompt: str,
+    instrucciones: str,
+    modelo: type[BaseModel],
+    redes: list[str],
+    intentos: int,
+    usar_cache: bool,
+) -> dict | None:
+    """
+    Genera y valida una respuesta. Solo si la reparación local no alcanza
+    se gasta otra llamada al LLM (hasta `intentos` reintentos).
+    """
+    for restantes in range(intentos, -1, -1):
+        respuesta: str = await texto_service.generar_contenido(
+            prompt, instrucciones, usar_cache=usar_cache, esquema=modelo
         )
 
-        if intentos > 0:
-            return __generar_contenido(solicitud, intentos - 1)
+        contenido_ia = _interpretar(respuesta, modelo, redes)
+        if contenido_ia is not None:
+            return contenido_ia
+
+        print(f"Error al convertir el texto generado por la IA a JSON - Intentos restantes: {restantes}")
+        # No dejar en cache una respuesta inválida; el reintento va directo al LLM
+        await texto_service.invalidar_cache(prompt, instrucciones)
+        usar_cache = False
+
+    return None
+
+
+async def __generar_contenido(solicitud: ChatRequest, intentos: int, usar_cache: bool = True) -> dict | None:
+    redes = list(dict.fromkeys(solicitud.redes_sociales))
+    instrucciones: str = _construir_instrucciones(solicitud.redes_sociales)
+
+    print("generando contenido")
+    contenido_ia = await __generar_seccion(
+        solicitud.prompt,
+        instrucciones,
+        construir_modelo_contenido(tuple(redes)),
+        redes,
+        intentos,
+        usar_cache,
+    )
+
+    # print("generando video")
+    # video_ia: dict = video_service.generar_video(contenido_ia["prompt_video"], solicitud.duracion_video)
+    # contenido_ia["url_video"] = video_ia.get("url_video", "")
+
+    # print("generando imagen")
+    # imagen_ia: dict = await imagen_service.generar_imagen(contenido_ia["prompt_imagen"])
+    # contenido_ia["url_imagen"] = imagen_ia.get("url_imagen", "")
+
+    return contenido_ia
+
 
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": True,
-            "mensaje": "La IA No generó el formato correcto en JSON",
-        },
+async def __generar_contenido_por_red(solicitud: ChatRequest, intentos: int, usar_cache: bool = True) -> dict | None:
+    """
+    Modo por red: una generación corta para los campos comunes y una por cada red social,
+    todas en paralelo. Si una red falla se reintenta solo esa red.
+    Se arma la misma estructura que en el modo de un solo prompt.
+    """
+    redes = list(dict.fromkeys(solicitud.redes_sociales))
+
+    base, *secciones = await asyncio.gather(
+        __generar_seccion(
+            solicitud.prompt, _construir_instrucciones_base(), ContenidoBase, [], intentos, usar_cache
+        ),
+        *(
+            __generar_seccion(
+                solicitud.prompt, _construir_instrucciones_red(red), SeccionRedSocial, [], intentos, usar_cache
+            )
+            for red in redes
+        ),
     )
+
+    if base is None or any(seccion is None for seccion in secciones):
+        return None
+
+    contenido_ia: dict = dict(base)
+    for red, seccion in zip(redes, secciones):
+        contenido_ia[red] = seccion
+
+    return contenido_ia
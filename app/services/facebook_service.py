@@ -1,5 +1,7 @@
-import requests
+import httpx
 from app.core.config import Settings
+from app.core.http_client import ClienteHttp, cliente_http
+from app.core.reintentos import cabeceras_reintento
 from fastapi import HTTPException
 from typing import Any, Dict
 
@@ -8,35 +10,38 @@ settings = Settings()
 
 class FacebookService:
 
-    def __init__(self):
+    def __init__(self, http: ClienteHttp = cliente_http):
 
+        self.http = http
         self.api_url: str | None = settings.FACEBOOK_API_URL
         self.token: str | None = settings.FACEBOOK_TOKEN
 
         self.id_pagina: str = getattr(settings, "FACEBOOK_ID_PAGINA", "me")
 
-    def realizar_peticion(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    async def realizar_peticion(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
         url = f"{self.api_url}/{endpoint}"
 
         data["access_token"] = self.token
 
         try:
-            respuesta = requests.post(url, data=data)
+            respuesta = await self.http.post(url, data=data, red="facebook")
             respuesta.raise_for_status()
             return respuesta.json()
 
-        except requests.exceptions.RequestException as e:
-            status_code = (
-                e.response.status_code
-                if hasattr(e, "response") and e.response is not None
-                else 500
-            )
+        except httpx.HTTPStatusError as e:
+            # Se conserva el Retry-After / límite de uso para saber cuándo reintentar
             raise HTTPException(
-                status_code=status_code,
+                status_code=e.response.status_code,
                 detail=f"Error al publicar en Facebook: {e}",
-            )
+                headers=cabeceras_reintento(e.response),
+            ) from e
+        except httpx.HTTPError as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error al publicar en Facebook: {str(e) or type(e).__name__}",
+            ) from e
 
-    def publicar_post(self, texto: str, url_img: str | None = None) -> Dict[str, Any]:
+    async def publicar_post(self, texto: str, url_img: str | None = None) -> Dict[str, Any]:
         if url_img:
             endpoint = f"{self.id_pagina}/photos"
             datos = {"caption": texto, "url": url_img}
@@ -44,7 +49,7 @@ class FacebookService:
             endpoint = f"{self.id_pagina}/feed"
             datos = {"message": texto}
 
-        return self.realizar_peticion(endpoint, datos)
+        return await self.realizar_peticion(endpoint, datos)
 
 
 facebook_service = FacebookService()
@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.archivos import escribir_atomico
+from app.core.config import settings
+
+
+class CacheRespuestas:
+    """
+    Cache de respuestas del LLM direccionada por contenido.
+
+    - Nivel 1: LRU en memoria del proceso (max_entradas).
+    - Nivel 2 (opcional): archivos JSON en `directorio`, compartidos entre workers,
+      con un tamaño máximo en bytes; se eliminan primero los más antiguos.
+    Ambos niveles respetan el TTL.
+    """
+
+    def __init__(
+        self,
+        max_entradas: int = 512,
+        ttl: int = 86400,
+        directorio: Optional[str] = None,
+        max_bytes_disco: int = 100 * 1024 * 1024,
+    ):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.directorio = directorio or None
+        self.max_bytes_disco = max_bytes_disco
+
+        self._memoria: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._escrituras_disco = 0
+        self._contadores: Dict[str, int] = {
+            "hits_memoria": 0,
+            "hits_disco": 0,
+            "misses": 0,
+            "expiradas": 0,
+            "desalojadas": 0,
+        }
+
+    @staticmethod
+    def clave(modelo: str, instrucciones: str, prompt: str) -> str:
+        """Hash estable (igual en todos los procesos) de la combinación de entrada."""
+        material = json.dumps([modelo, instrucciones, prompt], ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    async def obtener(self, clave: str) -> Optional[str]:
+        entrada = self._memoria.get(clave)
+        if entrada is not None:
+            creado, valor = entrada
+            if not self._expirado(creado):
+                self._memoria.move_to_end(clave)
+                self._contadores["hits_memoria"] += 1
+                return valor
+            del self._memoria[clave]
+            self._contadores["expiradas"] += 1
+
+        if self.directorio:
+            entrada = await asyncio.to_thread(self._leer_disco, clave)
+            if entrada is not None:
+                creado, valor = entrada
+                self._guardar_memoria(clave, creado, valor)
+                self._contadores["hits_disco"] += 1
+                return valor
+
+        self._contadores["misses"] += 1
+        return None
+
+    async def guardar(self, clave: str, valor: str) -> None:
+        creado = time.time()
+        self._guardar_memoria(clave, creado, valor)
+
+        if self.directorio:
+            await asyncio.to_thread(self._escribir_disco, clave, creado, valor)
+
+    async def invalidar(self, clave: str) -> None:
+        self._memoria.pop(clave, None)
+
+        if self.directorio:
+            ruta = self._ruta(clave)
+            await asyncio.to_thread(self._eliminar, ruta)
+
+    def estadisticas(self) -> Dict[str, int | float | None]:
+        consultas = self._contadores["hits_memoria"] + self._contadores["hits_disco"] + self._contadores["misses"]
+        hits = self._contadores["hits_memoria"] + self._contadores["hits_disco"]
+        return {
+            **self._contadores,
+            "entradas_memoria": len(self._memoria),
+            "tasa_aciertos": round(hits / consultas, 4) if consultas else None,
+        }
+
+    def _expirado(self, creado: float) -> bool:
+        return self.ttl > 0 and time.time() - creado > self.ttl
+
+    def _guardar_memoria(self, clave: str, creado: float, valor: str) -> None:
+        self._memoria[clave] = (creado, valor)
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_entradas:
+            self._memoria.popitem(last=False)
+            self._contadores["desalojadas"] += 1
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(str(self.directorio), clave[:2], f"{clave}.json")
+
+    def _leer_disco(self, clave: str) -> Optional[Tuple[float, str]]:
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if self._expirado(datos["creado"]):
+            self._eliminar(ruta)
+            self._contadores["expiradas"] += 1
+            return None
+        return datos["creado"], datos["valor"]
+
+    def _escribir_disco(self, clave: str, creado: float, valor: str) -> None:
+        # Escritura atómica: otros workers nunca leen un archivo a medias
+        datos = json.dumps({"creado": creado, "valor": valor}, ensure_ascii=False)
+        escribir_atomico(self._ruta(clave), datos.encode("utf-8"))
+
+        self._escrituras_disco += 1
+        if self._escrituras_disco % 100 == 0:
+            self._podar_disco()
+
+    def _podar_disco(self) -> None:
+        """Elimina los archivos más antiguos hasta quedar bajo max_bytes_disco."""
+        archivos = []
+        for raiz, _, nombres in os.walk(str(self.directorio)):
+            for nombre in nombres:
+                if nombre.endswith(".json"):
+                    ruta = os.path.join(raiz, nombre)
+                    estado = os.stat(ruta)
+                    archivos.append((estado.st_mtime, estado.st_size, ruta))
+
+        total = sum(tamano for _, tamano, _ in archivos)
+        for _, tamano, ruta in sorted(archivos):
+            if total <= self.max_bytes_disco:
+                break
+            self._eliminar(ruta)
+            total -= tamano
+            self._contadores["desalojadas"] += 1
+
+    @staticmethod
+    def _eliminar(ruta: str) -> None:
+        try:
+            os.remove(ruta)
+        except FileNotFoundError:
+            pass
+
+
+cache_respuestas = CacheRespuestas(
+    max_entradas=settings.IA_CACHE_MAX_ENTRADAS,
+    ttl=settings.IA_CACHE_TTL,
+    directorio=settings.IA_CACHE_DIR,
+    max_bytes_disco=settings.IA_CACHE_DISCO_MAX_MB * 1024 * 1024,
+)
@@ -0,0 +1,13 @@
+from google import genai
+
+from app.core.config import settings
+from app.services.ia.cliente_local import ClienteLocal
+
+# Proveedores que usan la API del SDK de Gemini ("local" la simula sin conexión)
+PROVEEDORES_GEMINI = ("gemini", "local")
+
+
+def crear_cliente():
+    if settings.AI_PROVIDER == "local":
+        return ClienteLocal()
+    return genai.Client()
@@ -0,0 +1,263 @@
+"""
+Cliente local que imita la parte del SDK de Gemini (google-genai) usada por la app.
+
+Se activa con AI_PROVIDER=local y permite desarrollar y probar sin conexión ni API key.
+Las respuestas son deterministas: dependen solo del prompt recibido.
+"""
+import asyncio
+import hashlib
+import json
+import struct
+import time
+import uuid
+import zlib
+from types import SimpleNamespace
+from typing import Any
+
+from app.core.config import settings
+
+
+def _latencia(tokens_respuesta: int = 0) -> float:
+    """Latencia fija por llamada más un costo por token generado."""
+    return settings.LOCAL_IA_LATENCIA + tokens_respuesta * settings.LOCAL_IA_SEG_POR_TOKEN
+
+
+def _esperar_latencia(tokens_respuesta: int = 0) -> None:
+    segundos = _latencia(tokens_respuesta)
+    if segundos > 0:
+        time.sleep(segundos)
+
+
+async def _esperar_latencia_async(tokens_respuesta: int = 0) -> None:
+    segundos = _latencia(tokens_respuesta)
+    if segundos > 0:
+        await asyncio.sleep(segundos)
+
+
+def _contar_tokens(texto: str) -> int:
+    # Aproximación habitual: ~4 caracteres por token
+    return max(1, len(texto) // 4)
+
+
+def _latencia_fragmento(texto: str, total_fragmentos: int) -> float:
+    """La latencia fija se reparte entre los fragmentos; el costo por token no."""
+    return settings.LOCAL_IA_LATENCIA / total_fragmentos + _contar_tokens(texto) * settings.LOCAL_IA_SEG_POR_TOKEN
+
+
+def _digest(texto: str) -> bytes:
+    return hashlib.sha256(texto.encode("utf-8")).digest()
+
+
+def _png_desde_prompt(prompt: str, lado: int = 8) -> bytes:
+    """Genera un PNG válido de un solo color derivado del prompt."""
+    r, g, b = _digest(prompt)[:3]
+    fila = b"\x00" + bytes([r, g, b]) * lado
+    datos = zlib.compress(fila * lado)
+
+    def bloque(tipo: bytes, contenido: bytes) -> bytes:
+        crc = zlib.crc32(tipo + contenido) & 0xFFFFFFFF
+        return struct.pack(">I", len(contenido)) + tipo + contenido + struct.pack(">I", crc)
+
+    cabecera = struct.pack(">IIBBBBB", lado, lado, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + bloque(b"IHDR", cabecera) + bloque(b"IDAT", datos) + bloque(b"IEND", b"")
+
+
+def _mp4_desde_prompt(prompt: str) -> bytes:
+    """Bytes con cabecera MP4 mínima; suficiente para almacenar y servir el archivo."""
+    return b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom" + _digest(prompt) * 32
+
+
+def _redes_desde_instrucciones(instrucciones: str) -> list[str]:
+    lineas = [linea.strip() for linea in instrucciones.splitlines()]
+    if "REDES SOCIALES A CONSIDERAR:" in lineas:
+        indice = lineas.index("REDES SOCIALES A CONSIDERAR:") + 1
+        if indice < len(lineas) and lineas[indice]:
+            return [red.strip() for red in lineas[indice].split(",") if red.strip()]
+    return []
+
+
+def _red_desde_instrucciones(instrucciones: str) -> str | None:
+    lineas = [linea.strip() for linea in instrucciones.splitlines()]
+    if "RED SOCIAL:" in lineas:
+        indice = lineas.index("RED SOCIAL:") + 1
+        if indice < len(lineas) and lineas[indice]:
+            return lineas[indice]
+    return None
+
+
+def _texto_desde_prompt(prompt: str, instrucciones: str) -> str:
+    red = _red_desde_instrucciones(instrucciones)
+    if red:
+        return json.dumps({
+            "texto": f"Contenido para {red}: {prompt}",
+            "hashtags": ["#FICCT", "#UAGRM"],
+        }, ensure_ascii=False)
+
+    contenido: dict[str, Any] = {
+        "tema": prompt[:40],
+        "prompt_imagen": f"Imagen informativa sobre: {prompt}",
+        "prompt_video": f"Video informativo para tiktok sobre: {prompt}",
+    }
+    for red in _redes_desde_instrucciones(instrucciones):
+        contenido[red] = {
+            "texto": f"Contenido para {red}: {prompt}",
+            "hashtags": ["#FICCT", "#UAGRM"],
+        }
+    return json.dumps(contenido, ensure_ascii=False)
+
+
+class _VideoLocal:
+
+    def __init__(self, prompt: str):
+        self.prompt = prompt
+        self.video_bytes: bytes | None = None
+
+    def save(self, ruta: str) -> None:
+        if self.video_bytes is None:
+            raise ValueError("El video no fue descargado")
+        with open(ruta, "wb") as f:
+            f.write(self.video_bytes)
+
+
+class _OperacionLocal:
+
+    def __init__(self, prompt: str, number_of_videos: int = 1):
+        self.name = f"operations/local-{uuid.uuid4().hex}"
+        self.done = False
+        self.response = None
+        self.error = None
+        self._prompt = prompt
+        self._cantidad = number_of_videos
+        self._consultas = 0
+
+    def _avanzar(self) -> None:
+        self._consultas += 1
+        if self._consultas >= settings.LOCAL_IA_CONSULTAS_VIDEO:
+            self.done = True
+            self.response = SimpleNamespace(
+                generated_videos=[
+                    SimpleNamespace(video=_VideoLocal(f"{self._prompt}#{i}"))
+                    for i in range(self._cantidad)
+                ]
+            )
+
+
+def _respuesta_texto(contents: Any, config: Any) -> SimpleNamespace:
+    instrucciones = str(getattr(config, "system_instruction", None) or "")
+    texto = _texto_desde_prompt(str(contents), instrucciones)
+    tokens_prompt = _contar_tokens(instrucciones + str(contents))
+    tokens_respuesta = _contar_tokens(texto)
+    return SimpleNamespace(
+        text=texto,
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=tokens_prompt,
+            candidates_token_count=tokens_respuesta,
+            total_token_count=tokens_prompt + tokens_respuesta,
+        ),
+    )
+
+
+def _fragmentos_texto(contents: Any, config: Any, tamano: int = 40) -> list[SimpleNamespace]:
+    respuesta = _respuesta_texto(contents, config)
+    texto = respuesta.text
+    fragmentos = [
+        SimpleNamespace(text=texto[i:i + tamano], usage_metadata=None)
+        for i in range(0, len(texto), tamano)
+    ]
+    # Como en el SDK, el último fragmento trae el uso de tokens
+    fragmentos[-1].usage_metadata = respuesta.usage_metadata
+    return fragmentos
+
+
+def _respuesta_imagenes(prompt: str, config: Any) -> SimpleNamespace:
+    cantidad = getattr(config, "number_of_images", None) or 1
+    return SimpleNamespace(
+        generated_images=[
+            SimpleNamespace(image=SimpleNamespace(image_bytes=_png_desde_prompt(f"{prompt}#{i}")))
+            for i in range(cantidad)
+        ]
+    )
+
+
+class _ModelosLocal:
+
+    def generate_content(self, model: str, contents: str, config: Any = None):
+        respuesta = _respuesta_texto(contents, config)
+        _esperar_latencia(respuesta.usage_metadata.candidates_token_count)
+        return respuesta
+
+    def generate_content_stream(self, model: str, contents: str, config: Any = None):
+        fragmentos = _fragmentos_texto(contents, config)
+        for fragmento in fragmentos:
+            time.sleep(_latencia_fragmento(fragmento.text, len(fragmentos)))
+            yield fragmento
+
+    def generate_images(self, model: str, prompt: str, config: Any = None):
+        _esperar_latencia()
+        return _respuesta_imagenes(prompt, config)
+
+    def generate_videos(self, model: str, prompt: str, config: Any = None):
+        _esperar_latencia()
+        cantidad = getattr(config, "number_of_videos", None) or 1
+        return _OperacionLocal(prompt, cantidad)
+
+
+class _ModelosLocalAsync:
+
+    async def generate_content(self, model: str, contents: str, config: Any = None):
+        respuesta = _respuesta_texto(contents, config)
+        await _esperar_latencia_async(respuesta.usage_metadata.candidates_token_count)
+        return respuesta
+
+    async def generate_content_stream(self, model: str, contents: str, config: Any = None):
+        fragmentos = _fragmentos_texto(contents, config)
+
+        async def iterar():
+            for fragmento in fragmentos:
+                await asyncio.sleep(_latencia_fragmento(fragmento.text, len(fragmentos)))
+                yield fragmento
+
+        return iterar()
+
+    async def generate_images(self, model: str, prompt: str, config: Any = None):
+        await _esperar_latencia_async()
+        return _respuesta_imagenes(prompt, config)
+
+    async def generate_videos(self, model: str, prompt: str, config: Any = None):
+        await _esperar_latencia_async()
+        cantidad = getattr(config, "number_of_videos", None) or 1
+        return _OperacionLocal(prompt, cantidad)
+
+
+class _OperacionesLocal:
+
+    def get(self, operation: _OperacionLocal) -> _OperacionLocal:
+        operation._avanzar()
+        return operation
+
+
+class _OperacionesLocalAsync:
+
+    async def get(self, operation: _OperacionLocal) -> _OperacionLocal:
+        operation._avanzar()
+        return operation
+
+
+class _ArchivosLocal:
+
+    def download(self, file: _VideoLocal) -> bytes:
+        file.video_bytes = _mp4_desde_prompt(file.prompt)
+        return file.video_bytes
+
+
+class ClienteLocal:
+    """Sustituto sin conexión de `genai.Client` con la misma forma de uso."""
+
+    def __init__(self):
+        self.models = _ModelosLocal()
+        self.operations = _OperacionesLocal()
+        self.files = _ArchivosLocal()
+        self.aio = SimpleNamespace(
+            models=_ModelosLocalAsync(),
+            operations=_OperacionesLocalAsync(),
+        )
@@ -1,65 +1,170 @@
-import os
+import asyncio
+import time
+from typing import List, Tuple
 
 from app.core.config import settings
-from google import genai
 from google.genai import types
+from app.services.ia.cliente_ia import PROVEEDORES_GEMINI, crear_cliente
+from app.services.ia.media_service import almacen_media
 
 # Configuración de Gemini:
-client = genai.Client()
+client = crear_cliente()
 
-IMAGES_DIR = "app/static/images/"
+MODELO_IMAGEN = "imagen-4.0-generate-001"
 
+# Imagen acepta de 1 a 4 imágenes por llamada
+MAX_IMAGENES_POR_LLAMADA = 4
+
+
+def _respuesta(prompt: str, guardado: dict) -> dict:
+    return {
+        "url_imagen": guardado["url"],
+        "prompt": prompt,
+        "archivo_id": guardado["archivo_id"],
+        "reutilizado": guardado["reutilizado"],
+    }
+
+
+async def __generar_imagen_con_gemini(prompt: str, reutilizar: bool) -> dict:
+    if reutilizar:
+        existente = await asyncio.to_thread(
+            almacen_media.buscar_por_prompt, "imagen", prompt, modelo=MODELO_IMAGEN
+        )
+        if existente:
+            return _respuesta(prompt, existente)
 
-def __generar_imagen_con_gemini(prompt: str) -> dict:
     try:
-        respuesta = client.models.generate_images(
-            model="imagen-4.0-generate-001",
-            prompt=prompt,
-            config=types.GenerateImagesConfig(
-                number_of_images=1,
-                # image_size="1K",
-                # aspect_ratio="19:9"
-                # include_safety_attributes=True
-            )
+        imagenes = await _solicitar_imagenes(prompt, 1)
+
+        # Guardar la imagen fuera del event loop, con nombre por hash del contenido
+        # y escritura atómica (nunca se sirve un PNG a medio escribir)
+        guardado = await asyncio.to_thread(
+            almacen_media.guardar, imagenes[0], "imagen", prompt, modelo=MODELO_IMAGEN
         )
-        
-        if respuesta and respuesta.generated_images:
-            imagen_obj = respuesta.generated_images[0]
-            
-            if imagen_obj.image is None or imagen_obj.image.image_bytes is None:
-                raise Exception("No se pudo obtener los datos de la imagen")
-            
-            imagen_bytes = imagen_obj.image.image_bytes
-            
-            os.makedirs(IMAGES_DIR, exist_ok=True)
-            
-            nombre_imagen = f"{IMAGES_DIR}imagen_{hash(prompt)}.png"
-            ruta_imagen = os.path.join(nombre_imagen)
-            
-            #Guardar la imagen
-            with open(ruta_imagen, "wb") as f:
-                f.write(imagen_bytes)
-            
-            url_imagen = f"static/images/imagen_{hash(prompt)}.png"
-            
-            return {
-                "url_imagen": url_imagen,
-                "prompt": prompt,
-                # "safety_attributes": getattr(imagen_obj, 'safety_attributes', None)
-            }
-        else:
-            raise Exception("No se pudo generar la imagen")
-            
+
+        return _respuesta(prompt, guardado)
+
     except Exception as e:
         print(f"Error al generar imagen con Gemini: {e}")
         raise
 
 
-def generar_imagen(prompt: str) -> dict:
+async def _solicitar_imagenes(prompt: str, cantidad: int) -> List[bytes]:
+    """Una sola llamada a Imagen que retorna `cantidad` variantes del prompt."""
+    # Cliente asíncrono del SDK: no ocupa un hilo mientras espera a Gemini
+    respuesta = await client.aio.models.generate_images(
+        model=MODELO_IMAGEN,
+        prompt=prompt,
+        config=types.GenerateImagesConfig(
+            number_of_images=cantidad,
+            # image_size="1K",
+            # aspect_ratio="19:9"
+            # include_safety_attributes=True
+        )
+    )
+
+    if not respuesta or not respuesta.generated_images:
+        raise Exception("No se pudo generar la imagen")
+
+    imagenes = []
+    for imagen_obj in respuesta.generated_images:
+        if imagen_obj.image is None or imagen_obj.image.image_bytes is None:
+            raise Exception("No se pudo obtener los datos de la imagen")
+        imagenes.append(imagen_obj.image.image_bytes)
+        # "safety_attributes": getattr(imagen_obj, 'safety_attributes', None)
+    return imagenes
+
+
+def _agrupar_llamadas(solicitudes: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+    """Reparte cada (prompt, cantidad) en el mínimo de llamadas de hasta 4 imágenes."""
+    llamadas = []
+    for prompt, cantidad in solicitudes:
+        while cantidad > 0:
+            lote = min(cantidad, MAX_IMAGENES_POR_LLAMADA)
+            llamadas.append((prompt, lote))
+            cantidad -= lote
+    return llamadas
+
+
+async def _guardar_medido(datos: bytes, prompt: str) -> Tuple[dict, float]:
+    inicio = time.perf_counter()
+    guardado = await asyncio.to_thread(
+        almacen_media.guardar, datos, "imagen", prompt, modelo=MODELO_IMAGEN
+    )
+    return guardado, time.perf_counter() - inicio
+
+
+async def __generar_imagenes_con_gemini(solicitudes: List[Tuple[str, int]]) -> dict:
+    inicio_total = time.perf_counter()
+    llamadas = _agrupar_llamadas(solicitudes)
+    semaforo = asyncio.Semaphore(max(1, settings.IA_IMAGENES_CONCURRENCIA))
+
+    async def ejecutar(prompt: str, cantidad: int) -> List[dict]:
+        async with semaforo:
+            inicio = time.perf_counter()
+            imagenes = await _solicitar_imagenes(prompt, cantidad)
+            tiempo_generacion = time.perf_counter() - inicio
+
+        # Las escrituras de la misma llamada se hacen en paralelo
+        guardados = await asyncio.gather(*(_guardar_medido(datos, prompt) for datos in imagenes))
+        return [
+            {
+                **_respuesta(prompt, guardado),
+                "tiempo_generacion_ms": round(tiempo_generacion * 1000, 1),
+                "tiempo_guardado_ms": round(tiempo_guardado * 1000, 1),
+            }
+            for guardado, tiempo_guardado in guardados
+        ]
+
+    resultados = await asyncio.gather(
+        *(ejecutar(prompt, cantidad) for prompt, cantidad in llamadas),
+        return_exceptions=True,
+    )
+
+    imagenes, errores = [], []
+    for (prompt, cantidad), resultado in zip(llamadas, resultados):
+        if isinstance(resultado, BaseException):
+            print(f"Error al generar imágenes con Gemini: {resultado}")
+            errores.append({"prompt": prompt, "cantidad": cantidad, "error": str(resultado)})
+        else:
+            imagenes.extend(resultado)
+
+    if not imagenes and errores:
+        raise Exception(errores[0]["error"])
+
+    return {
+        "imagenes": imagenes,
+        "errores": errores,
+        "llamadas": len(llamadas),
+        "tiempo_total_ms": round((time.perf_counter() - inicio_total) * 1000, 1),
+    }
+
+
+async def generar_imagen(prompt: str, reutilizar: bool = True) -> dict:
+    """
+    Genera una imagen para el prompt. Con `reutilizar`, si ya se generó una imagen
+    para el mismo prompt se retorna esa sin volver a llamar a la IA.
+    """
+    provider = settings.AI_PROVIDER
+
+    if provider in PROVEEDORES_GEMINI:
+        return await __generar_imagen_con_gemini(prompt, reutilizar)
+    elif provider == "openai":
+        raise NotImplementedError("El proveedor OpenAI aún no está implementado")
+    else:
+        raise ValueError(f"Proveedor de IA desconocido: {provider}")
+
+
+async def generar_imagenes(solicitudes: List[Tuple[str, int]]) -> dict:
+    """
+    Genera varias imágenes por prompt agrupándolas en llamadas de hasta 4 imágenes,
+    que se ejecutan en paralelo. Siempre genera imágenes nuevas (no reutiliza).
+    Si falla solo una parte de las llamadas, retorna las imágenes obtenidas y los errores.
+    """
     provider = settings.AI_PROVIDER
 
-    if provider == "gemini":
-        return __generar_imagen_con_gemini(prompt)
+    if provider in PROVEEDORES_GEMINI:
+        return await __generar_imagenes_con_gemini(solicitudes)
     elif provider == "openai":
         raise NotImplementedError("El proveedor OpenAI aún no está implementado")
     else:
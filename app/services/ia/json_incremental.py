@@ -0,0 +1,75 @@
+import json
+from typing import Any, List, Tuple
+
+
+class ParserJsonIncremental:
+    """
+    Parser incremental para un objeto JSON que llega por partes.
+
+    Recibe fragmentos de texto con `alimentar()` y retorna cada miembro de primer
+    nivel (clave, valor) apenas se cierra, sin esperar al resto del objeto.
+    Ignora cualquier texto antes de la primera llave (por ejemplo ```json).
+    """
+
+    def __init__(self):
+        self.texto = ""
+        self.terminado = False
+        self.defectuoso = False
+
+        self._pos = 0
+        self._profundidad = 0
+        self._en_cadena = False
+        self._escape = False
+        self._inicio_miembro: int | None = None
+
+    def alimentar(self, fragmento: str) -> List[Tuple[str, Any]]:
+        self.texto += fragmento
+        completos: List[Tuple[str, Any]] = []
+
+        while self._pos < len(self.texto) and not self.terminado:
+            caracter = self.texto[self._pos]
+
+            if self._en_cadena:
+                if self._escape:
+                    self._escape = False
+                elif caracter == "\\":
+                    self._escape = True
+                elif caracter == '"':
+                    self._en_cadena = False
+
+            elif caracter == '"':
+                if self._profundidad > 0:
+                    self._en_cadena = True
+
+            elif caracter in "{[":
+                self._profundidad += 1
+                if self._profundidad == 1:
+                    self._inicio_miembro = self._pos + 1
+
+            elif caracter in "}]" and self._profundidad > 0:
+                self._profundidad -= 1
+                if self._profundidad == 0:
+                    completos.extend(self._cerrar_miembro(self._pos))
+                    self.terminado = True
+
+            elif caracter == "," and self._profundidad == 1:
+                completos.extend(self._cerrar_miembro(self._pos))
+                self._inicio_miembro = self._pos + 1
+
+            self._pos += 1
+
+        return completos
+
+    def _cerrar_miembro(self, fin: int) -> List[Tuple[str, Any]]:
+        if self._inicio_miembro is None:
+            return []
+
+        miembro = self.texto[self._inicio_miembro:fin].strip()
+        if not miembro:
+            return []
+
+        try:
+            return list(json.loads("{" + miembro + "}").items())
+        except json.JSONDecodeError:
+            self.defectuoso = True
+            return []
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from sqlmodel import Session
+
+from app.controllers.archivo_controller import ArchivoController
+from app.core.archivos import STATIC_DIR, escribir_atomico
+from app.core.database import engine
+
+# tipo -> (subcarpeta en /static, extensión)
+TIPOS_MEDIA = {
+    "imagen": ("images", ".png"),
+    "video": ("videos", ".mp4"),
+}
+
+MAX_INDICE_PROMPTS = 10_000
+
+
+def hash_contenido(datos: bytes) -> str:
+    return hashlib.sha256(datos).hexdigest()
+
+
+def hash_prompt(tipo: str, prompt: str, **parametros: Any) -> str:
+    """Hash estable del pedido: igual en todos los procesos y reinicios (a diferencia de `hash()`)."""
+    material = json.dumps([tipo, prompt, sorted(parametros.items())], ensure_ascii=False, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AlmacenMedia:
+    """
+    Almacén de media generada direccionado por contenido.
+
+    Cada archivo se guarda como `<sha256 de los bytes>.<ext>`, así que dos salidas
+    idénticas comparten archivo. Además se indexa el hash del prompt (y sus
+    parámetros) para reutilizar un asset existente sin volver a llamar a la IA.
+    El mapeo queda registrado en la tabla `Archivo`.
+    """
+
+    def __init__(self, directorio: str = STATIC_DIR, registrar: bool = True):
+        self.directorio = directorio
+        self.registrar = registrar
+        self._por_prompt: Dict[str, Dict[str, Any]] = {}
+
+    def buscar_por_prompt(self, tipo: str, prompt: str, **parametros: Any) -> Optional[Dict[str, Any]]:
+        clave = hash_prompt(tipo, prompt, **parametros)
+
+        resultado = self._por_prompt.get(clave)
+        if resultado is None and self.registrar:
+            resultado = self._buscar_en_bd(clave)
+        if resultado is None:
+            return None
+
+        # El registro puede sobrevivir al archivo (p. ej. si se limpió /static)
+        if not os.path.exists(self._ruta_desde_url(resultado["url"])):
+            self._por_prompt.pop(clave, None)
+            return None
+
+        self._indexar(clave, resultado)
+        return {**resultado, "reutilizado": True}
+
+    def guardar(self, datos: bytes, tipo: str, prompt: str, **parametros: Any) -> Dict[str, Any]:
+        carpeta, extension = TIPOS_MEDIA[tipo]
+        digest = hash_contenido(datos)
+        nombre = f"{digest}{extension}"
+        ruta = os.path.join(self.directorio, carpeta, nombre)
+
+        duplicado = os.path.exists(ruta)
+        if not duplicado:
+            escribir_atomico(ruta, datos)
+
+        url = f"static/{carpeta}/{nombre}"
+        clave = hash_prompt(tipo, prompt, **parametros)
+        archivo_id = self._registrar(url, prompt, digest, clave) if self.registrar else None
+
+        resultado = {"url": url, "hash": digest, "archivo_id": archivo_id, "ruta": ruta}
+        self._indexar(clave, resultado)
+        return {**resultado, "reutilizado": duplicado}
+
+    def _ruta_desde_url(self, url: str) -> str:
+        return os.path.join(self.directorio, url.removeprefix("static/"))
+
+    def _indexar(self, clave: str, resultado: Dict[str, Any]) -> None:
+        self._por_prompt[clave] = resultado
+        if len(self._por_prompt) > MAX_INDICE_PROMPTS:
+            # Los dict mantienen el orden de inserción: se descarta el más antiguo
+            self._por_prompt.pop(next(iter(self._por_prompt)))
+
+    def _buscar_en_bd(self, clave: str) -> Optional[Dict[str, Any]]:
+        try:
+            with Session(engine) as session:
+                archivo = ArchivoController.obtener_archivo_por_hash_prompt(session, clave)
+        except Exception as e:
+            print(f"No se pudo consultar el índice de media en la base de datos: {e}")
+            return None
+
+        if archivo is None:
+            return None
+        return {
+            "url": archivo.url,
+            "hash": archivo.hash_contenido,
+            "archivo_id": archivo.id,
+            "ruta": self._ruta_desde_url(archivo.url),
+        }
+
+    def _registrar(self, url: str, prompt: str, digest: str, clave: str) -> Optional[int]:
+        try:
+            with Session(engine) as session:
+                archivo = ArchivoController.obtener_archivo_por_hash(session, digest, clave)
+                if archivo is None:
+                    archivo = ArchivoController.crear_archivo(
+                        session,
+                        url=url,
+                        prompt_text=prompt,
+                        hash_contenido=digest,
+                        hash_prompt=clave,
+                    )
+                return archivo.id
+        except Exception as e:
+            print(f"No se pudo registrar el archivo en la base de datos: {e}")
+            return None
+
+
+almacen_media = AlmacenMedia()
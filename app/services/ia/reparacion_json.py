@@ -0,0 +1,106 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+CLAVE_PLANTILLA = "red_social"
+
+# Cuántas veces se usó cada camino de reparación (expuesto en /chat/metricas)
+metricas_reparacion: Dict[str, int] = {
+    "json_valido": 0,
+    "bloque_codigo": 0,
+    "texto_extra": 0,
+    "claves_duplicadas": 0,
+    "comas": 0,
+    "fallidas": 0,
+    "esquema_invalido": 0,
+}
+
+_PATRON_BLOQUE_CODIGO = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+_PATRON_COMA_FALTANTE = re.compile(r'("|\d|true|false|null|[}\]])(\s*\n\s*)(")')
+_PATRON_COMA_SOBRANTE = re.compile(r",(\s*[}\]])")
+
+
+def _decodificar(texto: str) -> Tuple[List[Tuple[str, Any]], bool]:
+    """
+    Decodifica el primer objeto JSON del texto, ignorando lo que venga antes o después.
+    Retorna los pares de primer nivel en orden (con claves repetidas) y si había texto extra.
+    """
+    pares_raiz: List[Tuple[str, Any]] = []
+
+    def hook(pares: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        # El último objeto en cerrarse es el de primer nivel
+        pares_raiz[:] = pares
+        return dict(pares)
+
+    inicio = texto.find("{")
+    if inicio < 0:
+        raise json.JSONDecodeError("No se encontró un objeto JSON", texto, 0)
+
+    _, fin = json.JSONDecoder(object_pairs_hook=hook).raw_decode(texto, inicio)
+    return pares_raiz, bool(texto[:inicio].strip() or texto[fin:].strip())
+
+
+def _resolver_duplicadas(pares: List[Tuple[str, Any]], redes: List[str]) -> Tuple[Dict[str, Any], bool]:
+    """
+    La plantilla de instrucciones muestra "red_social" como clave de cada red,
+    así que a veces la IA la repite. Se asignan en orden a las redes pedidas.
+    """
+    plantillas = [valor for clave, valor in pares if clave == CLAVE_PLANTILLA]
+    claves = [clave for clave, _ in pares]
+    if not plantillas and len(claves) == len(set(claves)):
+        return dict(pares), False
+
+    objeto: Dict[str, Any] = {}
+    faltantes = [red for red in redes if red not in claves]
+    for clave, valor in pares:
+        if clave == CLAVE_PLANTILLA and faltantes:
+            objeto[faltantes.pop(0)] = valor
+        elif clave != CLAVE_PLANTILLA:
+            objeto[clave] = valor
+    return objeto, True
+
+
+def reparar_json(texto: str, redes: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Convierte la respuesta de la IA en un dict, reparando localmente los defectos
+    más comunes antes de gastar otra llamada al LLM:
+    bloques de código markdown, texto antes/después del JSON, claves "red_social"
+    repetidas y comas faltantes o sobrantes entre miembros.
+    Retorna None si no se pudo reparar.
+    """
+    redes = redes or []
+    candidato = texto.strip()
+    reparaciones: List[str] = []
+
+    bloque = _PATRON_BLOQUE_CODIGO.search(candidato)
+    if bloque:
+        candidato = bloque.group(1)
+        reparaciones.append("bloque_codigo")
+
+    for intento_comas in (False, True):
+        if intento_comas:
+            corregido = _PATRON_COMA_FALTANTE.sub(r"\1,\2\3", candidato)
+            corregido = _PATRON_COMA_SOBRANTE.sub(r"\1", corregido)
+            if corregido == candidato:
+                break
+            candidato = corregido
+            reparaciones.append("comas")
+
+        try:
+            pares, texto_extra = _decodificar(candidato)
+        except json.JSONDecodeError:
+            continue
+
+        if texto_extra:
+            reparaciones.append("texto_extra")
+
+        objeto, hubo_duplicadas = _resolver_duplicadas(pares, redes)
+        if hubo_duplicadas:
+            reparaciones.append("claves_duplicadas")
+
+        for reparacion in reparaciones or ["json_valido"]:
+            metricas_reparacion[reparacion] += 1
+        return objeto
+
+    metricas_reparacion["fallidas"] += 1
+    return None
@@ -1,21 +1,77 @@
+from typing import AsyncIterator
+
+from pydantic import BaseModel
+
 from app.core.config import settings
-from google import genai
 from google.genai import types
+from app.services.ia.cache_service import CacheRespuestas, cache_respuestas
+from app.services.ia.cliente_ia import PROVEEDORES_GEMINI, crear_cliente
 
 # Configuración de Gemini:
-client = genai.Client()
+client = crear_cliente()
+
+MODELO_TEXTO = "gemini-2.5-flash"
+
+# Tokens consumidos por este proceso (las respuestas servidas desde cache no cuentan)
+uso_tokens = {
+    "llamadas": 0,
+    "tokens_prompt": 0,
+    "tokens_respuesta": 0,
+    "tokens_total": 0,
+}
+
+
+def _registrar_uso(uso) -> None:
+    uso_tokens["llamadas"] += 1
+    if uso is None:
+        return
+    uso_tokens["tokens_prompt"] += uso.prompt_token_count or 0
+    uso_tokens["tokens_respuesta"] += uso.candidates_token_count or 0
+    uso_tokens["tokens_total"] += uso.total_token_count or 0
+
+
+def _clave_cache(prompt: str, instrucciones: str) -> str:
+    return CacheRespuestas.clave(MODELO_TEXTO, instrucciones, prompt)
+
 
+def _configuracion(instrucciones: str, esquema: type[BaseModel] | None) -> types.GenerateContentConfig:
+    if esquema is None:
+        return types.GenerateContentConfig(system_instruction=instrucciones)
+
+    # Salida estructurada: Gemini solo puede responder JSON con esta forma
+    return types.GenerateContentConfig(
+        system_instruction=instrucciones,
+        response_mime_type="application/json",
+        response_schema=esquema,
+    )
+
+
+async def invalidar_cache(prompt: str, instrucciones: str) -> None:
+    """Descarta una respuesta cacheada (por ejemplo, si no era JSON válido)."""
+    await cache_respuestas.invalidar(_clave_cache(prompt, instrucciones))
+
+
+async def __generar_con_gemini(
+    prompt: str, instrucciones: str, usar_cache: bool, esquema: type[BaseModel] | None
+) -> str:
+    clave = _clave_cache(prompt, instrucciones)
+    if usar_cache:
+        cacheado = await cache_respuestas.obtener(clave)
+        if cacheado is not None:
+            return cacheado
 
-def __generar_con_gemini(prompt: str, instrucciones: str) -> str:
     try:
-        respuesta = client.models.generate_content(
-            model="gemini-2.5-flash",
-            config=types.GenerateContentConfig(
-                system_instruction=instrucciones
-            ),
+        # Cliente asíncrono del SDK: no ocupa un hilo mientras espera a Gemini
+        respuesta = await client.aio.models.generate_content(
+            model=MODELO_TEXTO,
+            config=_configuracion(instrucciones, esquema),
             contents=prompt
         )
+        _registrar_uso(getattr(respuesta, "usage_metadata", None))
+
         if respuesta and respuesta.text:
+            if settings.IA_CACHE_HABILITADO:
+                await cache_respuestas.guardar(clave, respuesta.text)
             return respuesta.text
         else:
             return "No se pudo obtener una respuesta desde GEMINI"
@@ -24,13 +80,70 @@ def __generar_con_gemini(prompt: str, instrucciones: str) -> str:
         raise
 
 
-def generar_contenido(prompt: str, instrucciones: str) -> str:
+async def generar_contenido(
+    prompt: str,
+    instrucciones: str,
+    usar_cache: bool = True,
+    esquema: type[BaseModel] | None = None,
+) -> str:
+    provider = settings.AI_PROVIDER
+
+    if provider in PROVEEDORES_GEMINI:
+        return await __generar_con_gemini(
+            prompt, instrucciones, usar_cache and settings.IA_CACHE_HABILITADO, esquema
+        )
+    elif provider == "openai":
+        raise NotImplementedError("El proveedor OpenAI aún no está implementado")
+    else:
+        raise ValueError(f"Proveedor de IA desconocido: {provider}")
+
+
+async def __generar_stream_con_gemini(
+    prompt: str, instrucciones: str, usar_cache: bool, esquema: type[BaseModel] | None
+) -> AsyncIterator[str]:
+    clave = _clave_cache(prompt, instrucciones)
+    if usar_cache:
+        cacheado = await cache_respuestas.obtener(clave)
+        if cacheado is not None:
+            yield cacheado
+            return
+
+    try:
+        fragmentos = await client.aio.models.generate_content_stream(
+            model=MODELO_TEXTO,
+            config=_configuracion(instrucciones, esquema),
+            contents=prompt
+        )
+        texto_completo = ""
+        uso = None
+        async for fragmento in fragmentos:
+            uso = getattr(fragmento, "usage_metadata", None) or uso
+            if fragmento.text:
+                texto_completo += fragmento.text
+                yield fragmento.text
+        _registrar_uso(uso)
+    except Exception as e:
+        print(f"Error al generar contenido (stream) con Gemini: {e}")
+        raise
+
+    if texto_completo and settings.IA_CACHE_HABILITADO:
+        await cache_respuestas.guardar(clave, texto_completo)
+
+
+def generar_contenido_stream(
+    prompt: str,
+    instrucciones: str,
+    usar_cache: bool = True,
+    esquema: type[BaseModel] | None = None,
+) -> AsyncIterator[str]:
+    """Igual que `generar_contenido`, pero retorna el texto a medida que llega."""
     provider = settings.AI_PROVIDER
 
-    if provider == "gemini":
-        return __generar_con_gemini(prompt, instrucciones)
+    if provider in PROVEEDORES_GEMINI:
+        return __generar_stream_con_gemini(
+            prompt, instrucciones, usar_cache and settings.IA_CACHE_HABILITADO, esquema
+        )
     elif provider == "openai":
         raise NotImplementedError("El proveedor OpenAI aún no está implementado")
     else:
         raise ValueError(f"Proveedor de IA desconocido: {provider}")
-        
\ No newline at end of file
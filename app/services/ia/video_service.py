@@ -1,92 +1,143 @@
-import os
 import time
-import base64
-from typing import Optional
+from typing import Any, Optional
 
 from app.core.config import settings
-from google import genai
 from google.genai import types
+from app.services.ia.cliente_ia import PROVEEDORES_GEMINI, crear_cliente
+from app.services.ia.media_service import almacen_media
 
 # Configuración de Gemini:
-client = genai.Client()
+client = crear_cliente()
 
-VIDEOS_DIR = "app/static/videos/"
+MODELO_VIDEO = "veo-3.1-fast-generate-preview"
+
+
+def _validar_proveedor() -> None:
+    provider = settings.AI_PROVIDER
+
+    if provider in PROVEEDORES_GEMINI:
+        return
+    elif provider == "openai":
+        raise NotImplementedError("El proveedor OpenAI aún no está implementado para generación de videos")
+    else:
+        raise ValueError(f"Proveedor de IA desconocido: {provider}")
+
+
+def iniciar_generacion_video(
+    prompt: str,
+    duration_seconds: int = 4,
+    aspect_ratio: str = "9:16",
+) -> Any:
+    """Lanza la operación de Veo y la retorna sin esperar a que termine."""
+    _validar_proveedor()
+
+    config_params = {
+        "aspect_ratio": aspect_ratio,
+        "number_of_videos": 1,
+        "duration_seconds": duration_seconds
+    }
+
+    return client.models.generate_videos(
+        # model="veo-3.1-generate-preview",
+        model=MODELO_VIDEO,
+        prompt=prompt,
+        config=types.GenerateVideosConfig(**config_params),
+    )
+
+
+def _respuesta(prompt: str, guardado: dict) -> dict:
+    return {
+        "url_video": guardado["url"],
+        "prompt": prompt,
+        "ruta_completa": guardado["ruta"],
+        "archivo_id": guardado["archivo_id"],
+        "reutilizado": guardado["reutilizado"],
+    }
+
+
+def buscar_video_existente(
+    prompt: str,
+    duration_seconds: int = 4,
+    aspect_ratio: str = "9:16",
+) -> Optional[dict]:
+    """Retorna un video ya generado con el mismo prompt y parámetros, si existe."""
+    existente = almacen_media.buscar_por_prompt(
+        "video", prompt,
+        modelo=MODELO_VIDEO, duration_seconds=duration_seconds, aspect_ratio=aspect_ratio,
+    )
+    return _respuesta(prompt, existente) if existente else None
+
+
+def consultar_operacion(operation: Any) -> Any:
+    """Consulta una sola vez el estado de la operación."""
+    return client.operations.get(operation)
+
+
+def guardar_video(
+    operation: Any,
+    prompt: str,
+    duration_seconds: int = 4,
+    aspect_ratio: str = "9:16",
+) -> dict:
+    """Descarga y guarda el video de una operación ya terminada."""
+    if operation.error:
+        raise Exception(f"La generación del video falló: {operation.error}")
+
+    if operation.response and operation.response.generated_videos:
+        video = operation.response.generated_videos[0]
+
+        if not video.video:
+            raise Exception("No se pudo obtener el archivo de video")
+
+        # Descargar y guardar el video con nombre por hash del contenido
+        video_bytes = client.files.download(file=video.video)
+        guardado = almacen_media.guardar(
+            video_bytes, "video", prompt,
+            modelo=MODELO_VIDEO, duration_seconds=duration_seconds, aspect_ratio=aspect_ratio,
+        )
+
+        print(f"Video generado y guardado en: {guardado['ruta']}")
+
+        return _respuesta(prompt, guardado)
+    else:
+        raise Exception("No se pudo generar el video")
 
 
 def __generar_video_con_gemini(
-    prompt: str, 
+    prompt: str,
     duration_seconds: int = 4,
     aspect_ratio: str = "9:16",
 ) -> dict:
-    
+
     try:
-        config_params = {
-            "aspect_ratio": aspect_ratio,
-            "number_of_videos": 1,
-            "duration_seconds": duration_seconds
-        }
-        
+        existente = buscar_video_existente(prompt, duration_seconds, aspect_ratio)
+        if existente:
+            return existente
+
         # Generar el video
-        operation = client.models.generate_videos(
-            # model="veo-3.1-generate-preview",
-            model="veo-3.1-fast-generate-preview",
-            prompt=prompt,
-            config=types.GenerateVideosConfig(**config_params),
-        )
-        
+        operation = iniciar_generacion_video(prompt, duration_seconds, aspect_ratio)
+
         # Poll del estado de la operación hasta que el video esté listo
         while not operation.done:
             print("Esperando a que se complete la generación del video...")
-            time.sleep(10)
-            operation = client.operations.get(operation)
-        
-        # Obtener el video generado
-        if operation.response and operation.response.generated_videos:
-            video = operation.response.generated_videos[0]
-            
-            # Crear directorio si no existe
-            os.makedirs(VIDEOS_DIR, exist_ok=True)
-            
-            # Generar nombre único para el video
-            nombre_video = f"video_{hash(prompt)}_{int(time.time())}.mp4"
-            ruta_video = os.path.join(VIDEOS_DIR, nombre_video)
-            
-            # Descargar y guardar el video
-            if video.video:
-                client.files.download(file=video.video)
-                video.video.save(ruta_video)
-            else:
-                raise Exception("No se pudo obtener el archivo de video")
-            
-            url_video = f"static/videos/{nombre_video}"
-            
-            print(f"Video generado y guardado en: {ruta_video}")
-            
-            return {
-                "url_video": url_video,
-                "prompt": prompt,
-                "ruta_completa": ruta_video
-            }
-        else:
-            raise Exception("No se pudo generar el video")
-            
+            time.sleep(settings.VIDEO_INTERVALO_CONSULTA)
+            operation = consultar_operacion(operation)
+
+        return guardar_video(operation, prompt, duration_seconds, aspect_ratio)
+
     except Exception as e:
         print(f"Error al generar video con Gemini: {e}")
         raise
 
 
 def generar_video(
-    prompt: str, 
+    prompt: str,
     duration_seconds: int = 5,
     aspect_ratio: str = "16:9",
 ) -> dict:
-    
-    provider = settings.AI_PROVIDER
-
-    if provider == "gemini":
-        return __generar_video_con_gemini(prompt, duration_seconds, aspect_ratio)
-        # return __generar_video_con_gemini(prompt)
-    elif provider == "openai":
-        raise NotImplementedError("El proveedor OpenAI aún no está implementado para generación de videos")
-    else:
-        raise ValueError(f"Proveedor de IA desconocido: {provider}")
+    """
+    Versión bloqueante: espera a que termine la operación.
+    Las rutas HTTP deben usar la cola de `trabajo_service` en su lugar.
+    """
+    _validar_proveedor()
+    return __generar_video_con_gemini(prompt, duration_seconds, aspect_ratio)
@@ -1,68 +1,170 @@
-import requests
+import asyncio
+import time
+import httpx
 from app.core.config import Settings
+from app.core.http_client import ClienteHttp, cliente_http
+from app.core.reintentos import cabeceras_reintento
+from app.schemas.publicar_instagram_schema import MAX_IMAGENES_CARRUSEL
 from fastapi import HTTPException
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 settings = Settings()
 
-
 class InstagramService:
 
-    def __init__(self):
+    def __init__(self, http: ClienteHttp = cliente_http):
+        self.http = http
         self.api_url: str | None = settings.INSTAGRAM_API_URL
         self.token: str | None = settings.INSTAGRAM_TOKEN
         self.id_pagina: str = getattr(settings, "INSTAGRAM_ID_CUENTA", "me")
 
-    def realizar_peticion(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    async def realizar_peticion(self, endpoint: str, data: Dict[str, Any], metodo: str = "POST") -> Dict[str, Any]:
         url = f"{self.api_url}/{endpoint}"
         headers = {
             "Authorization": f"Bearer {self.token}"
         }
+        # GET lleva los datos en la query string
+        datos = {"params": data} if metodo == "GET" else {"data": data}
 
         try:
-            respuesta = requests.post(url, data=data, headers=headers)
+            respuesta = await self.http.solicitar(metodo, url, headers=headers, red="instagram", **datos)
             respuesta.raise_for_status()
             return respuesta.json()
 
-        except requests.exceptions.RequestException as e:
-            status_code = (
-                e.response.status_code
-                if hasattr(e, "response") and e.response is not None
-                else 500
-            )
+        except httpx.HTTPStatusError as e:
+            # Se conserva el Retry-After / límite de uso para saber cuándo reintentar
             raise HTTPException(
-                status_code=status_code,
+                status_code=e.response.status_code,
                 detail=f"Error al publicar en Instagram: {e}",
-            )
+                headers=cabeceras_reintento(e.response),
+            ) from e
+        except httpx.HTTPError as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error al publicar en Instagram: {str(e) or type(e).__name__}",
+            ) from e
             
             
-    def __crear_contenedor_media(self, image_url: str, caption: str | None = None) -> str:
+    async def __crear_contenedor_media(
+        self, image_url: str | None = None, caption: str | None = None, **extra: Any
+    ) -> str:
         endpoint = f"{self.id_pagina}/media"
-        datos = {"image_url": image_url, "access_token": self.token}
+        datos = {"access_token": self.token, **extra}
         
+        if image_url:
+            datos["image_url"] = image_url
         if caption:
             datos["caption"] = caption
 
-        respuesta = self.realizar_peticion(endpoint, datos)
+        respuesta = await self.realizar_peticion(endpoint, datos)
         creation_id = respuesta.get('id')
         if not creation_id:
             raise HTTPException(status_code=500, detail="No se recibió ID del contenedor de Instagram")
         return creation_id
 
 
-    def __publicar_contenedor(self, creation_id: str) -> Dict[str, Any]:
+    async def esperar_contenedor(self, creation_id: str) -> None:
+        """
+        Espera a que Instagram termine de procesar el contenedor (status_code
+        FINISHED), consultando con backoff exponencial hasta INSTAGRAM_ESTADO_MAX_SEG.
+        """
+        intervalo = settings.INSTAGRAM_ESTADO_INTERVALO
+        limite = time.monotonic() + settings.INSTAGRAM_ESTADO_MAX_SEG
+
+        while True:
+            respuesta = await self.realizar_peticion(
+                creation_id, {"fields": "status_code", "access_token": self.token}, metodo="GET"
+            )
+            estado = respuesta.get("status_code")
+
+            if estado in ("FINISHED", "PUBLISHED"):
+                return
+            if estado in ("ERROR", "EXPIRED"):
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Instagram no pudo procesar el contenedor {creation_id}: {estado}",
+                )
+            if time.monotonic() + intervalo > limite:
+                raise HTTPException(
+                    status_code=504,
+                    detail=f"El contenedor {creation_id} de Instagram no estuvo listo a tiempo ({estado})",
+                )
+
+            await asyncio.sleep(intervalo)
+            intervalo = min(intervalo * 2, settings.INSTAGRAM_ESTADO_INTERVALO_MAX)
+
+
+    async def __crear_contenedor_listo(self, image_url: str | None = None, caption: str | None = None, **extra: Any) -> str:
+        creation_id = await self.__crear_contenedor_media(image_url, caption, **extra)
+        await self.esperar_contenedor(creation_id)
+        return creation_id
+
+
+    async def preparar_publicacion(self, urls_img: List[str], texto: str | None = None) -> str:
+        """
+        Crea el contenedor listo para publicar y retorna su `creation_id`.
+        Con varias imágenes arma un carrusel: los contenedores hijos se crean
+        y procesan en paralelo, y el carrusel se crea cuando todos están listos.
+        """
+        if not urls_img:
+            raise HTTPException(status_code=400, detail="Se requiere al menos una imagen")
+        if len(urls_img) > MAX_IMAGENES_CARRUSEL:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Un carrusel admite hasta {MAX_IMAGENES_CARRUSEL} imágenes",
+            )
+
+        if len(urls_img) == 1:
+            return await self.__crear_contenedor_listo(urls_img[0], texto)
+
+        hijos = await asyncio.gather(*(
+            self.__crear_contenedor_listo(url, is_carousel_item="true") for url in urls_img
+        ))
+        return await self.__crear_contenedor_listo(
+            caption=texto, media_type="CAROUSEL", children=",".join(hijos)
+        )
+
+
+    async def preparar_lote(
+        self, publicaciones: List[Tuple[List[str], str | None]]
+    ) -> List[Dict[str, Optional[str]]]:
+        """
+        Prepara en paralelo los contenedores de varias publicaciones, p. ej.
+        antes de su hora programada, para que después publicar sea una sola
+        llamada por post. Retorna `creation_id` o `error` por publicación,
+        en el mismo orden.
+        """
+        semaforo = asyncio.Semaphore(settings.INSTAGRAM_LOTE_CONCURRENCIA)
+
+        async def preparar(urls_img: List[str], texto: str | None) -> Dict[str, Optional[str]]:
+            async with semaforo:
+                try:
+                    return {"creation_id": await self.preparar_publicacion(urls_img, texto), "error": None}
+                except HTTPException as e:
+                    return {"creation_id": None, "error": str(e.detail)}
+
+        return await asyncio.gather(*(preparar(urls, texto) for urls, texto in publicaciones))
+
+
+    async def publicar_preparado(self, creation_id: str) -> Dict[str, Any]:
+        """Publica un contenedor ya listo (ver `preparar_publicacion`)."""
         endpoint = f"{self.id_pagina}/media_publish"
         datos = {
             "creation_id": creation_id,
             "access_token": self.token
         }
 
-        return self.realizar_peticion(endpoint, datos)
+        return await self.realizar_peticion(endpoint, datos)
 
     
-    def publicar_post(self, url_img: str, texto: str | None = None) -> Dict[str, Any]:
-        creation_id = self.__crear_contenedor_media(url_img, texto)
-        return self.__publicar_contenedor(creation_id)
+    async def publicar_post(self, url_img: str, texto: str | None = None) -> Dict[str, Any]:
+        creation_id = await self.preparar_publicacion([url_img], texto)
+        return await self.publicar_preparado(creation_id)
+
+
+    async def publicar_carrusel(self, urls_img: List[str], texto: str | None = None) -> Dict[str, Any]:
+        creation_id = await self.preparar_publicacion(urls_img, texto)
+        return await self.publicar_preparado(creation_id)
 
 
-instagram_service = InstagramService()
\ No newline at end of file
+instagram_service = InstagramService()
@@ -1,11 +1,12 @@
-import requests
-import os
-from urllib.parse import urlparse
+import httpx
+from app.core.archivos import abrir_fuente
 from app.core.config import settings
+from app.core.http_client import ClienteHttp, cliente_http
 
 
 class LinkedInService:
-    def __init__(self):
+    def __init__(self, http: ClienteHttp = cliente_http):
+        self.http = http
         self.token = settings.LINKEDIN_TOKEN
         self.subscriber = settings.LINKEDIN_SUBSCRIBER
         self.api_url = settings.LINKEDIN_API_URL
@@ -16,7 +17,7 @@ class LinkedInService:
         }
     
     
-    def __registrar_subida_imagen(self):
+    async def __registrar_subida_imagen(self):
         """Paso 1. Obtener el uploadUrl y asset"""
         url = f"{self.api_url}/assets?action=registerUpload"
         
@@ -35,7 +36,7 @@ class LinkedInService:
             }
         }
         
-        respuesta = requests.post(url, json=body, headers=self.headers)
+        respuesta = await self.http.post(url, json=body, headers=self.headers, red="linkedin")
         respuesta.raise_for_status()
         
         data = respuesta.json()
@@ -48,35 +49,24 @@ class LinkedInService:
         }
     
     
-    def __subir_imagen(self, upload_url: str, image_path: str):
+    async def __subir_imagen(self, upload_url: str, image_path: str):
         """ Paso 2: Subir el archivo binario de la imagen a LinkedIn """
         
-        # Verificar si es una URL completa o una ruta local
-        parsed_url = urlparse(image_path)
-        if parsed_url.scheme in ['http', 'https']:
-            # Es una URL completa, descargar la imagen
-            response = requests.get(image_path)
-            response.raise_for_status()
-            image_data = response.content
-        else:
-            # Es una ruta local, leer desde el archivo
-            if not os.path.exists(image_path):
-                raise FileNotFoundError(f"La imagen no existe en la ruta: {image_path}")
+        # Archivo local o URL: se envía por partes a medida que se lee o descarga,
+        # sin cargar la imagen entera en memoria
+        async with abrir_fuente(image_path, self.http) as (tamano, partes):
+            headers = {
+                "Authorization": f"Bearer {self.token}",
+                "Content-Length": str(tamano),
+            }
             
-            with open(image_path, 'rb') as image_file:
-                image_data = image_file.read()
-        
-        headers = {
-            "Authorization": f"Bearer {self.token}"
-        }
-        
-        respuesta = requests.post(upload_url, data=image_data, headers=headers)
-        respuesta.raise_for_status()
+            respuesta = await self.http.post(upload_url, content=partes, headers=headers)
+            respuesta.raise_for_status()
         
         return respuesta.status_code == 201
     
     
-    def __crear_publicacion(self, asset: str, texto: str):
+    async def __crear_publicacion(self, asset: str, texto: str):
         """ Paso 3: Crear la publicacion con la imagen """
         
         url = f"{self.api_url}/ugcPosts"
@@ -106,7 +96,7 @@ class LinkedInService:
             }
         }
         
-        respuesta = requests.post(url, json=body, headers=self.headers)
+        respuesta = await self.http.post(url, json=body, headers=self.headers, red="linkedin")
         respuesta.raise_for_status()
         
         # El ID del post creado viene en el header X-RestLi-Id
@@ -119,20 +109,27 @@ class LinkedInService:
         }
     
     
-    def publicar_imagen(self, imagen_ruta: str, texto: str):
+    async def publicar(self, imagen_ruta: str, texto: str):
+        """
+        Orquesta todo el proceso de publicación. Los errores se propagan
+        (`httpx.HTTPStatusError` con la respuesta de LinkedIn) para que quien
+        llama decida si reintentar.
+        """
+        registro = await self.__registrar_subida_imagen()
+        upload_url = registro["upload_url"]
+        asset = registro["asset"]
+        
+        await self.__subir_imagen(upload_url, imagen_ruta)
+        
+        return await self.__crear_publicacion(asset, texto)
+    
+    
+    async def publicar_imagen(self, imagen_ruta: str, texto: str):
         """  Método principal que orquesta todo el proceso de publicación """
         try:
-            registro = self.__registrar_subida_imagen()
-            upload_url = registro["upload_url"]
-            asset = registro["asset"]
-            
-            self.__subir_imagen(upload_url, imagen_ruta)
-            
-            respuesta = self.__crear_publicacion(asset, texto)
-            
-            return respuesta
+            return await self.publicar(imagen_ruta, texto)
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             return {
                 "status": "error",
                 "message": f"Error al publicar en LinkedIn: {str(e)}"
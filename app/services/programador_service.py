@@ -0,0 +1,271 @@
+import asyncio
+import heapq
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlmodel import Session
+
+from app.controllers.contenido_controller import ContenidoController
+from app.core.config import settings
+from app.core.database import engine
+from app.models.modelos import Contenido
+from app.services.bandeja_salida_service import bandeja_salida
+from app.services.instagram_service import instagram_service
+from app.services.publicacion_service import REDES_SOPORTADAS
+
+
+def _momento(fecha: datetime) -> float:
+    # Postgres devuelve la fecha sin zona horaria: se guarda en UTC
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return fecha.timestamp()
+
+
+def parametros_publicacion(red: str, texto: str, url: str) -> Dict[str, Any]:
+    """Argumentos del servicio de cada red para publicar un contenido (como en /publicar/*)."""
+    if red == "facebook":
+        return {"texto": texto, "url_img": url}
+    if red == "instagram":
+        return {"texto": texto, "url_img": url}
+    if red == "linkedin":
+        return {"imagen_ruta": url, "texto": texto}
+    if red == "whatsapp":
+        return {"imagen_url": url, "texto": texto}
+    return {"texto": texto, "video_url": url}
+
+
+class CandadoLider:
+    """
+    Elección de líder con un advisory lock de Postgres a nivel de sesión.
+
+    El worker que obtiene el lock lo conserva mientras su conexión siga
+    abierta (ocupa una conexión del pool); si el proceso muere Postgres lo
+    libera y otro worker lo toma en su siguiente intento. Con otra base
+    (SQLite en desarrollo) el proceso siempre es líder.
+    """
+
+    def __init__(self, clave: int):
+        self.clave = clave
+        self._conexion: Optional[Connection] = None
+
+    def intentar(self) -> bool:
+        if engine.dialect.name != "postgresql":
+            return True
+
+        if self._conexion is not None:
+            try:
+                self._conexion.execute(text("SELECT 1"))
+                return True
+            except Exception as e:
+                # Se perdió la conexión y con ella el lock
+                print(f"Programador: se perdió el liderazgo ({e})")
+                self.liberar()
+
+        # AUTOCOMMIT: la conexión no queda "idle in transaction" mientras se tiene el lock
+        conexion = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            obtenido = conexion.execute(
+                text("SELECT pg_try_advisory_lock(:clave)"), {"clave": self.clave}
+            ).scalar()
+        except Exception:
+            conexion.close()
+            raise
+
+        if obtenido:
+            print("Programador: este worker es el líder")
+            self._conexion = conexion
+            return True
+        conexion.close()
+        return False
+
+    def liberar(self) -> None:
+        if self._conexion is None:
+            return
+        try:
+            self._conexion.execute(text("SELECT pg_advisory_unlock(:clave)"), {"clave": self.clave})
+        except Exception:
+            pass
+        finally:
+            self._conexion.close()
+            self._conexion = None
+
+
+@dataclass
+class Programado:
+    contenido_id: int
+    momento: float  # epoch de fecha_publicacion
+    red: str
+    parametros: Dict[str, Any]
+    # Contenedor de Instagram preparado por adelantado: publicar es una sola llamada
+    creation_id: Optional[str] = None
+
+
+class Programador:
+    """
+    Publica los `Contenido` sin publicar cuando llega su `fecha_publicacion`.
+
+    Cada PROGRAMADOR_INTERVALO se leen de la base los que vencen dentro de
+    PROGRAMADOR_HORIZONTE y se ordenan en un heap por fecha; el bucle duerme
+    hasta el próximo vencimiento y encola juntos en la bandeja de salida
+    todos los que vencieron (clave de idempotencia `contenido-<id>`), que
+    los envía en paralelo por red. Con varios workers solo dispara el que
+    tiene el advisory lock de Postgres.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int]] = []
+        self._programados: Dict[int, Programado] = {}
+        self._lider = CandadoLider(settings.PROGRAMADOR_CLAVE_LIDER)
+        self._es_lider = False
+        self._ultima_lectura = float("-inf")
+        self._preparaciones: Set[asyncio.Task] = set()
+        self._semaforo_preparacion = asyncio.Semaphore(settings.INSTAGRAM_LOTE_CONCURRENCIA)
+        self._tarea: Optional[asyncio.Task] = None
+
+    def iniciar(self) -> None:
+        if self._tarea is None or self._tarea.done():
+            self._tarea = asyncio.create_task(self._bucle())
+
+    async def detener(self) -> None:
+        tareas = [self._tarea, *self._preparaciones] if self._tarea else list(self._preparaciones)
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+        self._tarea = None
+        await asyncio.to_thread(self._lider.liberar)
+
+    def estado(self) -> Dict[str, Any]:
+        # El heap conserva entradas obsoletas (fecha movida o ya encolados): se saltean como al disparar
+        proximo = min(
+            (momento for momento, contenido_id in self._heap if self._vigente_en_heap(momento, contenido_id)),
+            default=None,
+        )
+        return {
+            "lider": self._es_lider,
+            "programados": len(self._programados),
+            "instagram_preparados": sum(1 for p in self._programados.values() if p.creation_id),
+            "proxima_publicacion": datetime.fromtimestamp(proximo, timezone.utc) if proximo is not None else None,
+        }
+
+    async def _bucle(self) -> None:
+        while True:
+            try:
+                self._es_lider = await asyncio.to_thread(self._lider.intentar)
+                if self._es_lider:
+                    if time.monotonic() - self._ultima_lectura >= settings.PROGRAMADOR_INTERVALO:
+                        await self._cargar()
+                    await self._disparar_vencidos()
+                else:
+                    self._heap.clear()
+                    self._programados.clear()
+                    self._ultima_lectura = float("-inf")
+            except Exception as e:
+                print(f"Error en el programador de publicaciones: {e}")
+
+            await asyncio.sleep(self._espera())
+
+    def _espera(self) -> float:
+        if not self._es_lider:
+            return settings.PROGRAMADOR_INTERVALO
+        hasta_lectura = settings.PROGRAMADOR_INTERVALO - (time.monotonic() - self._ultima_lectura)
+        if not self._heap:
+            return max(0.0, hasta_lectura)
+        return max(0.0, min(self._heap[0][0] - time.time(), hasta_lectura))
+
+    async def _cargar(self) -> None:
+        self._ultima_lectura = time.monotonic()
+        hasta = datetime.now(timezone.utc) + timedelta(seconds=settings.PROGRAMADOR_HORIZONTE)
+        contenidos = await asyncio.to_thread(self._leer_programados, hasta)
+
+        for contenido in contenidos:
+            red = contenido.redsocial.nombre.lower()
+            if red not in REDES_SOPORTADAS:
+                continue
+
+            programado = Programado(
+                contenido_id=contenido.id,  # type: ignore[arg-type]
+                momento=_momento(contenido.fecha_publicacion),  # type: ignore[arg-type]
+                red=red,
+                parametros=parametros_publicacion(red, contenido.descripcion, contenido.archivo.url),
+            )
+            actual = self._programados.get(programado.contenido_id)
+            if actual and (actual.momento, actual.parametros) == (programado.momento, programado.parametros):
+                continue
+
+            # Si cambió la fecha, la entrada anterior del heap queda obsoleta y se descarta al salir
+            self._programados[programado.contenido_id] = programado
+            heapq.heappush(self._heap, (programado.momento, programado.contenido_id))
+
+            if red == "instagram" and programado.momento > time.time():
+                tarea = asyncio.create_task(self._preparar_instagram(programado))
+                self._preparaciones.add(tarea)
+                tarea.add_done_callback(self._preparaciones.discard)
+
+    async def _preparar_instagram(self, programado: Programado) -> None:
+        try:
+            async with self._semaforo_preparacion:
+                creation_id = await instagram_service.preparar_publicacion(
+                    [programado.parametros["url_img"]], programado.parametros["texto"]
+                )
+        except Exception as e:
+            # Se publicará de la forma habitual
+            print(f"No se pudo preparar el contenedor de Instagram del contenido {programado.contenido_id}: {getattr(e, 'detail', e)}")
+            return
+        programado.creation_id = creation_id
+
+    async def _disparar_vencidos(self) -> None:
+        ahora = time.time()
+        vencidos: List[Programado] = []
+        while self._heap and self._heap[0][0] <= ahora:
+            momento, contenido_id = heapq.heappop(self._heap)
+            if self._vigente_en_heap(momento, contenido_id):
+                vencidos.append(self._programados.pop(contenido_id))
+
+        if vencidos:
+            await asyncio.gather(*(self._disparar(p) for p in vencidos))
+
+    def _vigente_en_heap(self, momento: float, contenido_id: int) -> bool:
+        """La entrada del heap corresponde a lo programado ahora para ese contenido."""
+        programado = self._programados.get(contenido_id)
+        return programado is not None and programado.momento == momento
+
+    async def _disparar(self, programado: Programado) -> None:
+        try:
+            if not await asyncio.to_thread(self._vigente, programado):
+                return
+
+            parametros = (
+                {"creation_id": programado.creation_id} if programado.creation_id else programado.parametros
+            )
+            envio, _ = await bandeja_salida.encolar(
+                programado.red, parametros, f"contenido-{programado.contenido_id}", programado.contenido_id
+            )
+            retraso = time.time() - programado.momento
+            print(f"Programador: contenido {programado.contenido_id} encolado en {programado.red} (envío {envio.id}, {retraso:.2f}s tarde)")
+        except Exception as e:
+            # Sigue sin encolar: se vuelve a leer en la próxima lectura de la base
+            print(f"Programador: no se pudo encolar el contenido {programado.contenido_id}: {e}")
+
+    @staticmethod
+    def _leer_programados(hasta: datetime) -> List[Contenido]:
+        with Session(engine) as session:
+            return ContenidoController.obtener_contenidos_programados(session, hasta, settings.PROGRAMADOR_LOTE)
+
+    @staticmethod
+    def _vigente(programado: Programado) -> bool:
+        """El contenido sigue sin publicar y con la misma fecha que cuando se programó."""
+        with Session(engine) as session:
+            contenido = ContenidoController.obtener_contenido_por_id(session, programado.contenido_id)
+            return (
+                contenido is not None
+                and not contenido.publicado
+                and contenido.fecha_publicacion is not None
+                and _momento(contenido.fecha_publicacion) == programado.momento
+            )
+
+
+programador = Programador()
@@ -0,0 +1,232 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app.controllers.archivo_controller import ArchivoController
+from app.controllers.redsocial_controller import RedsocialController
+from app.core.config import settings
+from app.core.database import engine
+from app.models.modelos import Archivo, Contenido, Redsocial, Tema
+from app.schemas.publicar_multi_schema import PublicarMultiRequest
+from app.services.facebook_service import facebook_service
+from app.services.instagram_service import instagram_service
+from app.services.linkedin_service import linkedin_service
+from app.services.tiktok_post_service import tiktok_post_service
+from app.services.tiktok_seguimiento_service import enlace_pendiente, seguimiento_tiktok
+from app.services.whatsapp_service import whatsapp_service
+
+# red -> nombre con el que se registra en la tabla Redsocial si aún no existe
+REDES_SOPORTADAS = {
+    "facebook": "Facebook",
+    "instagram": "Instagram",
+    "linkedin": "LinkedIn",
+    "whatsapp": "WhatsApp",
+    "tiktok": "TikTok",
+}
+
+# Media que necesita cada red para poder publicar
+MEDIA_REQUERIDA = {
+    "instagram": "imagen_url",
+    "linkedin": "imagen_url",
+    "whatsapp": "imagen_url",
+    "tiktok": "video_url",
+}
+
+
+def enlace_publicacion(red: str, respuesta: Dict[str, Any]) -> Optional[str]:
+    """Enlace (o referencia, si la red no da uno) a lo publicado según la respuesta de la red."""
+    if red == "facebook":
+        post_id = respuesta.get("post_id") or respuesta.get("id")
+        return f"https://www.facebook.com/{post_id}" if post_id else None
+    if red == "linkedin":
+        post_id = respuesta.get("post_id")
+        return f"https://www.linkedin.com/feed/update/{post_id}" if post_id and post_id != "unknown" else None
+    if red == "instagram":
+        media_id = respuesta.get("id")
+        return f"instagram:{media_id}" if media_id else None
+    if red == "tiktok":
+        publish_id = respuesta.get("publish_id")
+        return enlace_pendiente(publish_id) if publish_id else None
+    mensaje_id = respuesta.get("id") or respuesta.get("message_id")
+    return f"whatsapp:{mensaje_id}" if mensaje_id else None
+
+
+class PublicacionService:
+    """
+    Publica un mismo contenido en varias redes a la vez.
+
+    Cada red corre como una tarea independiente con su propio timeout, así una
+    red lenta o caída no retrasa a las demás. Cada resultado (exitoso o no) se
+    guarda como un `Contenido` con su `enlace_publicacion`.
+    """
+
+    async def publicar_multi(self, solicitud: PublicarMultiRequest) -> Dict[str, Any]:
+        redes = self._validar(solicitud)
+        # Antes de publicar: si el tema o el archivo no existen no se podría registrar nada
+        await asyncio.to_thread(self._verificar_referencias, solicitud)
+
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(*(self._publicar_en(red, solicitud) for red in redes))
+        tiempo_total = time.perf_counter() - inicio
+
+        contenidos = await asyncio.to_thread(self._registrar, solicitud, resultados)
+        for resultado, contenido_id in zip(resultados, contenidos):
+            resultado["contenido_id"] = contenido_id
+            # TikTok procesa el video después de subirlo: el resultado final lo registra el seguimiento
+            if resultado["red_social"] == "tiktok" and resultado["estado"] == "publicado":
+                seguimiento_tiktok.registrar(resultado["respuesta"]["publish_id"], contenido_id)
+
+        publicados = sum(1 for r in resultados if r["estado"] == "publicado")
+        return {
+            "resultados": resultados,
+            "publicados": publicados,
+            "fallidos": len(resultados) - publicados,
+            "tiempo_total_ms": round(tiempo_total * 1000, 1),
+        }
+
+    def _validar(self, solicitud: PublicarMultiRequest) -> List[str]:
+        # Sin duplicados y respetando el orden pedido
+        redes = list(dict.fromkeys(red.lower() for red in solicitud.redes_sociales))
+
+        desconocidas = [red for red in redes if red not in REDES_SOPORTADAS]
+        if desconocidas:
+            raise ValueError(f"Redes sociales no soportadas: {', '.join(desconocidas)}")
+
+        for red in redes:
+            campo = MEDIA_REQUERIDA.get(red)
+            if campo and not getattr(solicitud, campo):
+                raise ValueError(f"'{campo}' es requerido para publicar en {red}")
+
+        if solicitud.archivo_id is None and not (solicitud.imagen_url or solicitud.video_url):
+            raise ValueError("Se requiere 'archivo_id', 'imagen_url' o 'video_url' para registrar el contenido")
+
+        return redes
+
+    @staticmethod
+    def _verificar_referencias(solicitud: PublicarMultiRequest) -> None:
+        with Session(engine) as session:
+            if session.get(Tema, solicitud.tema_id) is None:
+                raise ValueError(f"Tema con id {solicitud.tema_id} no existe")
+            if solicitud.archivo_id is not None and session.get(Archivo, solicitud.archivo_id) is None:
+                raise ValueError(f"Archivo con id {solicitud.archivo_id} no existe")
+
+    async def _publicar_en(self, red: str, solicitud: PublicarMultiRequest) -> Dict[str, Any]:
+        timeout = settings.PUBLICACION_TIMEOUT_VIDEO if red == "tiktok" else settings.PUBLICACION_TIMEOUT
+        resultado: Dict[str, Any] = {"red_social": red, "texto": self._texto(red, solicitud)}
+
+        inicio = time.perf_counter()
+        try:
+            respuesta = await asyncio.wait_for(self._llamar_red(red, solicitud), timeout)
+            error = self._error_en_respuesta(respuesta)
+            if error:
+                raise Exception(error)
+
+            resultado.update(
+                estado="publicado",
+                respuesta=respuesta,
+                enlace_publicacion=enlace_publicacion(red, respuesta),
+            )
+        except asyncio.TimeoutError:
+            resultado.update(estado="error", error=f"Tiempo de espera agotado ({timeout:g}s)")
+        except HTTPException as e:
+            resultado.update(estado="error", error=str(e.detail))
+        except Exception as e:
+            resultado.update(estado="error", error=str(e))
+
+        resultado["tiempo_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+        print(f"Publicación en {red}: {resultado['estado']} ({resultado['tiempo_ms']} ms)")
+        return resultado
+
+    async def _llamar_red(self, red: str, solicitud: PublicarMultiRequest) -> Dict[str, Any]:
+        texto = self._texto(red, solicitud)
+
+        if red == "facebook":
+            return await facebook_service.publicar_post(texto=texto, url_img=solicitud.imagen_url)
+        if red == "instagram":
+            return await instagram_service.publicar_post(url_img=str(solicitud.imagen_url), texto=texto)
+        if red == "linkedin":
+            return await linkedin_service.publicar_imagen(str(solicitud.imagen_url), texto)
+        if red == "whatsapp":
+            return await whatsapp_service.publicar_historia(imagen_url=str(solicitud.imagen_url), texto=texto)
+        return await tiktok_post_service.publicar_video(texto, str(solicitud.video_url))
+
+    @staticmethod
+    def _texto(red: str, solicitud: PublicarMultiRequest) -> str:
+        return solicitud.textos.get(red) or solicitud.texto
+
+    @staticmethod
+    def _error_en_respuesta(respuesta: Any) -> Optional[str]:
+        """LinkedIn y WhatsApp informan algunos errores en el cuerpo en lugar de lanzar excepción."""
+        if not isinstance(respuesta, dict):
+            return None
+        if respuesta.get("status") == "error":
+            return respuesta.get("message") or "Error al publicar"
+        if respuesta.get("error"):
+            return str(respuesta["error"])
+        return None
+
+    def _registrar(self, solicitud: PublicarMultiRequest, resultados: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Guarda un `Contenido` por red en una sola transacción: o se registran
+        todos o ninguno. Un fallo al registrar no anula la publicación.
+        """
+        try:
+            with Session(engine) as session:
+                archivo_id = self._archivo_id(session, solicitud)
+                redes = {
+                    redsocial.nombre.lower(): redsocial.id
+                    for redsocial in RedsocialController.obtener_todas_redsociales(session)
+                }
+
+                contenidos: List[Contenido] = []
+                for resultado in resultados:
+                    red = resultado["red_social"]
+                    redsocial_id = redes.get(red)
+                    if redsocial_id is None:
+                        redsocial = Redsocial(nombre=REDES_SOPORTADAS[red])
+                        session.add(redsocial)
+                        session.flush()
+                        redsocial_id = redes[red] = redsocial.id
+
+                    publicado = resultado["estado"] == "publicado"
+                    contenidos.append(Contenido(
+                        descripcion=resultado["texto"],
+                        tema_id=solicitud.tema_id,
+                        redsocial_id=redsocial_id,
+                        archivo_id=archivo_id,
+                        publicado=publicado,
+                        fecha_publicacion=datetime.now(timezone.utc) if publicado else None,
+                        enlace_publicacion=resultado.get("enlace_publicacion"),
+                    ))
+
+                session.add_all(contenidos)
+                session.flush()
+                ids: List[Optional[int]] = [contenido.id for contenido in contenidos]
+                session.commit()
+                return ids
+        except Exception as e:
+            print(f"No se pudieron registrar las publicaciones en la base de datos: {e}")
+            return [None] * len(resultados)
+
+    @staticmethod
+    def _archivo_id(session: Session, solicitud: PublicarMultiRequest) -> int:
+        """Archivo del contenido; si hay que crearlo queda en la transacción de `_registrar`."""
+        if solicitud.archivo_id is not None:
+            if session.get(Archivo, solicitud.archivo_id) is None:
+                raise ValueError(f"Archivo con id {solicitud.archivo_id} no existe")
+            return solicitud.archivo_id
+
+        url = str(solicitud.video_url or solicitud.imagen_url)
+        archivo = ArchivoController.obtener_archivo_por_url(session, url)
+        if archivo is None:
+            archivo = Archivo(url=url)
+            session.add(archivo)
+            session.flush()
+        return int(archivo.id)  # type: ignore[arg-type]
+
+
+publicacion_service = PublicacionService()
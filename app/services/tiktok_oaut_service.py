@@ -2,11 +2,11 @@ import secrets
 from urllib.parse import urlencode
 from typing import Dict
 
-import httpx
 from fastapi import HTTPException
 from fastapi.responses import RedirectResponse, JSONResponse
 
 from app.core.config import Settings
+from app.core.http_client import ClienteHttp, cliente_http
 
 
 settings = Settings()
@@ -14,7 +14,8 @@ settings = Settings()
 
 class TiktokOauthService:
 
-    def __init__(self):
+    def __init__(self, http: ClienteHttp = cliente_http):
+        self.http = http
         self.client: str = settings.TIKTOK_CLIENT_KEY or ""
         self.secret: str = settings.TIKTOK_CLIENT_SECRET or ""
         self.callback: str = settings.TIKTOK_REDIRECT_URI or ""
@@ -60,8 +61,7 @@ class TiktokOauthService:
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        async with httpx.AsyncClient() as client:
-            respuesta = await client.post(self.token_url, data=data, headers=headers, timeout=20.0)
+        respuesta = await self.http.post(self.token_url, data=data, headers=headers)
 
         if respuesta.status_code != 200:
             raise HTTPException(status_code=500, detail=f"Error al intercambiar el código por token: {respuesta.text}",)
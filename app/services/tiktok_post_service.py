@@ -1,22 +1,72 @@
-import httpx
-from fastapi import HTTPException
-from typing import Dict, Tuple
-from urllib.parse import urlparse
+import asyncio
 import os
+import tempfile
+from fastapi import HTTPException, UploadFile
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
 
+from app.core.archivos import leer_por_partes
 from app.core.config import Settings
+from app.core.http_client import ClienteHttp, cliente_http
+from app.core.reintentos import cabeceras_reintento
 
 settings = Settings()
 
+MB = 1024 * 1024
+
+# Límites de la API de TikTok para FILE_UPLOAD
+CHUNK_MINIMO = 5 * MB
+CHUNK_MAXIMO = 64 * MB
+MAX_CHUNKS = 1000
+
+# Tamaño de cada lectura del disco mientras se envía un chunk
+TAMANO_LECTURA = 1 * MB
+
+
+def calcular_chunks(video_size: int, chunk_deseado: int) -> Tuple[int, int]:
+    """
+    Retorna (chunk_size, total_chunk_count) válidos para TikTok.
+
+    Videos menores a 5 MB o al chunk deseado van en un solo chunk del tamaño
+    del video. En el resto, cada chunk mide entre 5 y 64 MB y el último
+    absorbe los bytes sobrantes (hasta 128 MB).
+    """
+    if video_size < CHUNK_MINIMO:
+        return video_size, 1
+
+    chunk_size = min(max(chunk_deseado, CHUNK_MINIMO), CHUNK_MAXIMO)
+    # Con más de 1000 chunks hay que agrandarlos
+    chunk_size = max(chunk_size, -(-video_size // MAX_CHUNKS))
+    if chunk_size > CHUNK_MAXIMO:
+        raise ValueError(f"El video supera el tamaño máximo admitido por TikTok ({video_size} bytes)")
+    # TikTok rechaza un chunk_size mayor que el video
+    chunk_size = min(chunk_size, video_size)
+
+    # El último chunk queda entre chunk_size y 2 * chunk_size - 1 (<= 128 MB)
+    return chunk_size, max(1, video_size // chunk_size)
+
+
+def rangos_chunks(video_size: int, chunk_size: int, total: int) -> List[Tuple[int, int]]:
+    """Rangos [inicio, fin] (inclusive) de cada chunk; el último llega hasta el final."""
+    rangos = []
+    for indice in range(total):
+        inicio = indice * chunk_size
+        fin = video_size - 1 if indice == total - 1 else inicio + chunk_size - 1
+        rangos.append((inicio, fin))
+    return rangos
+
 
 class TiktokPostService:
 
-    def __init__(self):
+    def __init__(self, http: ClienteHttp = cliente_http):
+        self.http = http
         self.access_token: str | None = settings.TIKTOK_ACCESS_TOKEN
         self.init_url: str = "https://open.tiktokapis.com/v2/post/publish/video/init/"
         self.status_url: str = (
             "https://open.tiktokapis.com/v2/post/publish/status/fetch/"
         )
+        self.chunk_size: int = settings.TIKTOK_CHUNK_MB * MB
+        self.reintentos_chunk: int = settings.TIKTOK_REINTENTOS_CHUNK
 
     def _headers(self) -> Dict[str, str]:
         return {
@@ -24,7 +74,9 @@ class TiktokPostService:
             "Content-Type": "application/json; charset=UTF-8",
         }
 
-    async def _inicializar_subida(self, texto: str, video_size: int) -> Tuple[str, str]:
+    async def _inicializar_subida(
+        self, texto: str, video_size: int, chunk_size: int, total_chunks: int
+    ) -> Tuple[str, str]:
         headers = self._headers()
 
         cuerpo = {
@@ -39,40 +91,64 @@ class TiktokPostService:
             "source_info": {
                 "source": "FILE_UPLOAD",
                 "video_size": video_size,
-                "chunk_size": video_size,
-                "total_chunk_count": 1,
+                "chunk_size": chunk_size,
+                "total_chunk_count": total_chunks,
             },
         }
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            respuesta = await client.post(self.init_url, headers=headers, json=cuerpo)
+        respuesta = await self.http.post(self.init_url, headers=headers, json=cuerpo, red="tiktok")
 
         if respuesta.status_code != 200:
             raise HTTPException(
-                status_code=500,
+                status_code=respuesta.status_code if respuesta.status_code >= 400 else 500,
                 detail=f"Falló la inicialización de la subida: {respuesta.text}",
+                headers=cabeceras_reintento(respuesta),
             )
 
         data = respuesta.json()["data"]
         return data["publish_id"], data["upload_url"]
 
-    async def _subir_video(self, upload_url: str, video_data: bytes, video_size: int) -> bool:
-        """Sube el video al bucket de TikTok."""
+    async def _subir_chunk(self, upload_url: str, ruta: str, inicio: int, fin: int, video_size: int) -> None:
         headers = {
             "Content-Type": "video/mp4",
-            "Content-Range": f"bytes 0-{video_size-1}/{video_size}",
+            "Content-Length": str(fin - inicio + 1),
+            "Content-Range": f"bytes {inicio}-{fin}/{video_size}",
         }
 
-        async with httpx.AsyncClient(timeout=120) as client:
-            respuesta = await client.put(
-                upload_url, headers=headers, content=video_data
-            )
+        respuesta = await self.http.put(
+            upload_url, headers=headers, content=leer_por_partes(ruta, inicio, fin - inicio + 1, TAMANO_LECTURA)
+        )
 
-        if respuesta.status_code not in (200, 201):
+        if respuesta.status_code not in (200, 201, 206):
             raise HTTPException(
                 status_code=500, detail=f"Falló la subida del video: {respuesta.text}"
             )
 
+    async def _subir_video(self, upload_url: str, ruta: str, video_size: int, chunk_size: int, total_chunks: int) -> bool:
+        """
+        Sube el video al bucket de TikTok chunk por chunk, leyendo desde el disco.
+        Si un chunk falla se reintenta desde ese mismo chunk (el último confirmado
+        más uno), sin volver a enviar los anteriores.
+        """
+        rangos = rangos_chunks(video_size, chunk_size, total_chunks)
+        confirmados = 0
+
+        while confirmados < total_chunks:
+            inicio, fin = rangos[confirmados]
+            for intento in range(self.reintentos_chunk + 1):
+                try:
+                    await self._subir_chunk(upload_url, ruta, inicio, fin, video_size)
+                    break
+                except Exception as e:
+                    if intento == self.reintentos_chunk:
+                        raise HTTPException(
+                            status_code=500,
+                            detail=f"Falló la subida del chunk {confirmados + 1}/{total_chunks}: {getattr(e, 'detail', e)}",
+                        )
+                    print(f"Reintentando chunk {confirmados + 1}/{total_chunks} de TikTok: {e}")
+                    await asyncio.sleep(2 ** intento)
+            confirmados += 1
+
         return True
 
 
@@ -81,47 +157,88 @@ class TiktokPostService:
         headers = self._headers()
         cuerpo = {"publish_id": publish_id}
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            respuesta = await client.post(self.status_url, headers=headers, json=cuerpo)
+        respuesta = await self.http.post(self.status_url, headers=headers, json=cuerpo, red="tiktok_estado")
 
         if respuesta.status_code != 200:
             return {"status": "error_check", "details": respuesta.text}
 
         return respuesta.json()
 
+    async def _descargar_a_temporal(self, video_url: str) -> str:
+        """Descarga el video por partes a un archivo temporal (nunca entero en memoria)."""
+        descriptor, ruta = tempfile.mkstemp(prefix="tiktok_", suffix=".mp4")
+        try:
+            with os.fdopen(descriptor, "wb") as destino:
+                async with self.http.cliente.stream(
+                    "GET", video_url, timeout=self.http.timeout_para(video_url)
+                ) as response:
+                    response.raise_for_status()
+                    async for datos in response.aiter_bytes(TAMANO_LECTURA):
+                        await asyncio.to_thread(destino.write, datos)
+        except Exception:
+            os.remove(ruta)
+            raise
+        return ruta
+
+    async def _guardar_upload_temporal(self, archivo: UploadFile) -> str:
+        descriptor, ruta = tempfile.mkstemp(prefix="tiktok_", suffix=".mp4")
+        with os.fdopen(descriptor, "wb") as destino:
+            while datos := await archivo.read(TAMANO_LECTURA):
+                await asyncio.to_thread(destino.write, datos)
+        return ruta
+
 
     async def publicar_video(self, texto: str, video_url: str) -> Dict[str, str | Dict]:
         """Publica un video en TikTok."""
+        temporal = None
+
         # Verificar si es una URL completa o una ruta local
         parsed_url = urlparse(video_url)
         if parsed_url.scheme in ['http', 'https']:
-            # Es una URL completa, descargar el video
-            async with httpx.AsyncClient(timeout=120) as client:
-                response = await client.get(video_url)
-                response.raise_for_status()
-                video_data = response.content
+            # Es una URL completa, se descarga por partes a un archivo temporal
+            temporal = ruta = await self._descargar_a_temporal(video_url)
         else:
-            # Es una ruta local, leer desde el archivo
+            # Es una ruta local, se lee directamente del archivo
             if not os.path.exists(video_url):
                 raise HTTPException(status_code=404, detail=f"El video no existe en la ruta: {video_url}")
-            
-            with open(video_url, 'rb') as video_file:
-                video_data = video_file.read()
-        
-        video_size = len(video_data)
+            ruta = video_url
+
+        try:
+            return await self._publicar_desde_disco(texto, ruta)
+        finally:
+            if temporal:
+                os.remove(temporal)
+
+    async def publicar_archivo(self, texto: str, archivo: UploadFile) -> Dict[str, str | Dict]:
+        """Publica un video recibido como archivo en la petición."""
+        ruta = await self._guardar_upload_temporal(archivo)
+        try:
+            return await self._publicar_desde_disco(texto, ruta)
+        finally:
+            os.remove(ruta)
+
+    async def _publicar_desde_disco(self, texto: str, ruta: str) -> Dict[str, str | Dict]:
+        video_size = os.path.getsize(ruta)
+        if video_size == 0:
+            raise HTTPException(status_code=400, detail="El video está vacío")
+
+        try:
+            chunk_size, total_chunks = calcular_chunks(video_size, self.chunk_size)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         # Inicializar la subida
-        publish_id, upload_url = await self._inicializar_subida(texto, video_size)
+        publish_id, upload_url = await self._inicializar_subida(texto, video_size, chunk_size, total_chunks)
 
         # Subir el video
-        await self._subir_video(upload_url, video_data, video_size)
-
-        # Obtener el estado de la publicación
-        estado_publicacion = await self._obtener_estado_publicacion(publish_id)
+        await self._subir_video(upload_url, ruta, video_size, chunk_size, total_chunks)
 
+        # El estado final lo consulta en segundo plano `seguimiento_tiktok`
         return {
             "estado": "Subido",
             "mensaje": "El video se subió y TikTok lo está procesando.",
             "publish_id": publish_id,
-            "estado_publicacion": estado_publicacion,
         }
+
+
+tiktok_post_service = TiktokPostService()
@@ -0,0 +1,222 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlmodel import Session
+
+from app.controllers.contenido_controller import ContenidoController
+from app.core.config import settings
+from app.core.database import engine
+from app.services.tiktok_post_service import tiktok_post_service
+
+# Estados finales de TikTok (más EXPIRADO: se dejó de consultar sin respuesta final)
+ESTADOS_FINALES = ("PUBLISH_COMPLETE", "SEND_TO_USER_INBOX", "FAILED", "EXPIRADO")
+
+# Marca en Contenido.enlace_publicacion mientras TikTok procesa el video
+PREFIJO_PENDIENTE = "tiktok:"
+
+
+def enlace_pendiente(publish_id: str) -> str:
+    return f"{PREFIJO_PENDIENTE}{publish_id}"
+
+
+@dataclass
+class PublicacionTiktok:
+    publish_id: str
+    contenido_id: Optional[int] = None
+    estado: str = "PROCESSING_UPLOAD"
+    enlace_publicacion: Optional[str] = None
+    error: Optional[str] = None
+    consultas: int = 0
+
+    intervalo: float = field(default_factory=lambda: settings.TIKTOK_ESTADO_INTERVALO)
+    # Justo después de subir TikTok siempre responde "procesando": se espera un intervalo
+    proxima_consulta: float = field(default_factory=lambda: time.monotonic() + settings.TIKTOK_ESTADO_INTERVALO)
+    registrado: float = field(default_factory=time.monotonic)
+
+    create_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    update_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def terminado(self) -> bool:
+        return self.estado in ESTADOS_FINALES
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "publish_id": self.publish_id,
+            "contenido_id": self.contenido_id,
+            "estado": self.estado,
+            "terminado": self.terminado,
+            "enlace_publicacion": self.enlace_publicacion,
+            "error": self.error,
+            "consultas": self.consultas,
+            "create_at": self.create_at,
+            "update_at": self.update_at,
+        }
+
+
+class SeguimientoTiktok:
+    """
+    Sigue en segundo plano el estado de los videos subidos a TikTok.
+
+    Cada `publish_id` se consulta con backoff exponencial (TIKTOK_ESTADO_INTERVALO
+    hasta TIKTOK_ESTADO_INTERVALO_MAX); las consultas que vencen juntas se
+    envían en lotes concurrentes. Al llegar a un estado final se actualiza el
+    `Contenido` con el resultado y el enlace del post.
+    """
+
+    def __init__(self):
+        self._publicaciones: Dict[str, PublicacionTiktok] = {}
+        self._tarea: Optional[asyncio.Task] = None
+        self._despertar = asyncio.Event()
+
+    def registrar(self, publish_id: str, contenido_id: Optional[int] = None) -> PublicacionTiktok:
+        publicacion = self._publicaciones.get(publish_id)
+        if publicacion is None:
+            publicacion = PublicacionTiktok(publish_id=publish_id, contenido_id=contenido_id)
+            self._publicaciones[publish_id] = publicacion
+            self._despertar.set()
+        elif contenido_id is not None:
+            publicacion.contenido_id = contenido_id
+        return publicacion
+
+    def obtener(self, publish_id: str) -> Optional[PublicacionTiktok]:
+        return self._publicaciones.get(publish_id)
+
+    def iniciar(self) -> None:
+        if self._tarea is None or self._tarea.done():
+            self._tarea = asyncio.create_task(self._bucle())
+
+    async def detener(self) -> None:
+        if self._tarea:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+
+    async def _bucle(self) -> None:
+        # Retoma las publicaciones que quedaron pendientes antes de reiniciar
+        await asyncio.to_thread(self._recuperar_pendientes)
+
+        while True:
+            try:
+                await self._consultar_vencidas()
+                self._purgar()
+            except Exception as e:
+                print(f"Error en el seguimiento de publicaciones de TikTok: {e}")
+
+            self._despertar.clear()
+            try:
+                await asyncio.wait_for(self._despertar.wait(), self._espera())
+            except asyncio.TimeoutError:
+                pass
+
+    def _espera(self) -> float:
+        pendientes = [p.proxima_consulta for p in self._publicaciones.values() if not p.terminado]
+        if not pendientes:
+            return settings.TIKTOK_ESTADO_INTERVALO_MAX
+        return max(0.0, min(pendientes) - time.monotonic())
+
+    async def _consultar_vencidas(self) -> None:
+        ahora = time.monotonic()
+        vencidas = [
+            p for p in self._publicaciones.values()
+            if not p.terminado and p.proxima_consulta <= ahora
+        ]
+
+        lote = max(1, settings.TIKTOK_ESTADO_LOTE)
+        for i in range(0, len(vencidas), lote):
+            await asyncio.gather(*(self._consultar(p) for p in vencidas[i:i + lote]))
+
+    async def _consultar(self, publicacion: PublicacionTiktok) -> None:
+        publicacion.consultas += 1
+        try:
+            respuesta = await tiktok_post_service._obtener_estado_publicacion(publicacion.publish_id)
+            data = respuesta.get("data") or {}
+            estado = data.get("status")
+            if not estado:
+                raise Exception(respuesta.get("details") or respuesta.get("error") or "Respuesta sin estado")
+        except Exception as e:
+            # Error transitorio: se vuelve a intentar con el siguiente intervalo
+            publicacion.error = str(e)
+            estado, data = publicacion.estado, {}
+
+        publicacion.estado = estado
+        publicacion.update_at = datetime.now(timezone.utc)
+
+        if estado in ("PUBLISH_COMPLETE", "SEND_TO_USER_INBOX"):
+            publicacion.error = None
+            publicacion.enlace_publicacion = self._enlace(data)
+        elif estado == "FAILED":
+            publicacion.error = data.get("fail_reason") or "TikTok rechazó la publicación"
+        elif time.monotonic() - publicacion.registrado > settings.TIKTOK_ESTADO_MAX_SEG:
+            publicacion.estado = "EXPIRADO"
+            publicacion.error = "TikTok no confirmó la publicación a tiempo"
+
+        if publicacion.terminado:
+            print(f"Publicación de TikTok {publicacion.publish_id}: {publicacion.estado}")
+            await asyncio.to_thread(self._actualizar_contenido, publicacion)
+            return
+
+        publicacion.intervalo = min(publicacion.intervalo * 2, settings.TIKTOK_ESTADO_INTERVALO_MAX)
+        publicacion.proxima_consulta = time.monotonic() + publicacion.intervalo
+
+    @staticmethod
+    def _enlace(data: Dict[str, Any]) -> Optional[str]:
+        # Así viene escrito el campo en la API de TikTok
+        post_ids = data.get("publicaly_available_post_id") or []
+        if not post_ids:
+            return None
+        return f"https://www.tiktok.com/@{settings.TIKTOK_USUARIO or ''}/video/{post_ids[0]}"
+
+    def _actualizar_contenido(self, publicacion: PublicacionTiktok) -> None:
+        try:
+            with Session(engine) as session:
+                contenido = None
+                if publicacion.contenido_id is not None:
+                    contenido = ContenidoController.obtener_contenido_por_id(session, publicacion.contenido_id)
+                if contenido is None:
+                    contenido = ContenidoController.obtener_contenido_por_enlace(
+                        session, enlace_pendiente(publicacion.publish_id)
+                    )
+                if contenido is None:
+                    return
+
+                ContenidoController.registrar_resultado_publicacion(
+                    session,
+                    contenido_id=contenido.id,  # type: ignore[arg-type]
+                    publicado=publicacion.estado == "PUBLISH_COMPLETE",
+                    enlace_publicacion=publicacion.enlace_publicacion,
+                )
+                publicacion.contenido_id = contenido.id
+        except Exception as e:
+            print(f"No se pudo actualizar el contenido de TikTok {publicacion.publish_id}: {e}")
+
+    def _recuperar_pendientes(self) -> None:
+        try:
+            with Session(engine) as session:
+                contenidos = ContenidoController.obtener_contenidos_por_enlace_prefijo(session, PREFIJO_PENDIENTE)
+        except Exception as e:
+            print(f"No se pudieron recuperar las publicaciones pendientes de TikTok: {e}")
+            return
+
+        for contenido in contenidos:
+            publish_id = str(contenido.enlace_publicacion).removeprefix(PREFIJO_PENDIENTE)
+            self.registrar(publish_id, contenido.id)
+
+    def _purgar(self) -> None:
+        """Olvida las publicaciones terminadas hace más de TIKTOK_ESTADO_TTL."""
+        ahora = datetime.now(timezone.utc)
+        vencidas: List[str] = [
+            p.publish_id for p in self._publicaciones.values()
+            if p.terminado and (ahora - p.update_at).total_seconds() > settings.TIKTOK_ESTADO_TTL
+        ]
+        for publish_id in vencidas:
+            del self._publicaciones[publish_id]
+
+
+seguimiento_tiktok = SeguimientoTiktok()
@@ -0,0 +1,183 @@
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.ia import video_service
+
+ESTADOS_FINALES = ("completado", "error")
+
+
+@dataclass
+class Trabajo:
+    id: str
+    tipo: str
+    parametros: Dict[str, Any]
+    estado: str = "pendiente"  # pendiente | procesando | completado | error
+    consultas: int = 0
+    resultado: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    operacion: Any = None
+    version: int = 0
+
+    create_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    update_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def terminado(self) -> bool:
+        return self.estado in ESTADOS_FINALES
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "estado": self.estado,
+            "consultas": self.consultas,
+            "resultado": self.resultado,
+            "error": self.error,
+            "create_at": self.create_at,
+            "update_at": self.update_at,
+        }
+
+
+class GestorTrabajos:
+    """
+    Cola en memoria de trabajos de generación de video.
+
+    Las rutas solo encolan; un único bucle en segundo plano inicia las operaciones
+    pendientes y consulta juntas todas las que están en curso, sin ocupar hilos
+    del servidor mientras Veo procesa.
+    """
+
+    def __init__(self):
+        self._trabajos: Dict[str, Trabajo] = {}
+        self._tarea: Optional[asyncio.Task] = None
+        self._despertar = asyncio.Event()
+        self._cambios = asyncio.Condition()
+
+    def encolar_video(self, prompt: str, duration_seconds: int = 4, aspect_ratio: str = "16:9") -> Trabajo:
+        """Debe llamarse desde el event loop: `_despertar` no es thread-safe."""
+        trabajo = Trabajo(
+            id=uuid.uuid4().hex,
+            tipo="video",
+            parametros={
+                "prompt": prompt,
+                "duration_seconds": duration_seconds,
+                "aspect_ratio": aspect_ratio,
+            },
+        )
+        self._trabajos[trabajo.id] = trabajo
+        self._despertar.set()
+        return trabajo
+
+    def obtener(self, trabajo_id: str) -> Optional[Trabajo]:
+        return self._trabajos.get(trabajo_id)
+
+    async def esperar_cambio(self, trabajo: Trabajo, version: int, timeout: float) -> bool:
+        """Espera a que el trabajo cambie de versión. Retorna False si venció el timeout."""
+        async with self._cambios:
+            try:
+                await asyncio.wait_for(
+                    self._cambios.wait_for(lambda: trabajo.version != version), timeout
+                )
+                return True
+            except asyncio.TimeoutError:
+                return False
+
+    def iniciar(self) -> None:
+        if self._tarea is None or self._tarea.done():
+            self._tarea = asyncio.create_task(self._bucle())
+
+    async def detener(self) -> None:
+        if self._tarea:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+
+    async def _bucle(self) -> None:
+        while True:
+            try:
+                await self._procesar()
+                self._purgar()
+            except Exception as e:
+                print(f"Error en el bucle de trabajos de video: {e}")
+
+            try:
+                await asyncio.wait_for(self._despertar.wait(), settings.VIDEO_INTERVALO_CONSULTA)
+            except asyncio.TimeoutError:
+                pass
+            # Se limpia antes de procesar: un encolado durante `_procesar` vuelve a despertar el bucle
+            self._despertar.clear()
+
+    async def _procesar(self) -> None:
+        pendientes = [t for t in self._trabajos.values() if t.estado == "pendiente"]
+        en_curso = [t for t in self._trabajos.values() if t.estado == "procesando"]
+
+        await asyncio.gather(
+            *(self._iniciar_trabajo(t) for t in pendientes),
+            *(self._consultar_trabajo(t) for t in en_curso),
+        )
+
+    async def _iniciar_trabajo(self, trabajo: Trabajo) -> None:
+        try:
+            # Mismo prompt y parámetros que un video ya generado: se reutiliza
+            existente = await asyncio.to_thread(
+                video_service.buscar_video_existente, **trabajo.parametros
+            )
+            if existente:
+                await self._actualizar(trabajo, estado="completado", resultado=existente)
+                return
+
+            trabajo.operacion = await asyncio.to_thread(
+                video_service.iniciar_generacion_video, **trabajo.parametros
+            )
+            await self._actualizar(trabajo, estado="procesando")
+        except Exception as e:
+            await self._actualizar(trabajo, estado="error", error=str(e))
+
+    async def _consultar_trabajo(self, trabajo: Trabajo) -> None:
+        try:
+            trabajo.operacion = await asyncio.to_thread(
+                video_service.consultar_operacion, trabajo.operacion
+            )
+            trabajo.consultas += 1
+
+            if not trabajo.operacion.done:
+                await self._actualizar(trabajo)
+                return
+
+            resultado = await asyncio.to_thread(
+                video_service.guardar_video, trabajo.operacion, **trabajo.parametros
+            )
+            trabajo.operacion = None
+            await self._actualizar(trabajo, estado="completado", resultado=resultado)
+        except Exception as e:
+            trabajo.operacion = None
+            await self._actualizar(trabajo, estado="error", error=str(e))
+
+    async def _actualizar(self, trabajo: Trabajo, **cambios: Any) -> None:
+        for campo, valor in cambios.items():
+            setattr(trabajo, campo, valor)
+        trabajo.update_at = datetime.now(timezone.utc)
+        trabajo.version += 1
+
+        async with self._cambios:
+            self._cambios.notify_all()
+
+    def _purgar(self) -> None:
+        """Elimina trabajos terminados más antiguos que VIDEO_TRABAJOS_TTL."""
+        ahora = datetime.now(timezone.utc)
+        vencidos: List[str] = [
+            t.id for t in self._trabajos.values()
+            if t.terminado and (ahora - t.update_at).total_seconds() > settings.VIDEO_TRABAJOS_TTL
+        ]
+        for trabajo_id in vencidos:
+            del self._trabajos[trabajo_id]
+
+
+gestor_trabajos = GestorTrabajos()
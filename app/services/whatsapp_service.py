@@ -1,52 +1,85 @@
+from app.core.archivos import abrir_fuente
 from app.core.config import Settings
-import requests
+from app.core.http_client import ClienteHttp, cliente_http
+from app.core.reintentos import cabeceras_reintento
+from fastapi import HTTPException
 import base64
+import json
 import os
-from urllib.parse import urlparse
+from typing import AsyncIterator
 
 
 settings = Settings()
 
+def largo_base64(tamano: int) -> int:
+    return 4 * ((tamano + 2) // 3)
+
+
+async def base64_por_partes(partes: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Codifica en base64 un flujo de bytes sin juntarlo entero en memoria.
+    Cada bloque se corta en un múltiplo de 3 bytes para que no lleve relleno intermedio.
+    """
+    resto = b""
+    async for datos in partes:
+        datos = resto + datos
+        corte = len(datos) - len(datos) % 3
+        resto = datos[corte:]
+        if corte:
+            yield base64.b64encode(datos[:corte])
+    if resto:
+        yield base64.b64encode(resto)
+
+
+async def _cuerpo_json(cabecera: bytes, media: AsyncIterator[bytes], cola: bytes) -> AsyncIterator[bytes]:
+    yield cabecera
+    async for datos in media:
+        yield datos
+    yield cola
+
 
 class WhatsappService:
 
-    def __init__(self):
+    def __init__(self, http: ClienteHttp = cliente_http):
+        self.http = http
         self.api_url: str | None = settings.WHATSAPP_API_URL
         self.token: str | None = settings.WHATSAPP_TOKEN
 
-    def publicar_historia(self, imagen_url: str, texto: str) -> dict:
+    async def publicar_historia(self, imagen_url: str, texto: str) -> dict:
         # Extraer nombre del archivo de la URL
         nombre_imagen = os.path.basename(imagen_url)
 
-        # Verificar si es una URL completa o una ruta local
-        parsed_url = urlparse(imagen_url)
-        if parsed_url.scheme in ['http', 'https']:
-            # Es una URL completa, descargar la imagen
-            response = requests.get(imagen_url)
-            response.raise_for_status()
-            imagen_bytes = response.content
-        else:
-            # Es una ruta local, leer desde el archivo
-            with open(imagen_url, "rb") as f:
-                imagen_bytes = f.read()
-
-        imagen_base64 = base64.b64encode(imagen_bytes).decode("utf-8")
-
         headers = {
             "accept": "application/json",
             "authorization": f"Bearer {self.token}",
             "content-type": "application/json",
         }
 
-        datos = {
-            "media": f"data:image/png;name={nombre_imagen};base64,{imagen_base64}",
-            "caption": texto,
-            "contacts": ["59176316283"],
-        }
+        # El JSON se arma como flujo: {"media": "data:...;base64,<imagen>", "caption": ..., "contacts": [...]}
+        # La imagen se lee (o descarga) y codifica por partes, así nunca está entera
+        # en memoria ni como bytes ni como texto base64.
+        prefijo_media = json.dumps(f"data:image/png;name={nombre_imagen};base64,")[:-1]
+        cabecera = ('{"media": ' + prefijo_media).encode("utf-8")
+        cola = (
+            '", "caption": ' + json.dumps(texto)
+            + ', "contacts": ' + json.dumps(["59176316283"]) + "}"
+        ).encode("utf-8")
+
+        async with abrir_fuente(imagen_url, self.http) as (tamano, partes):
+            headers["content-length"] = str(len(cabecera) + largo_base64(tamano) + len(cola))
+
+            response = await self.http.post(
+                f"{self.api_url}/stories/send/media",
+                headers=headers,
+                content=_cuerpo_json(cabecera, base64_por_partes(partes), cola),
+            )
 
-        response = requests.post(
-            f"{self.api_url}/stories/send/media", headers=headers, json=datos
-        )
+        if response.status_code >= 400:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Error al publicar en WhatsApp: {response.text}",
+                headers=cabeceras_reintento(response),
+            )
 
         return response.json()
 
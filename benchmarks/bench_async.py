@@ -0,0 +1,185 @@
+"""
+Compara el camino síncrono (endpoint `def` con Session, que FastAPI corre
+en su threadpool) con el async (endpoint `async def` con AsyncSession y
+asyncpg) para la misma petición: una página de `/contenidos/` más una
+consulta que tarda `--espera` ms en Postgres (pg_sleep), como una consulta
+lenta o una base lejana.
+
+Las peticiones van por ASGI en proceso (sin red) con cada cantidad de `--concurrencias`
+clientes a la vez. Con un pool más grande que el threadpool (`--hilos`),
+el camino síncrono queda limitado por los hilos y el async por el pool.
+
+Necesita una base Postgres vacía de pruebas: se crean las tablas y se
+siembran `--contenidos` contenidos.
+
+    python benchmarks/bench_async.py --url postgresql://u:p@localhost/pruebas_async
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _configurar_entorno(url: str, pool: int) -> None:
+    """Settings se lee al importar app.core: hay que fijar el entorno antes."""
+    from sqlalchemy.engine import make_url
+
+    datos = make_url(url)
+    os.environ.update({
+        "DB_USER": datos.username or "", "DB_PASSWORD": datos.password or "",
+        "DB_HOST": datos.host or "localhost", "DB_PORT": str(datos.port or 5432), "DB_NAME": datos.database or "",
+        "DB_POOL_SIZE": str(pool), "DB_MAX_OVERFLOW": "0", "DB_POOL_TIMEOUT": "60",
+    })
+    os.environ.setdefault("AI_PROVIDER", "local")
+
+
+def _sembrar(contenidos: int) -> None:
+    from sqlmodel import Session, SQLModel, select
+
+    from app.core.database import engine
+    from app.models.modelos import Archivo, Contenido, Redsocial, Tema, Usuario
+
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        if session.exec(select(Contenido.id).limit(1)).first():
+            return
+        usuario = Usuario(nombre="u", email="u@ejemplo.com", password="x")
+        redsocial = Redsocial(nombre="Facebook")
+        archivo = Archivo(url="https://ejemplo.com/a.jpg")
+        session.add_all([usuario, redsocial, archivo])
+        session.commit()
+        tema = Tema(nombre="tema", usuario_id=usuario.id)
+        session.add(tema)
+        session.commit()
+        session.add_all([
+            Contenido(descripcion=f"contenido {i}", tema_id=tema.id, redsocial_id=redsocial.id, archivo_id=archivo.id)
+            for i in range(contenidos)
+        ])
+        session.commit()
+
+
+def _crear_app(espera_ms: float, pagina: int):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import text
+    from sqlmodel import Session
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from app.controllers.contenido_controller import ContenidoController
+    from app.controllers.contenido_controller_async import ContenidoControllerAsync
+    from app.core.database import get_async_session, get_session
+
+    consulta_lenta = text("SELECT pg_sleep(:segundos)").bindparams(segundos=espera_ms / 1000)
+    app = FastAPI()
+
+    @app.get("/sincrono")
+    def sincrono(session: Session = Depends(get_session)):
+        session.exec(consulta_lenta)
+        contenidos, _ = ContenidoController.obtener_todos_contenidos(session, pagina)
+        return [c.id for c in contenidos]
+
+    @app.get("/async")
+    async def asincrono(session: AsyncSession = Depends(get_async_session)):
+        await session.exec(consulta_lenta)
+        contenidos, _ = await ContenidoControllerAsync.obtener_todos_contenidos(session, pagina)
+        return [c.id for c in contenidos]
+
+    return app
+
+
+async def _medir(cliente, ruta: str, concurrencia: int, peticiones: int) -> dict:
+    from app.core.metricas import percentil
+
+    pendientes = iter(range(peticiones))
+    latencias = []
+    respuestas = []
+
+    async def cliente_virtual() -> None:
+        for _ in pendientes:
+            inicio = time.perf_counter()
+            respuesta = await cliente.get(ruta)
+            latencias.append(time.perf_counter() - inicio)
+            respuesta.raise_for_status()
+            respuestas.append(respuesta.json())
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente_virtual() for _ in range(concurrencia)))
+    duracion = time.perf_counter() - inicio
+    return {
+        "por_segundo": peticiones / duracion,
+        "p50_ms": percentil(latencias, 0.50) * 1000,
+        "p95_ms": percentil(latencias, 0.95) * 1000,
+        "iguales": all(r == respuestas[0] for r in respuestas),
+        "primera": respuestas[0],
+    }
+
+
+async def _correr(args) -> bool:
+    import anyio.to_thread
+    import httpx
+
+    from app.core.database import async_engine, engine
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.hilos
+    app = _crear_app(args.espera, args.pagina)
+    transporte = httpx.ASGITransport(app=app)
+
+    print(f"Postgres, pool de {args.pool} conexiones por engine, threadpool de {args.hilos} hilos, "
+          f"consulta de {args.espera:g} ms + página de {args.pagina}")
+    print(f"  {'clientes':>8}  {'síncrono pet/s':>14} {'p50 ms':>7} {'p95 ms':>7}  {'async pet/s':>11} {'p50 ms':>7} {'p95 ms':>7}  {'async/sínc':>10}")
+    ok = True
+    ultimo = None
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        # Calienta los dos pools para no medir las conexiones nuevas
+        await _medir(cliente, "/sincrono", args.pool, args.pool)
+        await _medir(cliente, "/async", args.pool, args.pool)
+        for concurrencia in args.concurrencias:
+            peticiones = max(args.peticiones, concurrencia * 4)
+            sincrono = await _medir(cliente, "/sincrono", concurrencia, peticiones)
+            asincrono = await _medir(cliente, "/async", concurrencia, peticiones)
+            ok = ok and sincrono["iguales"] and asincrono["iguales"] and sincrono["primera"] == asincrono["primera"]
+            ultimo = (concurrencia, sincrono, asincrono)
+            print(
+                f"  {concurrencia:8d}  {sincrono['por_segundo']:14.0f} {sincrono['p50_ms']:7.1f} {sincrono['p95_ms']:7.1f}  "
+                f"{asincrono['por_segundo']:11.0f} {asincrono['p50_ms']:7.1f} {asincrono['p95_ms']:7.1f}  "
+                f"{asincrono['por_segundo'] / sincrono['por_segundo']:9.1f}x"
+            )
+
+    verificaciones = [("los dos caminos devuelven la misma página", ok)]
+    concurrencia, sincrono, asincrono = ultimo
+    if concurrencia > args.hilos and args.pool > args.hilos:
+        verificaciones.append((
+            f"con {concurrencia} clientes el async supera al threadpool",
+            asincrono["por_segundo"] > sincrono["por_segundo"] * 1.2,
+        ))
+    for descripcion, resultado in verificaciones:
+        print(f"  {'OK   ' if resultado else 'FALLA'} {descripcion}")
+
+    await async_engine.dispose()
+    engine.dispose()
+    return all(resultado for _, resultado in verificaciones)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", required=True, help="base Postgres de pruebas (postgresql://...)")
+    parser.add_argument("--contenidos", type=int, default=2000)
+    parser.add_argument("--espera", type=float, default=20, help="ms de pg_sleep por petición")
+    parser.add_argument("--pagina", type=int, default=50)
+    parser.add_argument("--pool", type=int, default=40, help="conexiones de cada engine (max_connections de Postgres alcanza para los dos)")
+    parser.add_argument("--hilos", type=int, default=10, help="tamaño del threadpool de los endpoints síncronos (FastAPI usa 40; "
+                        "más chico que el pool para que se sature primero sin pasar max_connections)")
+    parser.add_argument("--concurrencias", type=int, nargs="+", default=[1, 10, 40])
+    parser.add_argument("--peticiones", type=int, default=200, help="mínimo de peticiones por medición")
+    args = parser.parse_args()
+
+    _configurar_entorno(args.url, args.pool)
+    _sembrar(args.contenidos)
+    if not asyncio.run(_correr(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compara el modo de un solo prompt contra el modo por red (`por_red=True`)
+en tiempo total y tokens consumidos.
+
+Usa el proveedor local: cada llamada cuesta una latencia fija más un tiempo por
+token generado, que es lo que hace lenta a una respuesta grande.
+
+    python benchmarks/bench_generacion_por_red.py --solicitudes 20 --seg-por-token 0.01
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REDES = ["facebook", "instagram", "linkedin", "whatsapp", "tiktok"]
+
+
+async def _medir(solicitudes: int, por_red: bool) -> tuple[float, dict]:
+    from app.schemas.chat_schema import ChatRequest
+    from app.services.chat_service import generar_contenido
+    from app.services.ia import texto_service
+
+    antes = dict(texto_service.uso_tokens)
+    inicio = time.perf_counter()
+    for i in range(solicitudes):
+        respuesta = await generar_contenido(ChatRequest(
+            prompt=f"Inscripciones al semestre {i}",
+            redes_sociales=REDES,
+            no_cache=True,
+            por_red=por_red,
+        ))
+        assert respuesta.status_code == 200
+    duracion = time.perf_counter() - inicio
+
+    uso = {clave: texto_service.uso_tokens[clave] - antes[clave] for clave in antes}
+    return duracion, uso
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--solicitudes", type=int, default=10)
+    parser.add_argument("--latencia", type=float, default=0.3)
+    parser.add_argument("--seg-por-token", type=float, default=0.005)
+    args = parser.parse_args()
+
+    os.environ["AI_PROVIDER"] = "local"
+    os.environ["LOCAL_IA_LATENCIA"] = str(args.latencia)
+    os.environ["LOCAL_IA_SEG_POR_TOKEN"] = str(args.seg_por_token)
+
+    print(f"{args.solicitudes} solicitudes secuenciales, {len(REDES)} redes")
+    for nombre, por_red in (("un solo prompt", False), ("por red", True)):
+        duracion, uso = asyncio.run(_medir(args.solicitudes, por_red))
+        print(
+            f"  {nombre:<15} {duracion / args.solicitudes:6.2f}s/solicitud  "
+            f"llamadas={uso['llamadas']:<4} tokens prompt={uso['tokens_prompt']:<7} "
+            f"respuesta={uso['tokens_respuesta']:<7} total={uso['tokens_total']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Historial de un tema con `--items` elementos (mitad prompts, mitad
+contenidos, cada contenido con su archivo) en una base SQLite temporal.
+
+Compara la versión anterior de `obtener_historial_tema` (dos consultas, un
+`session.get` de archivo y red social por contenido y orden en Python) con
+la consulta UNION ALL actual (todo el historial en una página), y cuánto
+tarda la primera página de `--pagina` elementos, que es lo que pide el
+chat al abrir el tema. SQLite no tiene latencia de red, así que cada
+consulta suma además `--latencia` ms, como una ida y vuelta a Postgres.
+
+    python benchmarks/bench_historial_tema.py --items 10000 --latencia 0.5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _historial_anterior(session, tema_id: int) -> list:
+    """La implementación reemplazada, tal cual, para comparar."""
+    from sqlmodel import select
+
+    from app.models.modelos import Archivo, Contenido, Prompt, Redsocial
+
+    prompts = session.exec(select(Prompt).where(Prompt.tema_id == tema_id)).all()
+    contenidos = session.exec(select(Contenido).where(Contenido.tema_id == tema_id)).all()
+
+    historial = []
+    for prompt in prompts:
+        historial.append({
+            "tipo": "prompt", "id": prompt.id, "descripcion": prompt.descripcion, "tema_id": prompt.tema_id,
+            "create_at": prompt.create_at, "update_at": prompt.update_at,
+        })
+    for contenido in contenidos:
+        archivo = session.get(Archivo, contenido.archivo_id)
+        redsocial = session.get(Redsocial, contenido.redsocial_id)
+        historial.append({
+            "tipo": "contenido", "id": contenido.id, "descripcion": contenido.descripcion,
+            "publicado": contenido.publicado, "fecha_publicacion": contenido.fecha_publicacion,
+            "enlace_publicacion": contenido.enlace_publicacion, "tema_id": contenido.tema_id,
+            "redsocial_id": contenido.redsocial_id, "redsocial_nombre": redsocial.nombre if redsocial else None,
+            "archivo_id": contenido.archivo_id, "archivo_url": archivo.url if archivo else None,
+            "archivo_prompt_text": archivo.prompt_text if archivo else None,
+            "create_at": contenido.create_at, "update_at": contenido.update_at,
+        })
+    historial.sort(key=lambda x: x["create_at"])
+    return historial
+
+
+def _poblar(engine, items: int) -> int:
+    from sqlmodel import Session
+
+    from app.models.modelos import Archivo, Contenido, Prompt, Redsocial, Tema, Usuario
+
+    inicio = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with Session(engine) as session:
+        usuario = Usuario(nombre="u", email="u@ejemplo.com", password="x")
+        redes = [Redsocial(nombre=nombre) for nombre in ("Facebook", "Instagram", "LinkedIn")]
+        session.add_all([usuario, *redes])
+        session.commit()
+        tema = Tema(nombre="tema largo", usuario_id=usuario.id)
+        session.add(tema)
+        session.commit()
+
+        archivos = [Archivo(url=f"https://ejemplo.com/{i}.jpg", prompt_text=f"imagen {i}") for i in range(items // 2)]
+        session.add_all(archivos)
+        session.commit()
+
+        for i in range(items // 2):
+            momento = inicio + timedelta(minutes=2 * i)
+            session.add(Prompt(descripcion=f"prompt {i}", tema_id=tema.id, create_at=momento, update_at=momento))
+            session.add(Contenido(
+                descripcion=f"contenido {i}", tema_id=tema.id, redsocial_id=redes[i % 3].id,
+                archivo_id=archivos[i].id, create_at=momento + timedelta(minutes=1), update_at=momento,
+            ))
+        session.commit()
+        return tema.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--latencia", type=float, default=0.5, help="ms sumados a cada consulta")
+    parser.add_argument("--pagina", type=int, default=50)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AI_PROVIDER", "local")
+
+    from sqlalchemy import event
+    from sqlmodel import Session, SQLModel, create_engine
+
+    from app.controllers.tema_controller import TemaController
+
+    base = tempfile.mkdtemp(prefix="historial_")
+    engine = create_engine(f"sqlite:///{base}/historial.db")
+    SQLModel.metadata.create_all(engine)
+    tema_id = _poblar(engine, args.items)
+
+    consultas = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _contar(*_):
+        consultas["n"] += 1
+        time.sleep(args.latencia / 1000)
+
+    def medir(funcion):
+        mejor, resultado = float("inf"), None
+        for _ in range(args.repeticiones):
+            consultas["n"] = 0
+            # Sesión nueva en cada vuelta: como en una petición, sin el identity map de la anterior
+            with Session(engine) as session:
+                inicio = time.perf_counter()
+                resultado = funcion(session)
+                mejor = min(mejor, time.perf_counter() - inicio)
+        return mejor, consultas["n"], resultado
+
+    anterior, consultas_anterior, historial_anterior = medir(lambda s: _historial_anterior(s, tema_id))
+    actual, consultas_actual, respuesta = medir(lambda s: TemaController.obtener_historial_tema(s, tema_id, args.items))
+    historial = respuesta["historial"]
+    pagina, consultas_pagina, primera = medir(lambda s: TemaController.obtener_historial_tema(s, tema_id, args.pagina))
+
+    print(f"Historial de {args.items} elementos, {args.latencia} ms por consulta")
+    print(f"  anterior   {anterior * 1000:8.0f} ms  {consultas_anterior:6d} consultas")
+    print(f"  UNION ALL  {actual * 1000:8.0f} ms  {consultas_actual:6d} consultas  ({anterior / actual:.1f}x)")
+    print(f"  página de {args.pagina:<4} {pagina * 1000:6.1f} ms  {consultas_pagina:6d} consultas")
+
+    iguales = [(i["tipo"], i["id"]) for i in historial] == [(i["tipo"], i["id"]) for i in historial_anterior]
+    contenidos = [i for i in historial if i["tipo"] == "contenido"]
+    verificaciones = [
+        ("mismo orden que la versión anterior", iguales),
+        ("red social y archivo cargados", all(i["redsocial_nombre"] and i["archivo_url"] for i in contenidos)),
+        ("a lo sumo dos consultas", consultas_actual <= 2),
+        ("la primera página son los más recientes", primera["historial"] == historial[-args.pagina:]),
+    ]
+    for descripcion, ok in verificaciones:
+        print(f"  {'OK   ' if ok else 'FALLA'} {descripcion}")
+    if not all(ok for _, ok in verificaciones):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
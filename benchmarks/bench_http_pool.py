@@ -0,0 +1,130 @@
+"""
+Compara la latencia de publicar en Facebook abriendo una conexión nueva por
+publicación (como antes) contra el cliente HTTP compartido con keep-alive.
+
+Levanta un servidor simulado local que responde como la Graph API. Para
+representar el costo de DNS + TCP + TLS de una API real, cada conexión nueva
+espera `--handshake-ms` antes de atender la primera petición.
+
+    python benchmarks/bench_http_pool.py --publicaciones 200 --handshake-ms 40
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _servidor_simulado(handshake: float, latencia: float) -> ThreadingHTTPServer:
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            time.sleep(handshake)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latencia)
+            cuerpo = json.dumps({"id": "123_456", "post_id": "123_456"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+async def _publicar_conexion_nueva(url: str, datos: dict) -> None:
+    """Lo que hacían los servicios: un cliente (y una conexión) por publicación."""
+    import httpx
+
+    async with httpx.AsyncClient() as cliente:
+        respuesta = await cliente.post(f"{url}/me/feed", data=datos)
+        respuesta.raise_for_status()
+
+
+async def _medir(publicar, publicaciones: int, concurrencia: int) -> tuple[list[float], float]:
+    semaforo = asyncio.Semaphore(concurrencia)
+    latencias: list[float] = []
+
+    async def una(i: int) -> None:
+        async with semaforo:
+            inicio = time.perf_counter()
+            await publicar(i)
+            latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(una(i) for i in range(publicaciones)))
+    return latencias, time.perf_counter() - inicio
+
+
+def _resumen(nombre: str, latencias: list[float], total: float) -> str:
+    ordenadas = sorted(latencias)
+    p95 = ordenadas[int(len(ordenadas) * 0.95) - 1]
+    return (
+        f"  {nombre:<22} media {statistics.mean(latencias) * 1000:7.1f} ms"
+        f"  p95 {p95 * 1000:7.1f} ms  total {total:6.2f}s"
+    )
+
+
+async def _comparar(url: str, publicaciones: int, concurrencia: int) -> None:
+    from app.core.http_client import cliente_http
+    from app.services.facebook_service import facebook_service
+
+    facebook_service.api_url = url
+
+    antes = await _medir(
+        lambda i: _publicar_conexion_nueva(url, {"message": f"post {i}"}),
+        publicaciones, concurrencia,
+    )
+
+    cliente_http.iniciar()
+    try:
+        despues = await _medir(
+            lambda i: facebook_service.publicar_post(texto=f"post {i}"),
+            publicaciones, concurrencia,
+        )
+    finally:
+        await cliente_http.cerrar()
+
+    print(f"{publicaciones} publicaciones, concurrencia {concurrencia}")
+    print(_resumen("conexión por petición", *antes))
+    print(_resumen("pool compartido", *despues))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--publicaciones", type=int, default=200)
+    parser.add_argument("--concurrencia", type=int, default=10)
+    parser.add_argument("--handshake-ms", type=float, default=40)
+    parser.add_argument("--latencia-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    # No se usa la IA; evita exigir GEMINI_API_KEY al importar la configuración
+    os.environ.setdefault("AI_PROVIDER", "local")
+
+    servidor = _servidor_simulado(args.handshake_ms / 1000, args.latencia_ms / 1000)
+    url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    try:
+        asyncio.run(_comparar(url, args.publicaciones, args.concurrencia))
+    finally:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
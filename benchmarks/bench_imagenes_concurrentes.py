@@ -0,0 +1,86 @@
+"""
+Lanza muchas generaciones de imagen en paralelo con el proveedor local y,
+al mismo tiempo, lee continuamente los PNG del directorio de salida para
+verificar que ningún lector vea un archivo a medio escribir.
+
+    python benchmarks/bench_imagenes_concurrentes.py --solicitudes 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIRMA_PNG = b"\x89PNG\r\n\x1a\n"
+FIN_PNG = b"IEND\xaeB`\x82"
+
+
+def _lector(directorio: str, detener: threading.Event, errores: list) -> None:
+    """Simula a /static/images sirviendo archivos mientras se escriben."""
+    while not detener.is_set():
+        for nombre in os.listdir(directorio):
+            if not nombre.endswith(".png"):
+                continue
+            try:
+                with open(os.path.join(directorio, nombre), "rb") as f:
+                    datos = f.read()
+            except FileNotFoundError:
+                continue
+            if not (datos.startswith(FIRMA_PNG) and datos.endswith(FIN_PNG)):
+                errores.append(nombre)
+
+
+async def _generar(solicitudes: int) -> float:
+    from app.services.ia import imagen_service
+
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(
+        imagen_service.generar_imagen(f"Afiche de la feria de ciencias {i % 50}", reutilizar=False)
+        for i in range(solicitudes)
+    ))
+    assert len(resultados) == solicitudes
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--solicitudes", type=int, default=200)
+    parser.add_argument("--latencia", type=float, default=0.2)
+    args = parser.parse_args()
+
+    os.environ["AI_PROVIDER"] = "local"
+    os.environ["LOCAL_IA_LATENCIA"] = str(args.latencia)
+
+    from app.services.ia.media_service import almacen_media
+
+    with tempfile.TemporaryDirectory() as raiz:
+        almacen_media.directorio = raiz
+        almacen_media.registrar = False
+        directorio = os.path.join(raiz, "images")
+        os.makedirs(directorio)
+
+        detener = threading.Event()
+        errores: list = []
+        hilo = threading.Thread(target=_lector, args=(directorio, detener, errores))
+        hilo.start()
+        try:
+            duracion = asyncio.run(_generar(args.solicitudes))
+        finally:
+            detener.set()
+            hilo.join()
+
+        temporales = [n for n in os.listdir(directorio) if n.endswith(".tmp")]
+
+    print(f"{args.solicitudes} imágenes en paralelo, latencia simulada {args.latencia}s: {duracion:.2f}s")
+    print(f"  lecturas de PNG incompletos: {len(errores)}")
+    print(f"  temporales sin limpiar:      {len(temporales)}")
+    if errores or temporales:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Carruseles y preparación por lotes de Instagram contra un servidor simulado
+de la Graph API que tarda `--proceso` segundos en procesar cada contenedor
+(status_code IN_PROGRESS -> FINISHED).
+
+Compara un carrusel con los contenedores hijos creados uno tras otro (como
+se haría con el flujo anterior de una imagen) contra la creación en
+paralelo, y mide cuánto tarda publicar un lote ya preparado.
+
+    python benchmarks/bench_instagram_carrusel.py --imagenes 10 --posts 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _servidor_simulado(proceso: float) -> tuple[ThreadingHTTPServer, dict]:
+    estado = {"contenedores": {}, "publicados": [], "consultas": 0}
+    ids = count(1)
+    candado = threading.Lock()
+
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _json(self, codigo: int, datos: dict) -> None:
+            cuerpo = json.dumps(datos).encode()
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_GET(self):
+            contenedor_id = urlparse(self.path).path.strip("/")
+            with candado:
+                estado["consultas"] += 1
+                contenedor = estado["contenedores"].get(contenedor_id)
+            if contenedor is None:
+                self._json(404, {"error": "no existe"})
+                return
+            listo = time.monotonic() - contenedor["creado"] >= proceso
+            self._json(200, {"id": contenedor_id, "status_code": "FINISHED" if listo else "IN_PROGRESS"})
+
+        def do_POST(self):
+            datos = parse_qs(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode())
+            if self.path.endswith("/media_publish"):
+                creation_id = datos["creation_id"][0]
+                with candado:
+                    estado["publicados"].append(creation_id)
+                self._json(200, {"id": f"media_{creation_id}"})
+                return
+
+            with candado:
+                contenedor_id = f"c{next(ids)}"
+                hijos = datos.get("children", [""])[0].split(",") if "children" in datos else []
+                # Un carrusel solo se crea si todos los hijos ya terminaron
+                if any(time.monotonic() - estado["contenedores"][h]["creado"] < proceso for h in hijos):
+                    self._json(400, {"error": "hijos sin procesar"})
+                    return
+                estado["contenedores"][contenedor_id] = {"creado": time.monotonic(), "hijos": hijos}
+            self._json(200, {"id": contenedor_id})
+
+        def log_message(self, *args):
+            pass
+
+    class Servidor(ThreadingHTTPServer):
+        request_queue_size = 256
+
+    servidor = Servidor(("127.0.0.1", 0), Manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, estado
+
+
+async def _carrusel_secuencial(urls: list[str], texto: str) -> dict:
+    """Hijos uno por uno: crear, esperar a que esté listo, seguir con el siguiente."""
+    from app.services.instagram_service import instagram_service
+
+    hijos = []
+    for url in urls:
+        hijos.append(await instagram_service.preparar_publicacion([url]))
+    respuesta = await instagram_service.realizar_peticion(
+        f"{instagram_service.id_pagina}/media",
+        {"media_type": "CAROUSEL", "children": ",".join(hijos), "caption": texto},
+    )
+    await instagram_service.esperar_contenedor(respuesta["id"])
+    return await instagram_service.publicar_preparado(respuesta["id"])
+
+
+async def _medir(args) -> None:
+    from app.core.http_client import cliente_http
+    from app.services.instagram_service import instagram_service
+
+    urls = [f"https://ejemplo.com/imagen_{i}.jpg" for i in range(args.imagenes)]
+    try:
+        inicio = time.perf_counter()
+        await _carrusel_secuencial(urls, "secuencial")
+        secuencial = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        await instagram_service.publicar_carrusel(urls, "paralelo")
+        paralelo = time.perf_counter() - inicio
+
+        publicaciones = [(urls[: 1 + i % args.imagenes], f"post {i}") for i in range(args.posts)]
+        inicio = time.perf_counter()
+        preparados = await instagram_service.preparar_lote(publicaciones)
+        preparacion = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(instagram_service.publicar_preparado(p["creation_id"]) for p in preparados))
+        publicacion = time.perf_counter() - inicio
+    finally:
+        await cliente_http.cerrar()
+
+    print(f"Carrusel de {args.imagenes} imágenes, {args.proceso}s de proceso por contenedor")
+    print(f"  hijos uno tras otro  {secuencial:6.2f}s")
+    print(f"  hijos en paralelo    {paralelo:6.2f}s  ({secuencial / paralelo:.1f}x)")
+    listos = sum(1 for p in preparados if p["creation_id"])
+    print(f"Lote de {args.posts} posts: {listos} preparados en {preparacion:.2f}s, publicados en {publicacion * 1000:.0f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--imagenes", type=int, default=10)
+    parser.add_argument("--posts", type=int, default=20)
+    parser.add_argument("--proceso", type=float, default=1.0)
+    args = parser.parse_args()
+
+    servidor, estado = _servidor_simulado(args.proceso)
+
+    os.environ.setdefault("AI_PROVIDER", "local")
+    os.environ["INSTAGRAM_API_URL"] = f"http://127.0.0.1:{servidor.server_address[1]}"
+    os.environ["INSTAGRAM_ESTADO_INTERVALO"] = "0.1"
+    os.environ["INSTAGRAM_ESTADO_INTERVALO_MAX"] = "0.2"
+    os.environ["INSTAGRAM_LOTE_CONCURRENCIA"] = str(args.posts)
+    # La medición es del flujo de contenedores, no del limitador de llamadas
+    os.environ["LIMITE_REDES"] = "instagram=1000:1000"
+
+    try:
+        asyncio.run(_medir(args))
+    finally:
+        servidor.shutdown()
+    print(f"  ({estado['consultas']} consultas de estado, {len(estado['publicados'])} publicaciones)")
+
+
+if __name__ == "__main__":
+    main()
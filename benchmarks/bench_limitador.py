@@ -0,0 +1,149 @@
+"""
+Ráfaga de publicaciones en Facebook contra un servidor simulado que aplica su
+propia cuota (`--cuota` llamadas por segundo; el resto recibe 429 con
+Retry-After: 1).
+
+Compara tres configuraciones del limitador:
+
+    sin limitador   todas las llamadas salen juntas
+    ajustado        cubeta por debajo de la cuota de la red
+    excedido        cubeta por encima de la cuota: se frena al ver los 429
+
+    python benchmarks/bench_limitador.py --publicaciones 60 --cuota 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _servidor_simulado(cuota: int) -> tuple[ThreadingHTTPServer, dict]:
+    estado = {"aceptadas": 0, "rechazadas": 0}
+    ventana: deque = deque()
+    candado = threading.Lock()
+
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _json(self, codigo: int, datos: dict, extra: dict | None = None) -> None:
+            cuerpo = json.dumps(datos).encode()
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            for clave, valor in (extra or {}).items():
+                self.send_header(clave, valor)
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            ahora = time.monotonic()
+            with candado:
+                # Ventana deslizante de un segundo
+                while ventana and ahora - ventana[0] >= 1:
+                    ventana.popleft()
+                aceptada = len(ventana) < cuota
+                if aceptada:
+                    ventana.append(ahora)
+                    estado["aceptadas"] += 1
+                else:
+                    estado["rechazadas"] += 1
+
+            if aceptada:
+                self._json(200, {"id": "pagina_post"})
+            else:
+                self._json(429, {"error": {"code": 4, "message": "Application request limit reached"}}, {"Retry-After": "1"})
+
+        def log_message(self, *args):
+            pass
+
+    class Servidor(ThreadingHTTPServer):
+        # Toda la ráfaga conecta a la vez
+        request_queue_size = 256
+
+    servidor = Servidor(("127.0.0.1", 0), Manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, estado
+
+
+async def _rafaga(publicaciones: int) -> tuple[int, float]:
+    from fastapi import HTTPException
+
+    from app.services.facebook_service import facebook_service
+
+    async def una(i: int) -> bool:
+        try:
+            await facebook_service.publicar_post(f"publicación {i}")
+            return True
+        except HTTPException:
+            return False
+
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(una(i) for i in range(publicaciones)))
+    return sum(resultados), time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--publicaciones", type=int, default=60)
+    parser.add_argument("--cuota", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AI_PROVIDER", "local")
+    os.environ["LIMITE_PAUSA_429"] = "1"
+
+    from app.core import http_client
+    from app.core.limitador import LimitadorRedes
+
+    configuraciones = {
+        "sin limitador": {},
+        # Ráfaga + tasa no superan la cuota en ningún segundo
+        "ajustado": {"facebook": (args.cuota / 2, args.cuota / 2)},
+        "excedido": {"facebook": (args.cuota * 3, args.cuota)},
+    }
+
+    print(f"{args.publicaciones} publicaciones a la vez, la red admite {args.cuota}/s")
+    for nombre, limites in configuraciones.items():
+        servidor, estado = _servidor_simulado(args.cuota)
+        os.environ["FACEBOOK_API_URL"] = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+        from app.services.facebook_service import facebook_service
+        facebook_service.api_url = os.environ["FACEBOOK_API_URL"]
+
+        # Cada configuración con su propio limitador, en memoria
+        http_client.limitador = LimitadorRedes(limites, compartido=False)
+
+        async def correr():
+            try:
+                return await _rafaga(args.publicaciones)
+            finally:
+                await http_client.cliente_http.cerrar()
+
+        publicadas, segundos = asyncio.run(correr())
+        servidor.shutdown()
+
+        linea = (
+            f"  {nombre:<14} publicadas {publicadas:3d}/{args.publicaciones}  429 recibidos {estado['rechazadas']:3d}"
+            f"  {segundos:5.1f}s"
+        )
+        metricas = http_client.limitador.metricas()["redes"]
+        if metricas:
+            m = metricas[0]
+            linea += (
+                f"  espera p50 {m['espera_p50_ms']:6.0f} ms  p95 {m['espera_p95_ms']:6.0f} ms"
+                f"  tasa final {m['tasa_actual']:.2f}/s"
+            )
+        print(linea)
+
+
+if __name__ == "__main__":
+    main()
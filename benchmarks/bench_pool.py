@@ -0,0 +1,120 @@
+"""
+Comportamiento del pool de conexiones al saturarse: `--hilos` hilos (como
+el threadpool de FastAPI con los endpoints síncronos) hacen cada uno
+`--peticiones` consultas que tardan `--consulta` ms, contra engines de
+`crear_engine` con distintas configuraciones de pool.
+
+Usa una base SQLite temporal con una función `pg_sleep` registrada en cada
+conexión, así que lo que se mide es la espera en el pool y no la base.
+Muestra peticiones por segundo, espera por una conexión (p50/p95/máx),
+checkouts que vencieron `pool_timeout` y el máximo de conexiones en uso.
+
+    python benchmarks/bench_pool.py --hilos 40 --peticiones 20 --consulta 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _correr(engine, hilos: int, peticiones: int, consulta_ms: float) -> tuple[float, int]:
+    from sqlalchemy import text
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+    from sqlmodel import Session
+
+    barrera = threading.Barrier(hilos)
+    rechazadas = [0] * hilos
+
+    def trabajar(indice: int) -> None:
+        barrera.wait()
+        for _ in range(peticiones):
+            try:
+                with Session(engine) as session:
+                    session.exec(text("SELECT pg_sleep(:segundos)").bindparams(segundos=consulta_ms / 1000))
+            except PoolTimeoutError:
+                rechazadas[indice] += 1
+
+    trabajadores = [threading.Thread(target=trabajar, args=(i,)) for i in range(hilos)]
+    inicio = time.perf_counter()
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    return time.perf_counter() - inicio, sum(rechazadas)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hilos", type=int, default=40)
+    parser.add_argument("--peticiones", type=int, default=20, help="consultas por hilo")
+    parser.add_argument("--consulta", type=float, default=20, help="ms que tarda cada consulta")
+    args = parser.parse_args()
+
+    for variable, valor in {
+        "DB_USER": "u", "DB_PASSWORD": "p", "DB_HOST": "localhost", "DB_PORT": "5432", "DB_NAME": "x",
+        "AI_PROVIDER": "local",
+    }.items():
+        os.environ.setdefault(variable, valor)
+
+    from sqlalchemy import event
+
+    from app.core.database import PoolConMetricas, crear_engine
+
+    url = f"sqlite:///{tempfile.mkdtemp(prefix='pool_')}/pool.db"
+    total = args.hilos * args.peticiones
+    # Sin espera en el pool: una conexión por hilo
+    ideal = args.peticiones * args.consulta / 1000
+
+    configuraciones = [
+        ("5 + 0 overflow", dict(pool_size=5, max_overflow=0, pool_timeout=30)),
+        ("5 + 10 overflow", dict(pool_size=5, max_overflow=10, pool_timeout=30)),
+        (f"{args.hilos} + 0 overflow", dict(pool_size=args.hilos, max_overflow=0, pool_timeout=30)),
+        ("5 + 0, timeout 0.1 s", dict(pool_size=5, max_overflow=0, pool_timeout=0.1)),
+    ]
+
+    print(f"{args.hilos} hilos x {args.peticiones} consultas de {args.consulta:g} ms ({ideal:.2f} s sin esperar al pool)")
+    print(f"  {'pool':<22} {'total':>7} {'pet/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'máx ms':>8} {'timeouts':>9} {'en uso':>7}")
+    resultados = {}
+    for nombre, opciones in configuraciones:
+        engine = crear_engine(url, **opciones)
+
+        @event.listens_for(engine, "connect")
+        def _registrar_pg_sleep(conexion, _):
+            conexion.create_function("pg_sleep", 1, lambda segundos: time.sleep(segundos))
+
+        duracion, rechazadas = _correr(engine, args.hilos, args.peticiones, args.consulta)
+        pool = engine.pool
+        assert isinstance(pool, PoolConMetricas)
+        metricas = pool.metricas()
+        resultados[nombre] = (duracion, rechazadas, metricas)
+        print(
+            f"  {nombre:<22} {duracion:6.2f}s {(total - rechazadas) / duracion:7.0f} "
+            f"{metricas['espera_p50_ms']:8.1f} {metricas['espera_p95_ms']:8.1f} {metricas['espera_max_ms']:8.1f} "
+            f"{metricas['timeouts']:9d} {metricas['max_en_uso']:7d}"
+        )
+        engine.dispose()
+
+    fijo, overflow, amplio, corto = (resultados[nombre] for nombre, _ in configuraciones)
+    verificaciones = [
+        ("el pool nunca supera pool_size + max_overflow",
+         fijo[2]["max_en_uso"] <= 5 and overflow[2]["max_en_uso"] <= 15),
+        # QueuePool no es FIFO: el hilo que devuelve una conexión suele volver a
+        # tomarla, así que la espera se concentra en unos pocos checkouts
+        ("el overflow reduce la espera al saturarse",
+         overflow[0] < fijo[0] and overflow[2]["espera_max_ms"] < fijo[2]["espera_max_ms"]),
+        ("sin timeouts con pool_timeout holgado", fijo[1] == overflow[1] == amplio[1] == 0),
+        ("con pool_timeout corto se rechaza en lugar de esperar",
+         corto[1] > 0 and corto[2]["timeouts"] == corto[1] and corto[2]["espera_max_ms"] < 200),
+    ]
+    for descripcion, ok in verificaciones:
+        print(f"  {'OK   ' if ok else 'FALLA'} {descripcion}")
+    if not all(ok for _, ok in verificaciones):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Mide RSS máximo y throughput al publicar imágenes locales grandes en LinkedIn
+y WhatsApp contra un servidor simulado local.
+
+`antes` reproduce la subida anterior (imagen entera en memoria y, en WhatsApp,
+base64 + JSON como texto); `despues` usa los servicios actuales, que envían el
+archivo y el JSON por partes.
+
+    python benchmarks/bench_subida_imagenes.py --mb 20 --imagenes 8 --concurrencia 4
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _rss_maximo_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _servidor_simulado() -> ThreadingHTTPServer:
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _json(self, codigo: int, datos: dict, extra: dict | None = None) -> None:
+            cuerpo = json.dumps(datos).encode()
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            for clave, valor in (extra or {}).items():
+                self.send_header(clave, valor)
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_POST(self):
+            # Se descarta el cuerpo por partes: el servidor no suma memoria a la medición
+            largo = int(self.headers.get("Content-Length", 0))
+            while largo > 0:
+                largo -= len(self.rfile.read(min(largo, 1024 * 1024)))
+
+            host, puerto = self.server.server_address[:2]
+            if self.path.startswith("/assets"):
+                self._json(200, {"value": {
+                    "asset": "urn:li:digitalmediaAsset:123",
+                    "uploadMechanism": {"com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {
+                        "uploadUrl": f"http://{host}:{puerto}/upload",
+                    }},
+                }})
+            elif self.path.startswith("/upload"):
+                self._json(201, {})
+            elif self.path.startswith("/ugcPosts"):
+                self._json(201, {}, {"X-RestLi-Id": "urn:li:share:1"})
+            else:
+                self._json(200, {"id": "historia-1"})
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+async def _antes(url: str, ruta: str) -> None:
+    """Las subidas anteriores: lectura completa y base64 + JSON en memoria."""
+    from app.core.http_client import cliente_http
+
+    with open(ruta, "rb") as f:
+        imagen = f.read()
+    await cliente_http.post(f"{url}/upload", content=imagen)
+
+    with open(ruta, "rb") as f:
+        imagen = f.read()
+    imagen_base64 = base64.b64encode(imagen).decode("utf-8")
+    datos = {"media": f"data:image/png;name=x.png;base64,{imagen_base64}", "caption": "hola", "contacts": ["1"]}
+    await cliente_http.post(f"{url}/stories/send/media", json=datos)
+
+
+async def _despues(url: str, ruta: str) -> None:
+    from app.services.linkedin_service import linkedin_service
+    from app.services.whatsapp_service import whatsapp_service
+
+    linkedin_service.api_url = url
+    whatsapp_service.api_url = url
+
+    respuesta = await linkedin_service.publicar_imagen(ruta, "hola")
+    assert respuesta["status"] == "success", respuesta
+    await whatsapp_service.publicar_historia(ruta, "hola")
+
+
+def _ejecutar(modo: str, mb: int, imagenes: int, concurrencia: int) -> None:
+    from app.core.http_client import cliente_http
+
+    rutas = []
+    for _ in range(imagenes):
+        descriptor, ruta = tempfile.mkstemp(suffix=".png")
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(os.urandom(mb * 1024 * 1024))
+        rutas.append(ruta)
+
+    servidor = _servidor_simulado()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    publicar = _antes if modo == "antes" else _despues
+
+    async def correr() -> None:
+        semaforo = asyncio.Semaphore(concurrencia)
+
+        async def una(ruta: str) -> None:
+            async with semaforo:
+                await publicar(url, ruta)
+
+        try:
+            await asyncio.gather(*(una(ruta) for ruta in rutas))
+        finally:
+            await cliente_http.cerrar()
+
+    base = _rss_maximo_mb()
+    inicio = time.perf_counter()
+    try:
+        asyncio.run(correr())
+    finally:
+        servidor.shutdown()
+        for ruta in rutas:
+            os.remove(ruta)
+    segundos = time.perf_counter() - inicio
+
+    print(json.dumps({"segundos": segundos, "rss_extra_mb": _rss_maximo_mb() - base}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=20)
+    parser.add_argument("--imagenes", type=int, default=8)
+    parser.add_argument("--concurrencia", type=int, default=4)
+    parser.add_argument("--modo", choices=["antes", "despues"])
+    args = parser.parse_args()
+
+    os.environ.setdefault("AI_PROVIDER", "local")
+
+    if args.modo:
+        _ejecutar(args.modo, args.mb, args.imagenes, args.concurrencia)
+        return
+
+    print(f"{args.imagenes} imágenes de {args.mb} MB (LinkedIn + WhatsApp cada una), concurrencia {args.concurrencia}")
+    for modo in ("antes", "despues"):
+        salida = subprocess.run(
+            [sys.executable, __file__, "--modo", modo, "--mb", str(args.mb),
+             "--imagenes", str(args.imagenes), "--concurrencia", str(args.concurrencia)],
+            check=True, capture_output=True, text=True,
+        )
+        r = json.loads(salida.stdout.strip().splitlines()[-1])
+        # Cada imagen se envía dos veces: binaria a LinkedIn y en base64 a WhatsApp
+        enviados = args.imagenes * args.mb * (1 + 4 / 3)
+        print(
+            f"  {modo:<8} RSS extra {r['rss_extra_mb']:7.1f} MB  {r['segundos']:6.2f}s"
+            f"  ({enviados / r['segundos']:7.1f} MB/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compara la generación de texto bloqueante (ruta `def` en el threadpool de anyio)
+contra la versión asíncrona de `chat_service.generar_contenido`.
+
+Usa el proveedor local (sin conexión) con una latencia simulada por llamada.
+
+    python benchmarks/bench_texto_concurrencia.py --solicitudes 300 --latencia 0.5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _configurar(latencia: float) -> None:
+    os.environ["AI_PROVIDER"] = "local"
+    os.environ["LOCAL_IA_LATENCIA"] = str(latencia)
+
+
+async def _bench_threadpool(solicitudes: int) -> float:
+    """Lo que hacía la ruta sync: cada llamada ocupa un hilo de anyio (40 por defecto)."""
+    import anyio
+    from app.services.chat_service import _construir_instrucciones
+    from app.services.ia.texto_service import MODELO_TEXTO, client
+    from google.genai import types
+
+    instrucciones = _construir_instrucciones(["facebook", "instagram"])
+
+    def bloqueante(i: int) -> str:
+        return client.models.generate_content(
+            model=MODELO_TEXTO,
+            config=types.GenerateContentConfig(system_instruction=instrucciones),
+            contents=f"prompt {i}",
+        ).text
+
+    inicio = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        for i in range(solicitudes):
+            tg.start_soon(anyio.to_thread.run_sync, bloqueante, i)
+    return time.perf_counter() - inicio
+
+
+async def _bench_async(solicitudes: int) -> float:
+    from app.schemas.chat_schema import ChatRequest
+    from app.services.chat_service import generar_contenido
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        generar_contenido(ChatRequest(prompt=f"prompt {i}", redes_sociales=["facebook", "instagram"]))
+        for i in range(solicitudes)
+    ))
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--solicitudes", type=int, default=200)
+    parser.add_argument("--latencia", type=float, default=0.5)
+    args = parser.parse_args()
+
+    _configurar(args.latencia)
+
+    t_sync = asyncio.run(_bench_threadpool(args.solicitudes))
+    t_async = asyncio.run(_bench_async(args.solicitudes))
+
+    print(f"{args.solicitudes} solicitudes, latencia simulada {args.latencia}s")
+    for nombre, duracion in (("threadpool (def)", t_sync), ("asyncio (async def)", t_async)):
+        print(f"  {nombre:<20} {duracion:7.2f}s  ({args.solicitudes / duracion:7.1f} req/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Verifica el techo de memoria de la subida por partes a TikTok contra un
+servidor simulado local (init, subida de chunks y consulta de estado).
+
+Genera un video de prueba de `--mb` MB, lo publica con `TiktokPostService` y
+mide el RSS máximo del proceso. El servidor falla una vez en el chunk
+`--fallar-chunk` para comprobar que la subida se retoma desde ese chunk.
+Para comparar, `--modo completo` repite la subida como antes: todo el archivo
+en memoria y un solo PUT.
+
+    python benchmarks/bench_tiktok_subida.py --mb 300 --techo-mb 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _rss_maximo_mb() -> float:
+    # En Linux ru_maxrss está en KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _servidor_simulado(fallar_chunk: int) -> tuple[ThreadingHTTPServer, dict]:
+    estado = {"recibido": 0, "chunks": 0, "fallos": 0, "fallar_chunk": fallar_chunk}
+
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _json(self, codigo: int, datos: dict) -> None:
+            cuerpo = json.dumps(datos).encode()
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path.startswith("/init"):
+                host, puerto = self.server.server_address[:2]
+                self._json(200, {"data": {"publish_id": "v_pub_123", "upload_url": f"http://{host}:{puerto}/upload"}})
+            else:
+                self._json(200, {"data": {"status": "PROCESSING_UPLOAD"}})
+
+        def do_PUT(self):
+            largo = int(self.headers["Content-Length"])
+            inicio = int(self.headers["Content-Range"].split(" ")[1].split("-")[0])
+            while largo > 0:
+                largo -= len(self.rfile.read(min(largo, 1024 * 1024)))
+
+            if inicio != estado["recibido"]:
+                self._json(416, {"error": f"se esperaba el byte {estado['recibido']}, llegó {inicio}"})
+                return
+            if estado["chunks"] + 1 == estado["fallar_chunk"] and estado["fallos"] == 0:
+                estado["fallos"] += 1
+                self._json(500, {"error": "falla simulada"})
+                return
+
+            estado["recibido"] += int(self.headers["Content-Length"])
+            estado["chunks"] += 1
+            self._json(206, {})
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, estado
+
+
+def _crear_video(mb: int) -> str:
+    descriptor, ruta = tempfile.mkstemp(suffix=".mp4")
+    bloque = os.urandom(1024 * 1024)
+    with os.fdopen(descriptor, "wb") as f:
+        for _ in range(mb):
+            f.write(bloque)
+    return ruta
+
+
+async def _subir_completo(url: str, ruta: str) -> None:
+    """La subida anterior: el video entero en memoria y un solo PUT."""
+    from app.core.http_client import cliente_http
+
+    with open(ruta, "rb") as f:
+        video_data = f.read()
+    video_size = len(video_data)
+    await cliente_http.put(
+        f"{url}/upload", content=video_data,
+        headers={"Content-Type": "video/mp4", "Content-Range": f"bytes 0-{video_size - 1}/{video_size}"},
+    )
+
+
+async def _subir_por_chunks(url: str, ruta: str) -> dict:
+    from app.services.tiktok_post_service import tiktok_post_service
+
+    tiktok_post_service.init_url = f"{url}/init"
+    tiktok_post_service.status_url = f"{url}/status"
+    return await tiktok_post_service.publicar_video("prueba", ruta)
+
+
+def _ejecutar(modo: str, mb: int, fallar_chunk: int) -> None:
+    """Corre una sola subida y emite el resultado como JSON (un proceso por modo)."""
+    from app.core.http_client import cliente_http
+
+    ruta = _crear_video(mb)
+    servidor, estado = _servidor_simulado(fallar_chunk)
+    url = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    base = _rss_maximo_mb()
+    inicio = time.perf_counter()
+
+    async def correr():
+        try:
+            if modo == "completo":
+                await _subir_completo(url, ruta)
+            else:
+                await _subir_por_chunks(url, ruta)
+        finally:
+            await cliente_http.cerrar()
+
+    try:
+        asyncio.run(correr())
+    finally:
+        servidor.shutdown()
+        os.remove(ruta)
+
+    print(json.dumps({
+        "segundos": time.perf_counter() - inicio,
+        "rss_extra_mb": _rss_maximo_mb() - base,
+        "chunks": estado["chunks"],
+        "fallos": estado["fallos"],
+        "recibido": estado["recibido"],
+    }))
+
+
+def _verificar_calculo(chunk_mb: int) -> bool:
+    """Casos límite de `calcular_chunks`, sin red."""
+    from app.services.tiktok_post_service import CHUNK_MINIMO, MB, calcular_chunks, rangos_chunks
+
+    chunk_deseado = chunk_mb * MB
+    verificaciones = []
+    # Entre 5 MB y el chunk deseado: un solo chunk del tamaño del video
+    for video_size in sorted({CHUNK_MINIMO, CHUNK_MINIMO + 1, 7 * MB, chunk_deseado - 1}):
+        if not CHUNK_MINIMO <= video_size < chunk_deseado:
+            continue
+        chunk_size, total = calcular_chunks(video_size, chunk_deseado)
+        verificaciones.append((
+            f"video de {video_size} bytes: ({chunk_size}, {total}) en un chunk del tamaño del video",
+            (chunk_size, total) == (video_size, 1),
+        ))
+    for video_size in (CHUNK_MINIMO - 1, chunk_deseado, chunk_deseado + 1, 2 * chunk_deseado - 1, 300 * MB):
+        chunk_size, total = calcular_chunks(video_size, chunk_deseado)
+        rangos = rangos_chunks(video_size, chunk_size, total)
+        verificaciones.append((
+            f"video de {video_size} bytes: {total} chunk(s) de {chunk_size} cubren el video",
+            chunk_size <= video_size and rangos[0][0] == 0 and rangos[-1][1] == video_size - 1
+            and all(fin - inicio + 1 >= chunk_size for inicio, fin in rangos),
+        ))
+
+    for descripcion, resultado in verificaciones:
+        print(f"  {'OK   ' if resultado else 'FALLA'} {descripcion}")
+    return all(resultado for _, resultado in verificaciones)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=300)
+    parser.add_argument("--chunk-mb", type=int, default=10)
+    parser.add_argument("--techo-mb", type=float, default=64)
+    parser.add_argument("--fallar-chunk", type=int, default=3)
+    parser.add_argument("--modo", choices=["chunks", "completo"])
+    args = parser.parse_args()
+
+    os.environ.setdefault("AI_PROVIDER", "local")
+    os.environ["TIKTOK_CHUNK_MB"] = str(args.chunk_mb)
+    os.environ["TIKTOK_REINTENTOS_CHUNK"] = "1"
+
+    if args.modo:
+        _ejecutar(args.modo, args.mb, args.fallar_chunk)
+        return
+
+    print(f"Cálculo de chunks de {args.chunk_mb} MB")
+    calculo_ok = _verificar_calculo(args.chunk_mb)
+
+    resultados = {}
+    for modo in ("completo", "chunks"):
+        salida = subprocess.run(
+            [sys.executable, __file__, "--modo", modo, "--mb", str(args.mb),
+             "--chunk-mb", str(args.chunk_mb), "--fallar-chunk", str(args.fallar_chunk)],
+            check=True, capture_output=True, text=True,
+        )
+        resultados[modo] = json.loads(salida.stdout.strip().splitlines()[-1])
+
+    print(f"Video de {args.mb} MB, chunks de {args.chunk_mb} MB")
+    for modo, r in resultados.items():
+        print(
+            f"  {modo:<9} RSS extra {r['rss_extra_mb']:7.1f} MB  {r['segundos']:6.2f}s"
+            f"  chunks {r['chunks']}  fallos reintentados {r['fallos']}"
+        )
+
+    chunks = resultados["chunks"]
+    completo = chunks["recibido"] == args.mb * 1024 * 1024
+    dentro_del_techo = chunks["rss_extra_mb"] <= args.techo_mb
+    print(f"  subida completa: {'sí' if completo else 'NO'}; techo de {args.techo_mb} MB: {'OK' if dentro_del_techo else 'SUPERADO'}")
+    if not (calculo_ok and completo and dentro_del_techo):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
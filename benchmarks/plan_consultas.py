@@ -0,0 +1,174 @@
+"""
+Verifica con EXPLAIN que las consultas principales usan sus índices sobre
+datos sembrados (`--temas` temas con `--por-tema` prompts y contenidos cada
+uno, tras ANALYZE).
+
+Por defecto usa una base SQLite temporal (EXPLAIN QUERY PLAN). Con `--url`
+corre contra Postgres (EXPLAIN (FORMAT JSON)); usar una base vacía de
+pruebas: se crean las tablas y se siembran datos en ella. Con tan pocas
+filas Postgres prefiere recorrer las tablas chicas enteras, así que ahí se
+desactiva `enable_seqscan` para verificar que el índice sirve a la consulta.
+
+    python benchmarks/plan_consultas.py
+    python benchmarks/plan_consultas.py --url postgresql://u:p@localhost/pruebas_planes
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _sembrar(engine, temas: int, por_tema: int) -> None:
+    from sqlmodel import Session
+
+    from app.models.modelos import Archivo, Contenido, Prompt, Redsocial, Tema, Usuario
+
+    inicio = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with Session(engine) as session:
+        usuarios = [Usuario(nombre=f"u{i}", email=f"u{i}@ejemplo.com", password="x") for i in range(20)]
+        redes = [Redsocial(nombre=nombre) for nombre in ("Facebook", "Instagram", "LinkedIn", "WhatsApp", "TikTok")]
+        session.add_all([*usuarios, *redes])
+        session.commit()
+        ids_usuarios = [u.id for u in usuarios]
+        ids_redes = [r.id for r in redes]
+
+    with engine.begin() as conexion:
+        conexion.execute(Tema.__table__.insert(), [
+            {"nombre": f"tema {i}", "usuario_id": ids_usuarios[i % 20], "create_at": inicio, "update_at": inicio + timedelta(minutes=i)}
+            for i in range(temas)
+        ])
+        total = temas * por_tema
+        conexion.execute(Archivo.__table__.insert(), [
+            {"url": f"https://ejemplo.com/{i}.jpg", "create_at": inicio, "update_at": inicio} for i in range(total)
+        ])
+        prompts, contenidos = [], []
+        for i in range(total):
+            momento = inicio + timedelta(minutes=i)
+            tema_id = 1 + i % temas
+            prompts.append({"descripcion": f"prompt {i}", "tema_id": tema_id, "create_at": momento, "update_at": momento})
+            contenidos.append({
+                "descripcion": f"contenido {i}", "tema_id": tema_id, "redsocial_id": ids_redes[i % 5],
+                "archivo_id": 1 + i, "publicado": i % 10 != 0, "fecha_publicacion": momento + timedelta(days=30),
+                "create_at": momento, "update_at": momento,
+            })
+        conexion.execute(Prompt.__table__.insert(), prompts)
+        conexion.execute(Contenido.__table__.insert(), contenidos)
+        conexion.exec_driver_sql("ANALYZE")
+
+
+def _consultas():
+    """(descripción, consulta, índices que el plan debe usar)."""
+    from sqlalchemy import desc, func
+    from sqlmodel import select
+
+    from app.controllers.tema_controller import TemaController
+    from app.models.modelos import Archivo, Contenido, Prompt, Tema
+
+    limite = datetime(2026, 3, 1)
+
+    return [
+        ("contar contenidos de un tema",
+         select(func.count()).select_from(Contenido).where(Contenido.tema_id == 7),
+         ["ix_contenido_tema_id_create_at"]),
+        ("contar contenidos de una red social",
+         select(func.count()).select_from(Contenido).where(Contenido.redsocial_id == 2),
+         ["ix_contenido_redsocial_id"]),
+        ("contar prompts de un tema",
+         select(func.count()).select_from(Prompt).where(Prompt.tema_id == 7),
+         ["ix_prompt_tema_id_create_at"]),
+        ("temas de un usuario, paginados",
+         select(Tema).where(Tema.usuario_id == 3).order_by(desc(Tema.update_at), desc(Tema.id)).limit(51),
+         ["ix_tema_usuario_id_update_at"]),
+        ("contenidos de un archivo",
+         select(Contenido).where(Contenido.archivo_id == 42),
+         ["ix_contenido_archivo_id"]),
+        ("página de /contenidos/",
+         select(Contenido).order_by(desc(Contenido.update_at), desc(Contenido.id)).limit(51),
+         ["ix_contenido_update_at_id"]),
+        ("historial de un tema (página más reciente)",
+         TemaController._pagina_historial(7, 51),
+         ["ix_contenido_tema_id_create_at", "ix_prompt_tema_id_create_at"]),
+        ("contenidos programados que vencen",
+         select(Contenido).where(Contenido.publicado == False, Contenido.fecha_publicacion <= limite)  # noqa: E712
+         .order_by(Contenido.fecha_publicacion).limit(500),
+         ["ix_contenido_publicado_fecha_publicacion"]),
+        ("archivos sin contenido",
+         select(func.count()).select_from(Archivo).where(~select(Contenido.id).where(Contenido.archivo_id == Archivo.id).exists()),
+         ["ix_contenido_archivo_id"]),
+    ]
+
+
+def _indices_usados(conexion, consulta) -> tuple[set, str]:
+    """Ejecuta la consulta con EXPLAIN delante y retorna los índices del plan y el plan en texto."""
+    postgres = conexion.dialect.name == "postgresql"
+    prefijo = "EXPLAIN (FORMAT JSON) " if postgres else "EXPLAIN QUERY PLAN "
+    compilada = consulta.compile(dialect=conexion.dialect)
+    sql = prefijo + str(compilada)
+    parametros = compilada.params if postgres else tuple(compilada.params[p] for p in compilada.positiontup)
+    filas = conexion.exec_driver_sql(sql, parametros).all()
+
+    if not postgres:
+        detalle = "\n".join(str(fila[-1]) for fila in filas)
+        indices = {palabra for palabra in detalle.replace("(", " ").split() if palabra.startswith("ix_")}
+        return indices, detalle
+
+    plan = filas[0][0]
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    indices = set()
+
+    def recorrer(nodo):
+        if isinstance(nodo, dict):
+            if "Index Name" in nodo:
+                indices.add(nodo["Index Name"])
+            for valor in nodo.values():
+                recorrer(valor)
+        elif isinstance(nodo, list):
+            for valor in nodo:
+                recorrer(valor)
+
+    recorrer(plan)
+    return indices, json.dumps(plan, indent=1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="base Postgres de pruebas (por defecto SQLite temporal)")
+    parser.add_argument("--temas", type=int, default=200)
+    parser.add_argument("--por-tema", type=int, default=100)
+    parser.add_argument("--planes", action="store_true", help="mostrar el plan de cada consulta")
+    args = parser.parse_args()
+
+    os.environ.setdefault("AI_PROVIDER", "local")
+
+    from sqlmodel import SQLModel, create_engine
+
+    import app.models.modelos  # noqa: F401  registra las tablas en SQLModel.metadata
+
+    url = args.url or f"sqlite:///{tempfile.mkdtemp(prefix='planes_')}/planes.db"
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    _sembrar(engine, args.temas, args.por_tema)
+
+    print(f"{engine.dialect.name}: {args.temas} temas con {args.por_tema} prompts y contenidos cada uno")
+    resultados = []
+    with engine.connect() as conexion:
+        if engine.dialect.name == "postgresql":
+            conexion.exec_driver_sql("SET enable_seqscan = off")
+        for descripcion, consulta, esperados in _consultas():
+            usados, plan = _indices_usados(conexion, consulta)
+            ok = all(indice in usados for indice in esperados)
+            resultados.append(ok)
+            print(f"  {'OK   ' if ok else 'FALLA'} {descripcion}: {', '.join(sorted(usados)) or 'sin índices'}")
+            if args.planes or not ok:
+                print("        " + plan.replace("\n", "\n        "))
+
+    if not all(resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Prueba la bandeja de salida contra un servidor simulado de la Graph API de
+Facebook y una base SQLite temporal.
+
+El texto de cada publicación le indica al servidor cómo responder:
+
+    "429:N"    -> 429 con Retry-After: N la primera vez, después 200
+    "503:N"    -> 503 las primeras N veces, después 200
+    "400"      -> 400 (no se reintenta)
+    "lento"    -> tarda más que el timeout de lectura (resultado incierto)
+    otro texto -> 200 tras una pequeña demora
+
+Verifica que se respeten Retry-After y la concurrencia por red, que los
+errores definitivos e inciertos no se reintenten y que la misma clave de
+idempotencia nunca publique dos veces.
+
+    python benchmarks/prueba_bandeja_salida.py
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CONCURRENCIA_FACEBOOK = 3
+DEMORA = 0.3
+
+
+def _servidor_simulado() -> tuple[ThreadingHTTPServer, dict]:
+    estado = {"llamadas": Counter(), "publicados": Counter(), "simultaneas": 0, "max_simultaneas": 0}
+    candado = threading.Lock()
+
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _json(self, codigo: int, datos: dict, extra: dict | None = None) -> None:
+            cuerpo = json.dumps(datos).encode()
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            for clave, valor in (extra or {}).items():
+                self.send_header(clave, valor)
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_POST(self):
+            datos = parse_qs(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode())
+            texto = datos["message"][0]
+
+            # "lento" sigue ocupando el servidor después de que el cliente se rindió: no cuenta
+            simultanea = texto != "lento"
+            with candado:
+                estado["llamadas"][texto] += 1
+                llamada = estado["llamadas"][texto]
+                estado["simultaneas"] += simultanea
+                estado["max_simultaneas"] = max(estado["max_simultaneas"], estado["simultaneas"])
+            try:
+                if texto.startswith("429:") and llamada == 1:
+                    self._json(429, {"error": "limite"}, {"Retry-After": texto.split(":")[1]})
+                elif texto.startswith("503:") and llamada <= int(texto.split(":")[1]):
+                    self._json(503, {"error": "no disponible"})
+                elif texto == "400":
+                    self._json(400, {"error": "publicación inválida"})
+                else:
+                    time.sleep(3 if texto == "lento" else DEMORA)
+                    with candado:
+                        estado["publicados"][texto] += 1
+                    self._json(200, {"id": f"pagina_{texto}"})
+            finally:
+                with candado:
+                    estado["simultaneas"] -= simultanea
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, estado
+
+
+async def _esperar_terminados(ids: list[int], limite: float = 30) -> dict:
+    from sqlmodel import Session, select
+
+    from app.models.modelos import Envio
+    from app.services import bandeja_salida_service
+
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        with Session(bandeja_salida_service.engine) as session:
+            envios = session.exec(select(Envio).where(Envio.id.in_(ids))).all()  # type: ignore[union-attr]
+            if all(e.estado in ("publicado", "fallido", "incierto") for e in envios):
+                return {e.id: e for e in envios}
+        await asyncio.sleep(0.1)
+    raise TimeoutError("Los envíos no terminaron a tiempo")
+
+
+async def _probar() -> list[tuple[str, bool]]:
+    from app.core.http_client import cliente_http
+    from app.services.bandeja_salida_service import bandeja_salida
+
+    envios = {}
+    inicio = time.monotonic()
+    try:
+        for texto in ["429:1", "503:2", "400", "lento"] + [f"ok-{i}" for i in range(8)]:
+            envio, _ = await bandeja_salida.encolar("facebook", {"texto": texto, "url_img": None})
+            envios[texto] = envio.id
+
+        # La misma clave dos veces (p. ej. el cliente reintenta la petición): un solo envío
+        primero, creado_1 = await bandeja_salida.encolar("facebook", {"texto": "idem", "url_img": None}, "clave-1")
+        segundo, creado_2 = await bandeja_salida.encolar("facebook", {"texto": "idem", "url_img": None}, "clave-1")
+        envios["idem"] = primero.id
+
+        bandeja_salida.iniciar()
+        resultado = await _esperar_terminados(list(envios.values()))
+        segundos = time.monotonic() - inicio
+    finally:
+        await bandeja_salida.detener()
+        await cliente_http.cerrar()
+
+    def estado(texto: str) -> str:
+        return resultado[envios[texto]].estado
+
+    def intentos(texto: str) -> int:
+        return resultado[envios[texto]].intentos
+
+    print(f"  {len(envios)} envíos terminados en {segundos:.1f}s")
+    for texto, envio_id in envios.items():
+        e = resultado[envio_id]
+        print(f"    {texto:<7} {e.estado:<10} intentos {e.intentos}  {e.ultimo_error or ''}"[:110])
+
+    return [
+        ("429 con Retry-After: publicado al segundo intento", estado("429:1") == "publicado" and intentos("429:1") == 2),
+        ("503 dos veces: publicado al tercer intento", estado("503:2") == "publicado" and intentos("503:2") == 3),
+        ("400: fallido sin reintentar", estado("400") == "fallido" and intentos("400") == 1),
+        ("timeout de lectura: incierto sin reintentar", estado("lento") == "incierto" and intentos("lento") == 1),
+        ("misma clave de idempotencia: un solo envío", creado_1 and not creado_2 and primero.id == segundo.id),
+        ("se respeta Retry-After (>= 1s)", segundos >= 1),
+    ]
+
+
+def main() -> None:
+    base = tempfile.mkdtemp(prefix="bandeja_")
+    servidor, estado = _servidor_simulado()
+
+    os.environ.setdefault("AI_PROVIDER", "local")
+    os.environ["FACEBOOK_API_URL"] = f"http://127.0.0.1:{servidor.server_address[1]}"
+    os.environ["BANDEJA_CONCURRENCIA"] = f"facebook={CONCURRENCIA_FACEBOOK}"
+    os.environ["BANDEJA_INTERVALO"] = "0.2"
+    os.environ["BANDEJA_BACKOFF_BASE"] = "0.2"
+    os.environ["HTTP_TIMEOUT"] = "1"
+
+    from sqlmodel import SQLModel, create_engine
+
+    from app.services import bandeja_salida_service
+
+    # Base SQLite temporal en lugar de la de la app
+    engine = create_engine(f"sqlite:///{base}/bandeja.db", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    bandeja_salida_service.engine = engine
+
+    try:
+        verificaciones = asyncio.run(_probar())
+    finally:
+        servidor.shutdown()
+
+    duplicados = [texto for texto, veces in estado["publicados"].items() if veces > 1]
+    verificaciones += [
+        (f"máximo {CONCURRENCIA_FACEBOOK} envíos simultáneos a Facebook (hubo {estado['max_simultaneas']})",
+         estado["max_simultaneas"] <= CONCURRENCIA_FACEBOOK),
+        ("ninguna publicación duplicada en la red", not duplicados and estado["llamadas"]["idem"] == 1),
+    ]
+
+    for descripcion, ok in verificaciones:
+        print(f"  {'OK   ' if ok else 'FALLA'} {descripcion}")
+    if not all(ok for _, ok in verificaciones):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
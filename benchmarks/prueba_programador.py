@@ -0,0 +1,238 @@
+"""
+Prueba el programador de publicaciones con una base SQLite temporal y un
+servidor simulado que hace de Graph API de Facebook e Instagram (cada
+contenedor de Instagram tarda `--proceso` segundos en quedar listo).
+
+Crea `--contenidos` contenidos sin publicar con fecha dentro de unos
+segundos, mitad para Facebook y mitad para Instagram, y corre dos
+programadores a la vez (sin Postgres los dos se creen líderes). Mide cuánto
+después de su fecha se encoló y se publicó cada uno y verifica que:
+
+- cada contenido se publica una sola vez y no antes de su fecha
+- los de Instagram salen con el contenedor ya preparado
+- no se disparan los ya publicados, los ya encolados ni los de fecha movida
+
+    python benchmarks/prueba_programador.py --contenidos 40
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _servidor_simulado(proceso: float) -> tuple[ThreadingHTTPServer, dict]:
+    estado = {"publicados": Counter(), "momento": {}, "contenedores": {}, "inmediatos": 0}
+    ids = count(1)
+    candado = threading.Lock()
+
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _json(self, codigo: int, datos: dict) -> None:
+            cuerpo = json.dumps(datos).encode()
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def _publicado(self, texto: str) -> None:
+            with candado:
+                estado["publicados"][texto] += 1
+                estado["momento"].setdefault(texto, time.time())
+
+        def do_GET(self):
+            contenedor = estado["contenedores"].get(urlparse(self.path).path.strip("/"))
+            listo = contenedor and time.monotonic() - contenedor["creado"] >= proceso
+            self._json(200, {"status_code": "FINISHED" if listo else "IN_PROGRESS"})
+
+        def do_POST(self):
+            datos = {k: v[0] for k, v in parse_qs(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()).items()}
+            if self.path.endswith("/media_publish"):
+                contenedor = estado["contenedores"][datos["creation_id"]]
+                # Preparado antes de la fecha: publicar no esperó el proceso del contenedor
+                if time.monotonic() - contenedor["creado"] > proceso + 0.5:
+                    with candado:
+                        estado["inmediatos"] += 1
+                self._publicado(contenedor["texto"])
+                self._json(200, {"id": f"media_{datos['creation_id']}"})
+            elif self.path.endswith("/media"):
+                contenedor_id = f"c{next(ids)}"
+                with candado:
+                    estado["contenedores"][contenedor_id] = {"creado": time.monotonic(), "texto": datos.get("caption")}
+                self._json(200, {"id": contenedor_id})
+            else:
+                self._publicado(datos.get("message") or datos["caption"])
+                self._json(200, {"id": "pagina_post"})
+
+        def log_message(self, *args):
+            pass
+
+    class Servidor(ThreadingHTTPServer):
+        request_queue_size = 256
+
+    servidor = Servidor(("127.0.0.1", 0), Manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, estado
+
+
+def _crear_contenidos(engine, cantidad: int, adelanto: float) -> dict:
+    from sqlmodel import Session
+
+    from app.models.modelos import Archivo, Contenido, Envio, Redsocial, Tema, Usuario
+
+    ahora = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        usuario = Usuario(nombre="u", email="u@ejemplo.com", password="x")
+        session.add(usuario)
+        session.commit()
+        tema = Tema(nombre="t", usuario_id=usuario.id)
+        redes = {nombre: Redsocial(nombre=nombre) for nombre in ("Facebook", "Instagram")}
+        archivo = Archivo(url="https://ejemplo.com/imagen.jpg")
+        session.add_all([tema, archivo, *redes.values()])
+        session.commit()
+
+        def contenido(texto: str, red: str, segundos: float, publicado: bool = False) -> Contenido:
+            c = Contenido(
+                descripcion=texto, publicado=publicado, fecha_publicacion=ahora + timedelta(seconds=segundos),
+                tema_id=tema.id, redsocial_id=redes[red].id, archivo_id=archivo.id,
+            )
+            session.add(c)
+            return c
+
+        # Fechas repartidas en un segundo, varios vencen juntos
+        programados = [
+            contenido(f"post-{i}", "Facebook" if i % 2 else "Instagram", adelanto + (i % 5) * 0.25)
+            for i in range(cantidad)
+        ]
+        ya_publicado = contenido("ya-publicado", "Facebook", adelanto, publicado=True)
+        ya_encolado = contenido("ya-encolado", "Facebook", -60)
+        movido = contenido("movido", "Facebook", adelanto)
+        session.commit()
+        session.add(Envio(red_social="facebook", parametros={}, clave_idempotencia="manual", estado="publicado", contenido_id=ya_encolado.id))
+        session.commit()
+
+        return {
+            "fechas": {c.descripcion: c.fecha_publicacion.timestamp() for c in programados},
+            "movido": movido.id,
+        }
+
+
+async def _probar(engine, creados: dict, adelanto: float, espera: float) -> dict:
+    from sqlmodel import Session
+
+    from app.core.http_client import cliente_http
+    from app.models.modelos import Contenido
+    from app.services.bandeja_salida_service import bandeja_salida
+    from app.services.programador_service import Programador
+
+    programadores = [Programador(), Programador()]
+    bandeja_salida.iniciar()
+    for programador in programadores:
+        programador.iniciar()
+    try:
+        # Con el contenido ya cargado en el heap se mueve su fecha más adelante
+        await asyncio.sleep(adelanto / 2)
+        nueva_fecha = datetime.now(timezone.utc) + timedelta(seconds=adelanto + 1.5)
+        with Session(engine) as session:
+            movido = session.get(Contenido, creados["movido"])
+            movido.fecha_publicacion = nueva_fecha
+            session.add(movido)
+            session.commit()
+        await asyncio.sleep(espera)
+        return {"movido": nueva_fecha.timestamp(), "estado": programadores[0].estado()}
+    finally:
+        for programador in programadores:
+            await programador.detener()
+        await bandeja_salida.detener()
+        await cliente_http.cerrar()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contenidos", type=int, default=40)
+    parser.add_argument("--proceso", type=float, default=1.0)
+    args = parser.parse_args()
+
+    adelanto = args.proceso + 2
+    base = tempfile.mkdtemp(prefix="programador_")
+    servidor, estado = _servidor_simulado(args.proceso)
+    url = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    os.environ.setdefault("AI_PROVIDER", "local")
+    os.environ["FACEBOOK_API_URL"] = url
+    os.environ["INSTAGRAM_API_URL"] = url
+    os.environ["INSTAGRAM_ESTADO_INTERVALO"] = "0.1"
+    os.environ["INSTAGRAM_ESTADO_INTERVALO_MAX"] = "0.2"
+    os.environ["INSTAGRAM_LOTE_CONCURRENCIA"] = str(args.contenidos)
+    os.environ["LIMITE_REDES"] = "facebook=1000:1000,instagram=1000:1000"
+    os.environ["BANDEJA_CONCURRENCIA"] = "facebook=10,instagram=10"
+    os.environ["PROGRAMADOR_INTERVALO"] = "0.5"
+    os.environ["PROGRAMADOR_HORIZONTE"] = "60"
+
+    from sqlmodel import Session, SQLModel, create_engine, select
+
+    from app.models.modelos import Envio
+    from app.services import bandeja_salida_service, programador_service
+
+    engine = create_engine(f"sqlite:///{base}/programador.db", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    bandeja_salida_service.engine = engine
+    programador_service.engine = engine
+
+    creados = _crear_contenidos(engine, args.contenidos, adelanto)
+    try:
+        resultado = asyncio.run(_probar(engine, creados, adelanto, adelanto + 3))
+    finally:
+        servidor.shutdown()
+
+    with Session(engine) as session:
+        envios = session.exec(select(Envio).where(Envio.clave_idempotencia != "manual")).all()
+    claves = Counter(e.clave_idempotencia for e in envios)
+
+    fechas = dict(creados["fechas"], movido=resultado["movido"])
+    retrasos = {texto: estado["momento"][texto] - fecha for texto, fecha in fechas.items() if texto in estado["momento"]}
+    publicados = [r for texto, r in retrasos.items() if texto != "movido"]
+    publicados.sort()
+
+    instagram = args.contenidos // 2 + args.contenidos % 2
+    print(f"{args.contenidos} contenidos programados, {args.proceso}s de proceso por contenedor de Instagram")
+    if publicados:
+        print(
+            f"  publicados {len(publicados)}  retraso sobre la fecha: "
+            f"p50 {publicados[len(publicados) // 2] * 1000:.0f} ms  max {publicados[-1] * 1000:.0f} ms"
+        )
+    print(f"  estado de un programador al terminar: {resultado['estado']}")
+
+    verificaciones = [
+        ("todos los programados se publicaron", len(publicados) == args.contenidos),
+        ("ninguno antes de su fecha", all(r >= 0 for r in retrasos.values())),
+        ("ninguno más de 1s tarde", all(r < 1 for r in retrasos.values())),
+        ("cada contenido encolado y publicado una sola vez (dos programadores)",
+         all(v == 1 for v in claves.values()) and all(v == 1 for v in estado["publicados"].values())),
+        (f"Instagram con el contenedor ya preparado ({estado['inmediatos']}/{instagram})", estado["inmediatos"] == instagram),
+        ("no se disparan los ya publicados ni los ya encolados",
+         not estado["publicados"]["ya-publicado"] and not estado["publicados"]["ya-encolado"]),
+        ("el de fecha movida sale en la nueva fecha", 0 <= retrasos.get("movido", -1) < 1),
+    ]
+    for descripcion, ok in verificaciones:
+        print(f"  {'OK   ' if ok else 'FALLA'} {descripcion}")
+    if not all(ok for _, ok in verificaciones):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()